@@ -1,16 +1,31 @@
 import os
 import sys
 from contextlib import asynccontextmanager
-from typing import Generator
+from typing import Dict, Generator, Optional
 
+import optuna
 from optuna import Trial
+from optuna.trial import FixedTrial
 
+from cli.print_utils import print_info
 from modules.output import OutputModule
+from modules.output.results import show_monte_carlo_results, show_sweep_results, show_walk_forward_results
+from modules.public.trading_stats import MainResults, TradingStats
 from modules.setup import ConfigModule, DataModule, SetupModule
-from modules.setup.config import create_config
+from modules.setup.config import create_config, create_sweep_configs
+from modules.setup.datastore import OhlcvDatastore
+from modules.algo import BackTesting
+from modules.algo.frozen_ohlcv import FrozenOhlcv
+from modules.algo.hyperopt.indicator_cache import IndicatorCache
+from modules.stats.monte_carlo import run_monte_carlo, summarize_simulations
+from modules.stats.pruning import TrialPruning
 from modules.stats.stats import StatsModule
+from modules.stats.sweep import run_sweep
+from modules.stats.tick_engine import SignalArrays
 from modules.stats.tradingmodule import TradingModule
-from utils.error_handling import ErrorOutput, OfflineMissingDataError
+from modules.stats.walk_forward import Window, backtest_window, plan_windows, run_windows, slice_frame, \
+    summarize_windows
+from utils.error_handling import ConfigError, ErrorOutput, OfflineMissingDataError
 
 
 class BacktestRunner:
@@ -21,16 +36,19 @@ class BacktestRunner:
         self.df = df
         self.strategy = strategy
 
-    def run_backtest(self):
+    def run_backtest(self, pruning: Optional[TrialPruning] = None):
         pair_dicts, dict_with_signals = self.algo_module.run()
-        trading_module = TradingModule(self.config, self.strategy)
+        trading_module = TradingModule(self.config, self.strategy, pruning)
         stats_module = StatsModule(self.config, dict_with_signals, trading_module, pair_dicts)
         return stats_module.analyze()
 
     def run_hyperopt_iteration(self, trial: Trial) -> float:
         self.strategy.trial = trial
-        stats = self.run_backtest()
+        stats = self.run_backtest(TrialPruning.create(trial, self.config))
+        self.algo_module.indicator_cache.print_usage()
+        return self.compute_loss(stats)
 
+    def compute_loss(self, stats: TradingStats) -> float:
         try:
             return self.strategy.loss_function(stats)
 
@@ -45,6 +63,89 @@ class BacktestRunner:
         stats = self.run_backtest()
         OutputModule(self.config).output(stats, self.config.strategy_definition)
 
+    def run_sweep(self):
+        """
+        Backtests every configuration of the 'sweep' setting on the signals of a single signal pass
+        """
+        configs = create_sweep_configs(self.config)
+        pair_dicts, dict_with_signals = self.algo_module.run()
+        results = run_sweep(configs, self.strategy, dict_with_signals, pair_dicts, self.config.sweep_workers)
+        show_sweep_results(self.config.sweep, results, self.config.currency_symbol)
+
+    def run_monte_carlo(self):
+        """
+        Runs 'monte-carlo-runs' seeded simulations with a shuffled pair order on the signals of a single signal pass
+        """
+        config = self.config
+        _, dict_with_signals = self.algo_module.run()
+        signal_arrays = SignalArrays.from_pairs_data(dict_with_signals, list(dict_with_signals.keys()))
+        simulations = run_monte_carlo(config, self.strategy, signal_arrays, config.monte_carlo_runs,
+                                      config.monte_carlo_seed, config.monte_carlo_workers)
+        show_monte_carlo_results(summarize_simulations(simulations), config.strategy_name)
+
+    def run_walk_forward(self):
+        """
+        Backtests consecutive test windows of the loaded data. Without 'walk-forward-trials', the signals are populated
+        once for the full range and the windows are backtested on views of them. With it, the strategy is
+        hyperoptimized on the train period of every window first, so the signals are populated per trial and window.
+        """
+        config = self.config
+        windows = plan_windows(config.backtesting_from, config.backtesting_to, config.walk_forward_train_days,
+                               config.walk_forward_test_days)
+        try:
+            if len(windows) == 0:
+                raise ConfigError()
+
+        except ConfigError:
+            ErrorOutput(sys.exc_info(),
+                        add_info="The backtesting period is too short for a single walk-forward window of "
+                                 "'walk-forward-train-days' plus 'walk-forward-test-days'.",
+                        stop=True).print_error()
+
+        if config.walk_forward_trials > 0:
+            results = [self.run_optimized_window(window) for window in windows]
+        else:
+            pair_dicts, dict_with_signals = self.algo_module.run()
+            results = run_windows(config, windows, self.strategy, dict_with_signals, pair_dicts,
+                                  config.walk_forward_workers)
+
+        show_walk_forward_results([window.label() for window in windows], results, summarize_windows(results),
+                                  config.currency_symbol)
+
+    def run_optimized_window(self, window: Window) -> MainResults:
+        """
+        Hyperoptimizes the strategy on the train period of the window and backtests its test period with the best
+        parameters. Signals only see candles up to the end of the period they are used for.
+        """
+        train_data = self.get_data_until(window.test_from)
+        # Cached indicators are only valid for the candles they were generated from
+        indicator_cache = IndicatorCache(self.config.indicator_cache_mb)
+
+        def objective(trial: Trial) -> float:
+            self.strategy.trial = trial
+            stats = self.backtest_window(train_data, window.train_from, window.test_from, indicator_cache)
+            return self.compute_loss(stats)
+
+        study = optuna.create_study()
+        study.optimize(objective, n_trials=self.config.walk_forward_trials)
+        print_info(f"Best results for {window.label()}: {study.best_params}")
+
+        self.strategy.trial = FixedTrial(study.best_params)
+        stats = self.backtest_window(self.get_data_until(window.test_to), window.test_from, window.test_to)
+        return stats.main_results
+
+    def get_data_until(self, until: int) -> Dict[str, FrozenOhlcv]:
+        return {pair: FrozenOhlcv(slice_frame(ohlcv.frame, 0, until))
+                for pair, ohlcv in self.algo_module.frozen_ohlcv.items()}
+
+    def backtest_window(self, data: Dict[str, FrozenOhlcv], window_from: int, window_to: int,
+                        indicator_cache: Optional[IndicatorCache] = None) -> TradingStats:
+        backtesting_module = BackTesting(data, self.config, self.strategy,
+                                         self.algo_module.additional_ohlcv_pair_frames, indicator_cache)
+        pair_dicts, dict_with_signals = backtesting_module.start_backtesting()
+        return backtest_window(self.config, self.strategy, dict_with_signals.frames(), pair_dicts, window_from,
+                               window_to)
+
     @staticmethod
     def check_local_data(config: ConfigModule) -> None:
 
@@ -54,13 +155,13 @@ class BacktestRunner:
             if not os.path.exists(dirpath):
                 raise OfflineMissingDataError()
 
+            datastore = OhlcvDatastore(dirpath)
             pairs = config.pairs
 
             for pair in pairs:
-                pair = pair.replace('/', '')
-                filename = f'data-{pair}{config.timeframe}.feather'
+                filename = f'data-{pair.replace("/", "")}{config.timeframe}.feather'
 
-                if filename not in os.listdir(dirpath):
+                if not datastore.has_data(pair, config.timeframe) and filename not in os.listdir(dirpath):
                     raise OfflineMissingDataError()
 
         except OfflineMissingDataError:
@@ -27,7 +27,11 @@ class Strategy(abc.ABC):
     Methods defined in strategies/*.py will overwrite these methods.
     """
     trial: Trial = None
+    recorded_parameters: dict = None
     timeframe: str
+    # Amount of candles before the current candle that generate_indicators needs to compute the indicators of the
+    # current candle. Declaring it allows signals to be updated incrementally, see StreamingSignals.
+    warmup_candles: int = None
 
     @abc.abstractmethod
     def generate_indicators(self, dataframe: DataFrame, additional_pairs: dict = None) -> DataFrame:
@@ -1,12 +1,33 @@
 # Files
+import asyncio
+import hashlib
+import inspect
+import json
 import os
 import sys
+from multiprocessing import Process
+from pathlib import Path
+from typing import Callable, List
 
 import optuna
 from optuna import Trial
+from optuna.pruners import BasePruner
+from optuna.storages import RDBStorage
+from optuna.study import MaxTrialsCallback
+from optuna.trial import TrialState
 
 from backtest_runner import create_backtest_runner
-from cli.print_utils import print_info
+from backtesting.strategy import Strategy
+from cli.print_utils import print_info, print_warning
+from modules.setup import ConfigModule
+from modules.stats.pruning import create_pruner
+
+HYPEROPT_STORAGE_DIR = "data/backtesting-data/hyperopt"
+FINISHED_TRIAL_STATES = (TrialState.COMPLETE, TrialState.PRUNED)
+# Settings that do not change the outcome of a trial, a study is resumed regardless of them
+HYPEROPT_IRRELEVANT_SETTINGS = ("alpha-hyperopt", "n-trials", "n-jobs", "signal-workers", "indicator-cache-mb",
+                                "statistics-workers", "no-statistics", "disable-plots", "tearsheet", "export-result",
+                                "export_result", "mainplot_indicators", "subplot_indicators", "resources")
 
 
 class MainController:
@@ -18,38 +39,169 @@ class MainController:
             if args.alpha_hyperopt:
                 MainController.run_hyperopt(args, runner)
 
+            elif runner.config.sweep:
+                runner.run_sweep()
+
+            elif runner.config.walk_forward_test_days:
+                runner.run_walk_forward()
+
+            elif runner.config.monte_carlo_runs:
+                runner.run_monte_carlo()
+
             else:
                 runner.run_outputted_backtest()
 
     @staticmethod
     def run_hyperopt(args, runner) -> None:
-        os.environ["VERBOSITY"] = "no_warnings"
-        study = optuna.create_study()
-
         if args.n_trials and args.n_trials > 0:
             n_trials = args.n_trials
         else:
             n_trials = 100
 
+        config = runner.config
+        study_name = get_study_name(config, runner.strategy)
+        storage_url = get_hyperopt_storage(config.strategy_name)
+        study = load_or_create_study(study_name, storage_url, create_pruner(config))
+        finished_trials = count_finished_trials(study)
+        if finished_trials >= n_trials:
+            print_warning(f"The study already has {finished_trials} finished trial(s), no new trials are run. Raise "
+                          f"'n-trials' to continue it.")
+
+        os.environ["VERBOSITY"] = "no_warnings"
         print_info(f"Running parameter hyperoptimization with {n_trials} trials.")
         print_info("If you want to exit the program halfway, press 'ctrl + c', and you will get the "
-                   "intermediate results.")
-
-        def objective(trial: Trial):
-            return runner.run_hyperopt_iteration(trial)
+                   "intermediate results. Running the same command again resumes the study.")
+        print_info(f"The study '{study_name}' is stored in {storage_url}.")
+        if config.n_jobs > 1:
+            print_info(f"Running trials in {config.n_jobs} processes.")
 
+        workers = [Process(target=run_hyperopt_worker, args=(args, study_name, storage_url, n_trials))
+                   for _ in range(config.n_jobs - 1)]
         try:
-            study.optimize(objective, n_trials=n_trials)
+            optimize_study(study, runner.run_hyperopt_iteration, n_trials, workers)
 
         except KeyboardInterrupt:
             print_info("Quitting hyperoptimization.")
 
-            try:
-                print_info(f"Best results: {study.best_params}")
-
-            except ValueError:
-                print_info("No trials completed yet. Results not available.")
+            for worker in workers:
+                worker.join(timeout=10)
+                if worker.is_alive():
+                    worker.terminate()
 
+            print_best_results(study)
             sys.exit(1)
 
+        print_best_results(study)
+
+    @staticmethod
+    async def optimize_in_worker(args, study_name: str, storage_url: str, n_trials: int) -> None:
+        # Offline, the main process already downloaded the data into the datastore
+        async with create_backtest_runner(args, online=False) as runner:
+            optimize_shared_study(study_name, storage_url, runner.run_hyperopt_iteration, n_trials,
+                                  create_pruner(runner.config))
+
+
+def run_hyperopt_worker(args, study_name: str, storage_url: str, n_trials: int) -> None:
+    """
+    Entrypoint of a hyperopt worker process. The worker loads the strategy and the OHLCV data from the local datastore
+    once, without an exchange session, and then keeps running trials of the shared study until the study has n_trials
+    finished trials.
+    """
+    os.environ["VERBOSITY"] = "quiet"
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+    try:
+        asyncio.run(MainController.optimize_in_worker(args, study_name, storage_url, n_trials))
+    except KeyboardInterrupt:
+        pass
+
+
+def print_best_results(study: optuna.Study) -> None:
+    pruned_trials = len(study.get_trials(deepcopy=False, states=(TrialState.PRUNED,)))
+    if pruned_trials > 0:
+        print_info(f"{pruned_trials} trial(s) were pruned before the end of the backtest.")
+
+    try:
         print_info(f"Best results: {study.best_params}")
+
+    except ValueError:
+        print_info("No trials completed yet. Results not available.")
+
+
+def optimize_study(study: optuna.Study, objective: Callable[[Trial], float], n_trials: int,
+                   workers: List[Process]) -> None:
+    """
+    Runs trials until the study has n_trials finished trials, in this process and in the worker processes
+    :param workers: Processes that run trials of the same study, see optimize_shared_study. They are only started
+    when trials remain.
+    """
+    finished_trials = count_finished_trials(study)
+    if finished_trials >= n_trials:
+        return
+
+    for worker in workers:
+        worker.start()
+
+    study.optimize(objective, n_trials=n_trials - finished_trials,
+                   callbacks=[MaxTrialsCallback(n_trials, states=FINISHED_TRIAL_STATES)])
+
+    for worker in workers:
+        worker.join()
+
+
+def optimize_shared_study(study_name: str, storage_url: str, objective: Callable[[Trial], float], n_trials: int,
+                          pruner: BasePruner) -> None:
+    """
+    Runs trials of a study in the storage until it has n_trials finished trials, together with the other processes
+    """
+    study = optuna.load_study(study_name=study_name, storage=create_storage(storage_url), pruner=pruner)
+    study.optimize(objective, n_trials=n_trials, callbacks=[MaxTrialsCallback(n_trials, states=FINISHED_TRIAL_STATES)])
+
+
+def load_or_create_study(study_name: str, storage_url: str, pruner: BasePruner) -> optuna.Study:
+    storage = create_storage(storage_url)
+    try:
+        study = optuna.load_study(study_name=study_name, storage=storage, pruner=pruner)
+
+    except KeyError:
+        return optuna.create_study(study_name=study_name, storage=storage, pruner=pruner)
+
+    print_warning(f"Resuming study '{study_name}' with {count_finished_trials(study)} finished trial(s) from "
+                  f"{storage_url}.")
+    return study
+
+
+def get_study_name(config: ConfigModule, strategy: Strategy) -> str:
+    """
+    A study is only resumed by a run with the same settings and strategy source, so trials of different setups
+    (timerange, timeframe, pairs, loss function, parameter space, ...) never end up in the same study
+    :return: Name of the strategy followed by a digest of everything that influences the outcome of a trial
+    """
+    settings = {key: value for key, value in config.raw_config.items() if key not in HYPEROPT_IRRELEVANT_SETTINGS}
+    digest = hashlib.blake2b(digest_size=6)
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    digest.update(f"{config.backtesting_from}-{config.backtesting_to}".encode())
+
+    source_file = inspect.getsourcefile(type(strategy))
+    if source_file is not None:
+        with open(source_file, "rb") as file:
+            digest.update(file.read())
+
+    return f"{config.strategy_name}-{digest.hexdigest()}"
+
+
+def get_hyperopt_storage(strategy_name: str) -> str:
+    """
+    :return: The url of the local SQLite storage used to share (and resume) the studies of a strategy
+    """
+    Path(HYPEROPT_STORAGE_DIR).mkdir(parents=True, exist_ok=True)
+    return f"sqlite:///{HYPEROPT_STORAGE_DIR}/{strategy_name}.db"
+
+
+def create_storage(storage_url: str) -> RDBStorage:
+    # Wait for a lock on the SQLite file instead of failing when several processes write at once
+    return RDBStorage(url=storage_url, engine_kwargs={"connect_args": {"timeout": 100}})
+
+
+def count_finished_trials(study: optuna.Study) -> int:
+    return len(study.get_trials(deepcopy=False, states=FINISHED_TRIAL_STATES))
@@ -1,15 +1,20 @@
 from modules.algo.backtesting import BackTesting
+from modules.algo.frozen_ohlcv import freeze_pair_frames
+from modules.algo.hyperopt.indicator_cache import IndicatorCache
 from modules.setup.config import ConfigModule
 
 
 class AlgoModule(object):
     def __init__(self, config: ConfigModule, ohlcv_pair_frames, strategy, additional_ohlcv_pair_frames):
         self.ohlcv_pair_frames = ohlcv_pair_frames
+        # Frozen once, every backtest / hyperopt trial of this session shares the same read-only OHLCV
+        self.frozen_ohlcv = freeze_pair_frames(ohlcv_pair_frames)
         self.strategy = strategy
         self.additional_ohlcv_pair_frames = additional_ohlcv_pair_frames
         self.config = config
+        self.indicator_cache = IndicatorCache(config.indicator_cache_mb)
 
     def run(self):
-        backtesting_module = BackTesting(self.ohlcv_pair_frames, self.config, self.strategy,
-                                         self.additional_ohlcv_pair_frames)
+        backtesting_module = BackTesting(self.frozen_ohlcv, self.config, self.strategy,
+                                         self.additional_ohlcv_pair_frames, self.indicator_cache)
         return backtesting_module.start_backtesting()
@@ -1,9 +1,14 @@
 # Files
 import sys
-from typing import Tuple
+from typing import Dict, Iterator, Optional, Tuple
+
+from pandas import DataFrame
 
 from backtesting.strategy import Strategy
 from cli.print_utils import print_info, print_error
+from modules.algo.frozen_ohlcv import EDITED_OHLCV_MESSAGE, FrozenOhlcv, ohlcv_checksum
+from modules.algo.hyperopt.indicator_cache import IndicatorCache
+from modules.algo.signal_workers import populate_pair_signals, populate_signals_in_pool
 from modules.public.pairs_data import PairsData
 from modules.setup.config import ConfigModule
 from modules.setup.config.validations import validate_dynamic_stoploss
@@ -19,7 +24,8 @@ from modules.setup.config.validations import validate_dynamic_stoploss
 
 class BackTesting:
 
-    def __init__(self, data: dict, config_module: ConfigModule, strategy: Strategy, additional_pairs_data):
+    def __init__(self, data: Dict[str, FrozenOhlcv], config_module: ConfigModule, strategy: Strategy,
+                 additional_pairs_data, indicator_cache: Optional[IndicatorCache] = None):
         self.data = {}
         self.buypoints = {}
         self.sellpoints = {}
@@ -32,8 +38,9 @@ class BackTesting:
         self.additional_pairs_data = additional_pairs_data
         self.backtesting_from = config_module.backtesting_from
         self.backtesting_to = config_module.backtesting_to
+        self.indicator_cache = indicator_cache
 
-    def start_backtesting(self) -> Tuple[dict, dict]:
+    def start_backtesting(self) -> Tuple[dict, PairsData]:
         print_info('Starting backtest...')
 
         data_dict = self.populate_signals()
@@ -50,32 +57,32 @@ class BackTesting:
         stoploss_type = self.config.stoploss_type
 
         print_info("Populating Indicators")
-        for pair in self.data.keys():
-            df = self.data[pair].copy()
-            cleandf = df.dropna().copy()
-
-            try:
-                indicators = self.strategy.generate_indicators(cleandf, self.additional_pairs_data)
-            except TypeError:
-                indicators = self.strategy.generate_indicators(cleandf)
-
-            indicators = self.strategy.buy_signal(indicators)
-            indicators = self.strategy.sell_signal(indicators)
-            indicators = indicators.append(df.loc[df["close"].isnull()]).sort_index()
-            self.df[pair] = indicators.copy()
+        for pair, indicators in self.generate_pair_signals():
+            self.df[pair] = indicators
 
             if stoploss_type == "dynamic":
+                # Shallow copy, so the stoploss column is only added to the signals
+                indicators = indicators.copy(deep=False)
                 stoploss = self.strategy.stoploss(indicators)
                 validate_dynamic_stoploss(stoploss)
                 indicators['stoploss'] = stoploss['stoploss']
 
-            data_dict[pair] = indicators.to_dict('index')
+            data_dict[pair] = indicators
 
-            if not self.df[pair][['open', 'high', 'low', 'close', 'volume', 'pair']].equals(
-                    df[['open', 'high', 'low', 'close', 'volume', 'pair']]
-            ):
-                print_error(
-                    "It is not allowed to edit OHLCV data in your strategy. In order to use edited OHLCV data, be sure"
-                    " to save it in a different variable.")
+            if ohlcv_checksum(self.df[pair]) != self.data[pair].checksum:
+                print_error(EDITED_OHLCV_MESSAGE)
                 sys.exit()
-        return data_dict
+        return PairsData(data_dict)
+
+    def generate_pair_signals(self) -> Iterator[Tuple[str, DataFrame]]:
+        """
+        Populates the indicators and buy / sell signals per pair, in a process pool when more than one signal
+        worker is configured. Hyperopt trials cannot be shared with worker processes, so those run serially.
+        """
+        workers = self.config.signal_workers
+        if workers > 1 and len(self.data) > 1 and self.strategy.trial is None:
+            return populate_signals_in_pool(self.strategy, self.data, self.additional_pairs_data, workers)
+
+        return ((pair, populate_pair_signals(self.strategy, self.data[pair], self.additional_pairs_data,
+                                             self.indicator_cache))
+                for pair in self.data.keys())
@@ -0,0 +1,85 @@
+# Libraries
+import hashlib
+from typing import Dict
+
+import numpy as np
+from pandas import DataFrame
+from pandas.util import hash_array
+
+
+# ======================================================================
+# FrozenOhlcv holds the OHLCV data of a pair for a whole backtest or
+# hyperopt session. Its arrays are made read-only once, strategies get
+# shallow views on top of them with their own writeable signal columns,
+# and tampering with the OHLCV columns is detected by checksum.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'pair']
+SIGNAL_COLUMNS = ['buy', 'sell']
+EDITED_OHLCV_MESSAGE = "It is not allowed to edit OHLCV data in your strategy. In order to use edited OHLCV data, " \
+                       "be sure to save it in a different variable."
+
+
+class FrozenOhlcv:
+    """
+    Read-only OHLCV frame of a pair, split once into the non-empty candles handed to generate_indicators and the
+    empty candles that are added back after the signals are populated.
+    """
+
+    def __init__(self, frame: DataFrame):
+        self.frame = freeze(frame.copy())
+        self.empty_candles = freeze(frame.loc[frame['close'].isnull()])
+
+        clean = frame.dropna()
+        # Strategies fill the default signal columns in place, so views get their own copies of them
+        self.signal_columns = [(position, column) for position, column in enumerate(clean.columns)
+                               if column in SIGNAL_COLUMNS]
+        self.signals = freeze(clean[[column for _, column in self.signal_columns]])
+        self.clean = freeze(clean.drop(columns=list(self.signals.columns)))
+        self._checksum = None
+
+    @property
+    def checksum(self) -> str:
+        if self._checksum is None:
+            self._checksum = ohlcv_checksum(self.frame)
+        return self._checksum
+
+    def view(self) -> DataFrame:
+        """
+        :return: A shallow copy of the non-empty candles. The OHLCV arrays are shared and cannot be written to, the
+        signal columns and columns added to it are its own, so `dataframe.loc[condition, 'buy'] = 1` works.
+        """
+        view = self.clean.copy(deep=False)
+        for position, column in self.signal_columns:
+            view.insert(position, column, self.signals[column].to_numpy(copy=True))
+        return view
+
+
+def freeze(frame: DataFrame) -> DataFrame:
+    for values in frame._mgr.arrays:
+        if isinstance(values, np.ndarray):
+            values.flags.writeable = False
+    return frame
+
+
+def freeze_pair_frames(frames: Dict[str, DataFrame]) -> Dict[str, FrozenOhlcv]:
+    return {pair: FrozenOhlcv(frame) for pair, frame in frames.items()}
+
+
+def ohlcv_checksum(frame: DataFrame) -> str:
+    """
+    :return: Digest of the index and OHLCV columns (values and dtypes) of the frame
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(frame.index.to_numpy()))
+
+    for column in OHLCV_COLUMNS:
+        values = frame[column].to_numpy()
+        digest.update(str(values.dtype).encode())
+        if values.dtype == object:
+            values = hash_array(values)
+        digest.update(np.ascontiguousarray(values))
+
+    return digest.hexdigest()
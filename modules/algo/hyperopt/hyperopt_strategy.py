@@ -3,10 +3,9 @@ import inspect
 
 from backtesting.strategy import Strategy
 from modules.algo.hyperopt.parameter_symbol import ParameterSymbol
-from modules.algo.hyperopt.parameters.category_parameter import CategoricalParameter
+from modules.algo.hyperopt.parameters.category_parameter import CategoricalParameter, categorical_property
 from modules.algo.hyperopt.parameters.float_parameter import FloatParameter, float_property
 from modules.algo.hyperopt.parameters.integer_parameter import IntegerParameter, int_property
-from modules.public.hyperopt_parameter import categorical_parameter
 
 
 def flip_params(func):
@@ -22,7 +21,7 @@ is_parameter = functools.partial(flip_params(isinstance), ParameterSymbol)
 params = {
     IntegerParameter: int_property,
     FloatParameter: float_property,
-    CategoricalParameter: categorical_parameter
+    CategoricalParameter: categorical_property
 }
 
 
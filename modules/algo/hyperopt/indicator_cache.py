@@ -0,0 +1,83 @@
+# Libraries
+from collections import OrderedDict, defaultdict
+from typing import Callable, Dict, Set, Tuple
+
+from pandas import DataFrame
+
+# Files
+from backtesting.strategy import Strategy
+from cli.print_utils import print_debug
+from modules.algo.hyperopt.parameter_recorder import record_parameters
+
+
+# ======================================================================
+# IndicatorCache keeps the output of generate_indicators across hyperopt
+# trials, keyed by pair and the values of the hyperopt parameters that
+# generate_indicators actually read. Least recently used frames are
+# evicted once the cache exceeds its memory budget.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+CacheKey = Tuple[str, Tuple[tuple, ...]]
+
+
+class IndicatorCache:
+
+    def __init__(self, memory_budget_mb: float):
+        self.memory_budget = memory_budget_mb * 1024 ** 2
+        self.memory_usage = 0
+        self.frames: 'OrderedDict[CacheKey, DataFrame]' = OrderedDict()
+        self.frame_sizes: Dict[CacheKey, int] = {}
+        self.read_parameters: Dict[str, Set[Tuple[str, ...]]] = defaultdict(set)
+        self.signal_parameters: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.memory_budget > 0
+
+    def generate_indicators(self, strategy: Strategy, pair: str, generate: Callable[[], DataFrame]) -> DataFrame:
+        """
+        :param strategy: Strategy with the hyperopt trial that is being run
+        :param pair: Pair the indicators belong to
+        :param generate: Runs generate_indicators for the pair
+        :return: A copy of the cached indicators when an earlier trial read the same parameter values, otherwise the
+        generated indicators
+        """
+        # Reading a parameter suggests it for the current trial, which is how the previous trials got their values
+        for names in self.read_parameters[pair]:
+            key = (pair, tuple((name, getattr(strategy, name)) for name in names))
+            if key in self.frames:
+                self.frames.move_to_end(key)
+                self.hits += 1
+                return self.frames[key].copy()
+
+        self.misses += 1
+        with record_parameters(strategy) as read:
+            indicators = generate()
+
+        names = tuple(sorted(read))
+        self.read_parameters[pair].add(names)
+        self.store((pair, tuple((name, read[name]) for name in names)), indicators)
+        return indicators
+
+    def store(self, key: CacheKey, indicators: DataFrame) -> None:
+        size = int(indicators.memory_usage(index=True, deep=True).sum())
+        if size > self.memory_budget:
+            return
+
+        self.frames[key] = indicators.copy()
+        self.frame_sizes[key] = size
+        self.memory_usage += size
+
+        while self.memory_usage > self.memory_budget:
+            evicted_key, _ = self.frames.popitem(last=False)
+            self.memory_usage -= self.frame_sizes.pop(evicted_key)
+
+    def print_usage(self) -> None:
+        indicator_parameters = sorted({name for names in self.read_parameters.values() for name in names})
+        print_debug(f"Indicator cache: {self.hits} hits, {self.misses} misses, {len(self.frames)} frames, "
+                    f"{self.memory_usage / 1024 ** 2:.1f} MB. Parameters read by generate_indicators: "
+                    f"{indicator_parameters}, by buy_signal / sell_signal: {sorted(self.signal_parameters)}")
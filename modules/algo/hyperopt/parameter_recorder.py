@@ -0,0 +1,22 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+from backtesting.strategy import Strategy
+
+
+@contextmanager
+def record_parameters(strategy: Strategy) -> Iterator[dict]:
+    """
+    Records the hyperopt parameters (name -> suggested value) read from the strategy within the context
+    """
+    previous = strategy.recorded_parameters
+    strategy.recorded_parameters = {}
+    try:
+        yield strategy.recorded_parameters
+    finally:
+        strategy.recorded_parameters = previous
+
+
+def register_parameter(strategy: Strategy, name: str, value) -> None:
+    if strategy.recorded_parameters is not None:
+        strategy.recorded_parameters[name] = value
@@ -3,6 +3,7 @@ from typing import Sequence
 from optuna.distributions import CategoricalChoiceType
 
 from backtesting.strategy import Strategy
+from modules.algo.hyperopt.parameter_recorder import register_parameter
 from modules.algo.hyperopt.parameter_symbol import ParameterSymbol
 
 
@@ -18,6 +19,8 @@ def categorical_property(float_param: CategoricalParameter, name: str):
         if not strategy.trial:
             return float_param.default
 
-        return strategy.trial.suggest_categorical(name, float_param.options)
+        value = strategy.trial.suggest_categorical(name, float_param.options)
+        register_parameter(strategy, name, value)
+        return value
 
     return get_value
@@ -1,4 +1,5 @@
 from backtesting.strategy import Strategy
+from modules.algo.hyperopt.parameter_recorder import register_parameter
 from modules.algo.hyperopt.parameter_symbol import ParameterSymbol
 
 
@@ -16,6 +17,8 @@ def float_property(float_param: FloatParameter, name: str):
         if not strategy.trial:
             return float_param.default
 
-        return strategy.trial.suggest_float(name, float_param.low, float_param.high, step=float_param.step)
+        value = strategy.trial.suggest_float(name, float_param.low, float_param.high, step=float_param.step)
+        register_parameter(strategy, name, value)
+        return value
 
     return get_value
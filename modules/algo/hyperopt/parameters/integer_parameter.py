@@ -1,4 +1,5 @@
 from backtesting.strategy import Strategy
+from modules.algo.hyperopt.parameter_recorder import register_parameter
 from modules.algo.hyperopt.parameter_symbol import ParameterSymbol
 
 
@@ -16,5 +17,7 @@ def int_property(int_param: IntegerParameter, name: str):
         if not first.trial:
             return int_param.default
 
-        return first.trial.suggest_int(name, int_param.low, int_param.high, int_param.step)
+        value = first.trial.suggest_int(name, int_param.low, int_param.high, int_param.step)
+        register_parameter(first, name, value)
+        return value
     return get_value
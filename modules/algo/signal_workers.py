@@ -0,0 +1,116 @@
+# Libraries
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+from pandas import DataFrame
+
+# Files
+from backtesting.strategy import Strategy
+from cli.print_utils import print_error
+from modules.algo.frozen_ohlcv import EDITED_OHLCV_MESSAGE, FrozenOhlcv
+from modules.algo.hyperopt.hyperopt_strategy import inject_hyperopt_parameters
+from modules.algo.hyperopt.indicator_cache import IndicatorCache
+from modules.algo.hyperopt.parameter_recorder import record_parameters
+
+
+# ======================================================================
+# Signal workers populate indicators / signals of several pairs at once
+# in a process pool. OHLCV frames are handed to the workers as Arrow IPC
+# buffers, the strategy and additional pairs are sent once per worker.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+_worker_strategy = None
+_worker_additional_pairs_data = None
+
+
+def populate_pair_signals(strategy: Strategy, ohlcv: FrozenOhlcv, additional_pairs_data: dict,
+                          indicator_cache: Optional[IndicatorCache] = None) -> DataFrame:
+    """
+    Runs generate_indicators, buy_signal and sell_signal on the non-empty candles of a pair and adds the empty
+    candles back afterwards. During hyperopt, indicators are looked up in / stored to indicator_cache when given.
+    """
+    try:
+        indicators = populate_clean_signals(strategy, ohlcv, additional_pairs_data, indicator_cache)
+
+    except ValueError as error:
+        # The OHLCV arrays of the view are read-only, so editing them in place fails before any checksum
+        if 'read-only' not in str(error):
+            raise
+        print_error(EDITED_OHLCV_MESSAGE)
+        sys.exit()
+
+    return indicators.append(ohlcv.empty_candles).sort_index()
+
+
+def populate_clean_signals(strategy: Strategy, ohlcv: FrozenOhlcv, additional_pairs_data: dict,
+                           indicator_cache: Optional[IndicatorCache]) -> DataFrame:
+    def generate() -> DataFrame:
+        return generate_indicators(strategy, ohlcv.view(), additional_pairs_data)
+
+    if indicator_cache is not None and indicator_cache.enabled and strategy.trial is not None \
+            and not ohlcv.frame.empty:
+        indicators = indicator_cache.generate_indicators(strategy, ohlcv.frame["pair"].iloc[0], generate)
+
+        with record_parameters(strategy) as read:
+            indicators = strategy.buy_signal(indicators)
+            indicators = strategy.sell_signal(indicators)
+        indicator_cache.signal_parameters.update(read)
+    else:
+        indicators = strategy.buy_signal(generate())
+        indicators = strategy.sell_signal(indicators)
+    return indicators
+
+
+def generate_indicators(strategy: Strategy, cleandf: DataFrame, additional_pairs_data: dict) -> DataFrame:
+    try:
+        return strategy.generate_indicators(cleandf, additional_pairs_data)
+    except TypeError:
+        return strategy.generate_indicators(cleandf)
+
+
+def frame_to_arrow_buffer(df: DataFrame) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def frame_from_arrow_buffer(buffer: bytes) -> DataFrame:
+    return pa.ipc.open_stream(pa.py_buffer(buffer)).read_all().to_pandas()
+
+
+def init_worker(strategy: Strategy, additional_pairs_data: dict) -> None:
+    global _worker_strategy, _worker_additional_pairs_data
+
+    # Hyperopt properties live on the strategy class, which a spawned worker imports fresh
+    inject_hyperopt_parameters(strategy)
+    _worker_strategy = strategy
+    _worker_additional_pairs_data = additional_pairs_data
+
+
+def populate_pair_signals_in_worker(buffer: bytes) -> DataFrame:
+    ohlcv = FrozenOhlcv(frame_from_arrow_buffer(buffer))
+    return populate_pair_signals(_worker_strategy, ohlcv, _worker_additional_pairs_data)
+
+
+def populate_signals_in_pool(strategy: Strategy, data: Dict[str, FrozenOhlcv], additional_pairs_data: dict,
+                             workers: int) -> Iterator[Tuple[str, DataFrame]]:
+    """
+    :param strategy: Strategy used to populate the signals, must be picklable
+    :param data: OHLCV per pair
+    :param additional_pairs_data: Additional pairs passed to generate_indicators
+    :param workers: Maximum amount of worker processes
+    :return: Pairs with their populated frame, in the order of data
+    """
+    pairs: List[str] = list(data.keys())
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(pairs)),
+                             initializer=init_worker,
+                             initargs=(strategy, additional_pairs_data)) as executor:
+        buffers = (frame_to_arrow_buffer(data[pair].frame) for pair in pairs)
+        yield from zip(pairs, executor.map(populate_pair_signals_in_worker, buffers))
@@ -0,0 +1,117 @@
+# Libraries
+import sys
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+# Files
+from backtesting.strategy import Strategy
+from cli.print_utils import print_warning
+from modules.algo.frozen_ohlcv import FrozenOhlcv
+from modules.algo.signal_workers import generate_indicators, populate_pair_signals
+from utils.error_handling import ErrorOutput, StrategyConfigurationError
+
+
+# ======================================================================
+# StreamingSignals keeps the populated signals of a pair up to date while
+# new candles arrive one at a time. Only the warmup window declared by the
+# strategy is passed through generate_indicators for every new candle,
+# instead of the full history.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+
+class StreamingSignals:
+    """
+    Populates the signals of the initial OHLCV in batch, after which append evaluates the strategy on the last
+    strategy.warmup_candles non-empty candles plus the new candle. Empty candles are added without signals, as in
+    a batch run.
+    """
+
+    def __init__(self, strategy: Strategy, ohlcv: DataFrame, additional_pairs_data: Optional[dict] = None):
+        """
+        :param ohlcv: OHLCV of the pair up to now, in the format the DataModule hands to BackTesting
+        """
+        validate_warmup_candles(strategy)
+        self.strategy = strategy
+        self.additional_pairs_data = additional_pairs_data
+        self.ohlcv = ohlcv
+        self.batch_signals = populate_pair_signals(strategy, FrozenOhlcv(ohlcv), additional_pairs_data)
+
+        self.window = last_candles(ohlcv.dropna(), strategy.warmup_candles)
+        self.candles: List[dict] = []
+        self.rows: List[Series] = []
+
+    def append(self, candle: dict) -> Series:
+        """
+        :param candle: New candle with at least the OHLCV columns and its time
+        :return: The populated signals of the new candle
+        """
+        self.candles.append(candle)
+        row = DataFrame([candle], index=pd.Index([candle['time']], name=self.ohlcv.index.name))
+
+        if np.isnan(candle['close']):
+            signals = row.iloc[0]
+        else:
+            window = pd.concat([self.window, row])
+            # The strategy adds its columns to the frame it gets, the window itself only holds OHLCV
+            indicators = generate_indicators(self.strategy, window.copy(), self.additional_pairs_data)
+            indicators = self.strategy.sell_signal(self.strategy.buy_signal(indicators))
+            signals = indicators.iloc[-1]
+            self.window = last_candles(window, self.strategy.warmup_candles)
+
+        self.rows.append(signals)
+        return signals
+
+    @property
+    def signals(self) -> DataFrame:
+        """
+        :return: Signals of the initial OHLCV and every appended candle
+        """
+        if len(self.rows) == 0:
+            return self.batch_signals
+        return pd.concat([self.batch_signals, DataFrame(self.rows).infer_objects()])
+
+    def check_against_batch(self) -> bool:
+        """
+        Populates the signals of the full history in batch and compares the appended candles with them. A mismatch
+        means warmup_candles is too small for the indicators of the strategy.
+        """
+        ohlcv = pd.concat([self.ohlcv, DataFrame(self.candles, index=pd.Index(
+            [candle['time'] for candle in self.candles], name=self.ohlcv.index.name))])
+        batch = populate_pair_signals(self.strategy, FrozenOhlcv(ohlcv), self.additional_pairs_data)
+        streamed = self.signals.iloc[len(self.batch_signals):]
+        batch = batch.loc[streamed.index]
+
+        mismatches = [column for column in batch.columns
+                      if column not in streamed.columns or not values_match(batch[column], streamed[column])]
+        if mismatches:
+            print_warning(f"Streamed signals differ from the batch signals in {', '.join(mismatches)}, "
+                          f"warmup_candles = {self.strategy.warmup_candles} might be too small.")
+        return len(mismatches) == 0
+
+
+def last_candles(frame: DataFrame, n: int) -> DataFrame:
+    return frame.iloc[max(len(frame) - n, 0):]
+
+
+def values_match(batch: Series, streamed: Series) -> bool:
+    if batch.dtype.kind in 'biuf' and streamed.dtype.kind in 'biuf':
+        return bool(np.allclose(batch.to_numpy(dtype=np.float64), streamed.to_numpy(dtype=np.float64),
+                                equal_nan=True))
+    return batch.astype(object).equals(streamed.astype(object))
+
+
+def validate_warmup_candles(strategy: Strategy) -> None:
+    try:
+        if not isinstance(strategy.warmup_candles, int) or strategy.warmup_candles < 0:
+            raise StrategyConfigurationError()
+
+    except StrategyConfigurationError:
+        ErrorOutput(sys.exc_info(),
+                    add_info="Incremental signals require the strategy to declare warmup_candles: the amount of "
+                             "candles generate_indicators needs before the current candle.",
+                    stop=True).print_error()
@@ -114,9 +114,9 @@ def log_trades(stats: TradingStats, config: ConfigModule):
 
 def create_tearsheet(trades):
     dict_count = len(trades)
-    df = pd.DataFrame(trades[0].__dict__, index=[0])
+    df = pd.DataFrame(trades[0].to_dict(), index=[0])
     for i in range(1, dict_count):
-        df = df.append(trades[i].__dict__, ignore_index=True)
+        df = df.append(trades[i].to_dict(), ignore_index=True)
 
     df.to_excel('data/backtesting-data/tearsheet.xlsx')
 
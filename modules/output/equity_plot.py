@@ -18,7 +18,8 @@ def equity_plot(stats: TradingStats, strategy_name):
 
     Path("data/backtesting-data/plots/equity").mkdir(parents=True, exist_ok=True)
 
-    df_capital = pd.DataFrame(list(stats.capital_per_timestamp.items()), columns=['timestamp', 'capital'])
+    equity_curve = stats.equity_curve
+    df_capital = pd.DataFrame({'timestamp': equity_curve.times, 'capital': equity_curve.values('capital')})
 
     df_capital, dates = convert_df_for_plotting(df_capital)
 
@@ -1,7 +1,8 @@
 # Libraries
+import math
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 
 from rich import box
 from rich.console import JustifyMethod
@@ -10,7 +11,7 @@ from rich.table import Table
 
 # Files
 from cli.print_utils import print_standard, console_color
-from modules.public.trading_stats import MainResults
+from modules.public.trading_stats import MainResults, MonteCarloSummary, WalkForwardSummary
 from utils.utils import CURRENT_VERSION
 
 
@@ -221,6 +222,106 @@ def create_settings_table(self: MainResults, currency_symbol, justification, tes
     return settings_table
 
 
+def show_sweep_results(sweep: List[dict], results: List[MainResults], currency_symbol: str):
+    """
+    :param sweep: Settings of every configuration, as configured in 'sweep'
+    :param results: Main results of every configuration, in the same order
+    """
+    labels = [", ".join(f"{name}: {value}" for name, value in settings.items()) or "-" for settings in sweep]
+    sweep_table = create_comparison_table("Configuration :wrench:", labels, results, currency_symbol)
+
+    table_grid = Table(box=box.SIMPLE)
+    table_grid.add_column(f":robot: {results[0].strategy_name}'s Sweep brought to you by DemaTrading.ai's Engine "
+                          f":robot:")
+    table_grid.add_row(sweep_table)
+    console_color.print(table_grid)
+
+
+def show_walk_forward_results(windows: List[str], results: List[MainResults], summary: WalkForwardSummary,
+                              currency_symbol: str):
+    """
+    :param windows: Label of every test window
+    :param results: Main results of every test window, in the same order
+    """
+    justification: JustifyMethod = "left"
+    windows_table = create_comparison_table("Test window :calendar:", windows, results, currency_symbol)
+
+    summary_table = Table(box=box.ROUNDED)
+    summary_table.add_column("Walk-forward :mag:", justify=justification, width=25)
+    summary_table.add_column(justify=justification, width=20)
+    summary_table.add_row("Profitable windows", f"{summary.profitable_windows} / {summary.n_windows}")
+    summary_table.add_row("Compounded profit",
+                          colorize(convert_ratio_to_percentage(summary.compounded_profit_ratio), 0, '%'))
+    summary_table.add_row("Avg. profit per window",
+                          colorize(convert_ratio_to_percentage(summary.mean_profit_ratio), 0, '%'))
+    summary_table.add_row("Worst max. seen drawdown",
+                          colorize(convert_ratio_to_percentage(summary.worst_max_seen_drawdown), 0, '%'))
+    summary_table.add_row("Closed trades", str(summary.n_trades))
+
+    table_grid = Table(box=box.SIMPLE)
+    table_grid.add_column(f":robot: {results[0].strategy_name}'s Walk-forward brought to you by DemaTrading.ai's "
+                          f"Engine :robot:")
+    table_grid.add_row(windows_table)
+    table_grid.add_row(summary_table)
+    console_color.print(table_grid)
+
+
+def show_monte_carlo_results(summary: MonteCarloSummary, strategy_name: str):
+    justification: JustifyMethod = "left"
+
+    distribution_table = Table(box=box.ROUNDED)
+    distribution_table.add_column(f"Distribution of {summary.n_runs} runs :game_die:", justify=justification)
+    for percentile in summary.percentiles:
+        distribution_table.add_column(f"P{percentile}", justify=justification)
+
+    rows = [("Overall profit", summary.profit_ratio, True),
+            ("Max. seen drawdown", summary.max_seen_drawdown, True),
+            ("Sharpe (90d)", summary.sharpe_90d, False)]
+    if summary.resampled_profit_ratio is not None:
+        rows += [("Resampled trades profit", summary.resampled_profit_ratio, True),
+                 ("Resampled trades drawdown", summary.resampled_max_drawdown, True)]
+
+    for label, values, is_ratio in rows:
+        distribution_table.add_row(label, *[format_distribution_value(value, is_ratio) for value in values])
+
+    table_grid = Table(box=box.SIMPLE)
+    table_grid.add_column(f":robot: {strategy_name}'s Monte Carlo brought to you by DemaTrading.ai's Engine :robot:")
+    table_grid.add_row(distribution_table)
+    console_color.print(table_grid)
+
+
+def format_distribution_value(value: float, is_ratio: bool) -> str:
+    if math.isnan(value):
+        return "-"
+    if is_ratio:
+        return colorize(convert_ratio_to_percentage(value), 0, '%')
+    return str(round(value, 2))
+
+
+def create_comparison_table(label_column: str, labels: List[str], results: List[MainResults],
+                            currency_symbol: str) -> Table:
+    justification: JustifyMethod = "left"
+
+    comparison_table = Table(box=box.ROUNDED)
+    comparison_table.add_column(label_column, justify=justification)
+    for column in ["End capital", "Overall profit", "Max. realised drawdown", "Max. seen drawdown",
+                   "Closed trades", "Sharpe (90d)", "Sortino (90d)"]:
+        comparison_table.add_column(column, justify=justification)
+
+    for label, main_results in zip(labels, results):
+        comparison_table.add_row(
+            label,
+            colorize(round(main_results.end_capital, 2), round(main_results.starting_capital, 2),
+                     str(currency_symbol)),
+            colorize(convert_ratio_to_percentage(main_results.overall_profit_ratio), 0, '%'),
+            colorize(convert_ratio_to_percentage(main_results.max_realised_drawdown), 0, '%'),
+            colorize(convert_ratio_to_percentage(main_results.max_seen_drawdown), 0, '%'),
+            str(main_results.n_trades),
+            str(round(main_results.sharpe_90d, 2)) if main_results.sharpe_90d is not None else "-",
+            str(round(main_results.sortino_90d, 2)) if main_results.sortino_90d is not None else "-")
+    return comparison_table
+
+
 @dataclass
 class CoinInsights:
     pair: str
@@ -1 +1,78 @@
-PairsData = dict
+from typing import Dict, Iterator, Mapping
+
+import numpy as np
+from pandas import DataFrame
+
+
+class PairFrame(Mapping):
+    """
+    Read-only, mapping-like view of the signal DataFrame of a single pair. Indexing with a tick (timestamp in ms)
+    returns that candle as a dict, which is only built when asked for. The DataFrame and its NumPy columns are
+    shared, not copied.
+    """
+
+    def __init__(self, frame: DataFrame):
+        self._frame = frame
+        self._columns = {}
+
+    @property
+    def frame(self) -> DataFrame:
+        return self._frame
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        :param name: Name of the column
+        :return: Read-only NumPy array of the column, sharing memory with the DataFrame when possible
+        """
+        if name not in self._columns:
+            values = self._frame[name].to_numpy()
+            values = values.view()
+            values.flags.writeable = False
+            self._columns[name] = values
+        return self._columns[name]
+
+    def __getitem__(self, tick) -> dict:
+        position = self._frame.index.get_loc(tick)
+        return {name: to_native(self.column(name)[position]) for name in self._frame.columns}
+
+    def __iter__(self) -> Iterator:
+        return iter(self._frame.index)
+
+    def __len__(self) -> int:
+        return len(self._frame.index)
+
+    def __contains__(self, tick) -> bool:
+        return tick in self._frame.index
+
+
+class PairsData(Mapping):
+    """
+    Read-only mapping of pair name to the PairFrame holding its indicators and signals.
+    """
+
+    def __init__(self, frames: Dict[str, DataFrame]):
+        self._pairs = {pair: PairFrame(frame) for pair, frame in frames.items()}
+
+    @staticmethod
+    def from_dicts(pair_dicts: Mapping) -> 'PairsData':
+        """
+        :param pair_dicts: Mapping of pair to {tick: candle dict}, as produced by DataFrame.to_dict('index')
+        """
+        return PairsData({pair: DataFrame.from_dict(dict(candles), orient='index')
+                          for pair, candles in pair_dicts.items()})
+
+    def frames(self) -> Dict[str, DataFrame]:
+        return {pair: pair_frame.frame for pair, pair_frame in self._pairs.items()}
+
+    def __getitem__(self, pair: str) -> PairFrame:
+        return self._pairs[pair]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._pairs)
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+
+def to_native(value):
+    return value.item() if isinstance(value, np.generic) else value
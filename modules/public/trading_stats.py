@@ -1,10 +1,12 @@
+import warnings
 from dataclasses import dataclass
 from datetime import timedelta, datetime
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from pandas import DataFrame
 
 from modules.public.pairs_data import PairsData
+from modules.stats.equity_curve import EquityCurve
 
 
 @dataclass
@@ -73,4 +75,39 @@ class TradingStats:
     sellpoints: dict
     df: DataFrame
     trades: list
-    capital_per_timestamp: dict
+    equity_curve: EquityCurve
+
+    @property
+    def capital_per_timestamp(self) -> dict:
+        """
+        Deprecated, use equity_curve.series('capital') instead
+        :return: Capital per timestamp in ms
+        """
+        warnings.warn("TradingStats.capital_per_timestamp is deprecated, use equity_curve.series('capital') instead",
+                      DeprecationWarning, stacklevel=2)
+        return dict(zip(self.equity_curve.times.tolist(), self.equity_curve.values('capital').tolist()))
+
+
+@dataclass
+class WalkForwardSummary:
+    n_windows: int
+    profitable_windows: int
+    compounded_profit_ratio: float
+    mean_profit_ratio: float
+    worst_max_seen_drawdown: float
+    n_trades: int
+
+
+@dataclass
+class MonteCarloSummary:
+    """
+    Every distribution holds the value at each of the percentiles, resampled distributions are None when trades
+    were not resampled.
+    """
+    n_runs: int
+    percentiles: List[int]
+    profit_ratio: List[float]
+    max_seen_drawdown: List[float]
+    sharpe_90d: List[float]
+    resampled_profit_ratio: Optional[List[float]]
+    resampled_max_drawdown: Optional[List[float]]
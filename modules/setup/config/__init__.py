@@ -2,13 +2,15 @@
 # file, like validation and currency support
 
 # Libraries
+import copy
 import json
 import sys
 from datetime import datetime
-from typing import Tuple
+from typing import List, Tuple
 
 import ccxt.binance
 
+from cli.arg_parse import read_spec
 from cli.print_utils import print_info, print_standard, print_warning
 from utils.error_handling import ConfigError, ErrorOutput
 # Files
@@ -17,13 +19,16 @@ from .cctx_adapter import create_cctx_exchange
 from .currencies import get_currency_symbol
 from .legacy_transforms import transform_subplot_config
 from .strategy_definition import StrategyDefinition
-from .validations import validate_and_read_cli, check_for_missing_config_items
+from .validations import validate_and_read_cli, check_for_missing_config_items, validate_by_spec
 
 msec = 1000
 minute = 60 * msec
 hour = 60 * minute
 day = 24 * hour
 
+# Settings a sweep can vary per configuration, they only affect the TradingModule and not the signals
+SWEEP_SETTINGS = ["stoploss", "roi", "max-open-trades", "exposure-per-trade"]
+
 
 class ConfigModule(object):
     raw_config: dict
@@ -51,6 +56,25 @@ class ConfigModule(object):
         self.strategy_name = None
         self.exchange = None
         self.randomize_pair_order = None
+        self.tick_engine = None
+        self.signal_workers = None
+        self.n_jobs = None
+        self.hyperopt_pruner = None
+        self.hyperopt_checkpoints = None
+        self.hyperopt_pruning_metric = None
+        self.hyperopt_max_drawdown = None
+        self.indicator_cache_mb = None
+        self.sweep = None
+        self.sweep_workers = None
+        self.walk_forward_test_days = None
+        self.walk_forward_train_days = None
+        self.walk_forward_trials = None
+        self.walk_forward_workers = None
+        self.monte_carlo_runs = None
+        self.monte_carlo_seed = None
+        self.monte_carlo_resample_trades = None
+        self.monte_carlo_workers = None
+        self.statistics_workers = None
         self.pairs = []
 
         self.btc_marketchange_ratio = None
@@ -97,8 +121,40 @@ def create_config_from_dict(config: dict, online) -> ConfigModule:
     for pair in config["pairs"]:
         config_module.pairs.append(pair + "/" + config["currency"])
     config_module.fee = config["fee"]
-    config_module.stoploss = config["stoploss"]
     config_module.stoploss_type = config["stoploss-type"]
+    read_trading_settings(config_module, config)
+    config_module.disable_plots = config["disable-plots"]
+    config_module.tearsheet = config.get("tearsheet", False)
+    config_module.export_result = config.get("export-result", False)
+    config_module.currency_symbol = get_currency_symbol(config_module.raw_config)
+    config_module.randomize_pair_order = config["randomize-pair-order"]
+    config_module.tick_engine = config.get("tick-engine", "event")
+    config_module.signal_workers = config.get("signal-workers", 1)
+    config_module.n_jobs = config.get("n-jobs", 1)
+    config_module.hyperopt_pruner = config.get("hyperopt-pruner", "none")
+    config_module.hyperopt_checkpoints = config.get("hyperopt-checkpoints", 10)
+    config_module.hyperopt_pruning_metric = config.get("hyperopt-pruning-metric", "profit")
+    config_module.hyperopt_max_drawdown = config.get("hyperopt-max-drawdown", 0)
+    config_module.indicator_cache_mb = config.get("indicator-cache-mb", 512)
+    config_module.sweep = config.get("sweep", [])
+    config_module.sweep_workers = config.get("sweep-workers", 1)
+    config_module.walk_forward_test_days = config.get("walk-forward-test-days", 0)
+    config_module.walk_forward_train_days = config.get("walk-forward-train-days", 0)
+    config_module.walk_forward_trials = config.get("walk-forward-trials", 0)
+    config_module.walk_forward_workers = config.get("walk-forward-workers", 1)
+    config_module.monte_carlo_runs = config.get("monte-carlo-runs", 0)
+    config_module.monte_carlo_seed = config.get("monte-carlo-seed", 0)
+    config_module.monte_carlo_resample_trades = config.get("monte-carlo-resample-trades", False)
+    config_module.monte_carlo_workers = config.get("monte-carlo-workers", 1)
+    config_module.statistics_workers = config.get("statistics-workers", 1)
+    return config_module
+
+
+def read_trading_settings(config_module: ConfigModule, config: dict) -> None:
+    """
+    Reads the settings that can be varied by a sweep, see SWEEP_SETTINGS
+    """
+    config_module.stoploss = config["stoploss"]
     config_module.max_open_trades = config["max-open-trades"]
     config_module.exposure_per_trade = config["exposure-per-trade"]
     if float(config_module.exposure_per_trade) != round(config_module.exposure_per_trade, 2):
@@ -110,13 +166,35 @@ def create_config_from_dict(config: dict, online) -> ConfigModule:
             f"Exposure is not 100% (default), this means that every trade will use "
             f"{round(config_module.exposure_per_trade * 100, 2)}% funds per trade until either all funds are "
             f"used or max open trades are open.")
-    config_module.disable_plots = config["disable-plots"]
-    config_module.tearsheet = config.get("tearsheet", False)
-    config_module.export_result = config.get("export-result", False)
     config_module.roi = config["roi"]
-    config_module.currency_symbol = get_currency_symbol(config_module.raw_config)
-    config_module.randomize_pair_order = config["randomize-pair-order"]
-    return config_module
+
+
+def create_sweep_configs(config_module: ConfigModule) -> List[ConfigModule]:
+    return [create_sweep_config(config_module, settings) for settings in config_module.sweep]
+
+
+def create_sweep_config(config_module: ConfigModule, settings: dict) -> ConfigModule:
+    """
+    :param settings: Settings overriding those of config_module, FI: {"stoploss": -5, "max-open-trades": 2}
+    :return: A copy of config_module with the settings applied
+    """
+    try:
+        if not isinstance(settings, dict) or any(name not in SWEEP_SETTINGS for name in settings):
+            raise ConfigError
+
+    except ConfigError:
+        ErrorOutput(sys.exc_info(),
+                    add_info=f"Every 'sweep' entry should be a dict with some of the settings "
+                             f"{', '.join(SWEEP_SETTINGS)}, but got {settings}.",
+                    stop=True).print_error()
+
+    config = {**config_module.raw_config, **settings}
+    validate_by_spec(config, [spec for spec in read_spec() if spec["name"] in settings])
+
+    sweep_config = copy.copy(config_module)
+    sweep_config.raw_config = config
+    read_trading_settings(sweep_config, config)
+    return sweep_config
 
 
 def read_config(config_path: str, online: bool) -> dict:
@@ -6,16 +6,20 @@ from datetime import datetime
 from os import path
 from typing import Optional, Tuple
 
+import ccxt.async_support as ccxt
 import numpy as np
 import pandas as pd
 import rapidjson
 from pandas import DataFrame
+from pyarrow import ArrowInvalid
 
 from cli.print_utils import print_info, print_error, print_warning
 # Files
 from modules.setup.config import ConfigModule
-from modules.setup.market_change import online_fetch_btc_info, offline_fetch_btc_info, compute_market_change, \
-    compute_drawdown
+from modules.setup.datastore import OhlcvDatastore
+from modules.setup.downloader import OhlcvDownloader, plan_slices
+from modules.setup.resample import resample_ohlcv, find_source_timeframe
+from modules.setup.market_change import compute_market_change, compute_drawdown
 from utils.error_handling import ErrorOutput, ConfigError, OfflineMissingDataError
 from utils.utils import get_ohlcv_indicators, parse_timeframe
 
@@ -27,12 +31,16 @@ from utils.utils import get_ohlcv_indicators, parse_timeframe
 # © 2021 DemaTrading.ai
 # ======================================================================
 
+BACKTESTING_DATA_DIR = "data/backtesting-data"
+
 
 class DataModule:
 
     def __init__(self, online):
         self.config = None
         self.exchange = None
+        self.datastore = None
+        self.downloader = None
         self.online = online
 
     @staticmethod
@@ -41,6 +49,8 @@ class DataModule:
         data_module = DataModule(online)
         data_module.config = config
         data_module.exchange = config.exchange
+        data_module.datastore = OhlcvDatastore(os.path.join(BACKTESTING_DATA_DIR, config.exchange_name))
+        data_module.downloader = OhlcvDownloader(config.exchange)
         if online:
             await data_module.load_markets()
         return data_module
@@ -51,20 +61,24 @@ class DataModule:
         that the baseline metrics are not available.
         :return: A tuple with market change and drawdown if the required data is available, other a tuple of None
         """
-        filename = f'data-BTCUSDT{self.config.timeframe}.feather'
-        filepath = 'data/backtesting-data/binance'
+        pair, timeframe = 'BTC/USDT', self.config.timeframe
+        data_from, data_to = self.config.backtesting_from, self.config.backtesting_to
+        self.import_legacy_datafile(pair)
+        missing_ranges = self.datastore.missing_ranges(pair, timeframe, data_from, data_to)
 
-        if filename in os.listdir(filepath):
+        if len(missing_ranges) == 0 or (not self.online and self.datastore.has_data(pair, timeframe)):
             print_info("Using last locally saved data of BTC/USDT...")
-            data = offline_fetch_btc_info(filepath + '/' + filename)
+            data = self.datastore.read(pair, timeframe, data_from, data_to, columns=['close'])
 
         elif self.online:
             print_info(f"Fetching BTC/USDT data from {self.config.exchange_name}")
-            data = await online_fetch_btc_info(self.exchange, self.config.backtesting_from, self.config.backtesting_to,
-                                               self.config.timeframe_ms, self.config.timeframe)
-            self.save_dataframe('BTC/USDT', data)
+            data = await self.download_data_for_pair(pair, data_from, data_to)
+            data = data.loc[data['close'].notnull()]
 
         else:
+            data = None
+
+        if data is None or data['close'].dropna().empty:
             print_warning("The BTC/USDT pair used for baseline is not saved locally and you are offline. Some "
                           "metrics will be unavailable.")
             return None, None
@@ -99,12 +113,14 @@ class DataModule:
         df = pd.DataFrame()
 
         try:
+            self.resample_missing_ranges(pair)
             if self.is_datafolder_exist(pair):
                 print_info("Reading datafile for %s." % pair)
                 try:
                     df = await self.read_data_from_datafile(pair)
 
-                except rapidjson.JSONDecodeError:
+                except (rapidjson.JSONDecodeError, ArrowInvalid):
+                    self.datastore.remove(pair, self.config.timeframe)
                     if self.online:
                         print_info("Unable to read datafile for %s, starting download..." % pair)
                         df = await self.download_data_for_pair(pair, self.config.backtesting_from,
@@ -133,58 +149,64 @@ class DataModule:
         await self.exchange.load_markets()
 
     async def download_data_for_pair(self, pair: str, data_from: int, data_to: int, save: bool = True) -> DataFrame:
-        start_date = data_from
-        fetch_ohlcv_limit = 1000
+        """
+        Downloads the candles of [data_from, data_to). When saving, every downloaded slice is stored right away, so an
+        interrupted download resumes from the slices that are missing.
+        """
+        timeframe, timeframe_ms = self.config.timeframe, self.config.timeframe_ms
 
         if save:
             print_info("Downloading %s's data" % pair)
 
-        slice_request_payloads = []
-        while start_date < data_to:
-            # Request ticks for given pair (maximum = 1000)
-            remaining_ticks = (data_to - start_date) / self.config.timeframe_ms
-            asked_ticks = min(remaining_ticks, fetch_ohlcv_limit)
-            slice_request_payloads.append([asked_ticks, start_date])
-            start_date += np.around(asked_ticks * self.config.timeframe_ms)
-
-        results = []
-        chunked_payload = chunks(slice_request_payloads, 200)
-        for chunk in chunked_payload:  # chunk so we don't overload throttle queue
-            results.extend(
-                await asyncio.gather(*[self.exchange.fetch_ohlcv(symbol=pair,
-                                                                 timeframe=self.config.timeframe,
-                                                                 since=int(start_date),
-                                                                 limit=int(asked_ticks)) for [asked_ticks, start_date]
-                                       in chunk])
-            )
-
-        index = [candle[0] for results in results for candle in results]  # timestamps
-        ohlcv_data = [candle for results in results for candle in results]
+        def checkpoint(since: int, limit: int, candles: list) -> None:
+            self.datastore.write(pair, timeframe, candles_to_frame(candles, pair), since,
+                                 min(since + limit * timeframe_ms, data_to))
+
+        try:
+            slices = plan_slices(data_from, data_to, timeframe_ms, self.downloader.fetch_limit)
+            ohlcv_data = await self.downloader.download(pair, timeframe, slices, checkpoint if save else None)
+
+        except ccxt.BaseError:
+            ErrorOutput(sys.exc_info(),
+                        add_info=f"Downloading the data of {pair} failed. The candles downloaded so far are saved, "
+                                 f"run again to resume the download.",
+                        stop=True).print_error()
 
         # Create pandas DataFrame and adds pair info
-        df = DataFrame(ohlcv_data, index=index, columns=get_ohlcv_indicators()[:-3])
-        df['pair'] = pair
-        df['buy'], df['sell'] = 0, 0  # default values
+        df = candles_to_frame(ohlcv_data, pair)
 
         # Create missing NaN data
         df = self.fill_missing_ticks(df, pair, data_from, data_to)
 
         if save:
-            print_info("[%s] %s candles downloaded." % (pair, len(index)))
-            self.save_dataframe(pair, df)
+            print_info("[%s] %s candles downloaded." % (pair, len(ohlcv_data)))
 
         return df
 
     def is_datafolder_exist(self, pair: str) -> bool:
         # Check if datafolder exists
-        filename = self.generate_datafile_name(pair)
-        exchange_path = os.path.join("data/backtesting-data", self.config.exchange_name)
+        exchange_path = os.path.join(BACKTESTING_DATA_DIR, self.config.exchange_name)
         if not path.exists(exchange_path):
             self.create_directory(exchange_path)
 
-        # Checks if datafile exists
-        dir_path = os.path.join(exchange_path, filename)
-        return path.exists(dir_path)
+        # Checks if candles of the pair are stored
+        self.import_legacy_datafile(pair)
+        return self.datastore.has_data(pair, self.config.timeframe)
+
+    def import_legacy_datafile(self, pair: str) -> None:
+        """
+        Moves the candles of a single-file datafile (data-<PAIR><TIMEFRAME>.feather) into the datastore, once
+        """
+        filepath = os.path.join(BACKTESTING_DATA_DIR, self.config.exchange_name, self.generate_datafile_name(pair))
+        if self.datastore.has_data(pair, self.config.timeframe) or not path.exists(filepath):
+            return
+
+        df = pd.read_feather(filepath, columns=get_ohlcv_indicators() + ["index"])
+        df.set_index("index", inplace=True)
+        if len(df.index) > 0:
+            self.datastore.write(pair, self.config.timeframe, df, int(df.index[0]),
+                                 int(df.index[-1]) + self.config.timeframe_ms)
+        os.rename(filepath, filepath + ".imported")
 
     @staticmethod
     def create_directory(directory: str) -> None:
@@ -195,94 +217,87 @@ class DataModule:
         else:
             print_info("Successfully created the directory %s " % directory)
 
+    def get_final_timestamp(self) -> int:
+        # Find correct last tick timestamp
+        n_downloaded_candles = (self.config.backtesting_to - self.config.backtesting_from) / self.config.timeframe_ms
+        timesteps_forward = int(n_downloaded_candles) * self.config.timeframe_ms
+        return self.config.backtesting_from + (timesteps_forward - self.config.timeframe_ms)  # last tick is excluded
+
+    def resample_missing_ranges(self, pair: str) -> None:
+        """
+        Derives candles of the backtesting period that are not stored yet from a stored lower timeframe that divides
+        the timeframe, instead of downloading them
+        """
+        self.import_legacy_datafile(pair)
+        timeframe, timeframe_ms = self.config.timeframe, self.config.timeframe_ms
+        stored_timeframes = {stored: parse_timeframe(stored) for stored in self.datastore.stored_timeframes(pair)
+                             if stored != timeframe}
+        if len(stored_timeframes) == 0:
+            return
+
+        data_to = self.get_final_timestamp() + timeframe_ms
+        for gap_from, gap_to in self.datastore.missing_ranges(pair, timeframe, self.config.backtesting_from, data_to):
+            # Whole buckets are needed to aggregate the candles at both ends of the gap
+            source_from = gap_from - gap_from % timeframe_ms
+            source_to = gap_to + (-gap_to) % timeframe_ms
+            source = find_source_timeframe(
+                stored_timeframes, timeframe_ms,
+                lambda stored: len(self.datastore.missing_ranges(pair, stored, source_from, source_to)) == 0)
+            if source is None:
+                continue
+
+            source_timeframe, _ = source
+            print_info(f"Resampling {pair} {timeframe} candles from stored {source_timeframe} candles.")
+            candles = self.datastore.read(pair, source_timeframe, source_from, source_to)
+            self.datastore.write(pair, timeframe, resample_ohlcv(candles, pair, timeframe_ms), gap_from, gap_to)
+
     async def read_data_from_datafile(self, pair: str) -> Optional[DataFrame]:
-        filename = self.generate_datafile_name(pair)
-        filepath = os.path.join("data/backtesting-data/", self.config.exchange_name, filename)
+        final_timestamp = self.get_final_timestamp()
+
+        # Download the parts of the backtesting period that are not stored yet
+        await self.check_backtesting_period(pair, final_timestamp)
+
+        data_to = final_timestamp + self.config.timeframe_ms
         try:
-            df = pd.read_feather(filepath, columns=get_ohlcv_indicators() + ["index"])
-            df.set_index("index", inplace=True)
+            df = self.datastore.read(pair, self.config.timeframe, self.config.backtesting_from, data_to)
 
-        except FileNotFoundError:
-            print_error("Backtesting datafile was not found.")
-            return None
         except EnvironmentError:
             print_error(f"Something went wrong while loading datafile {sys.exc_info()[0]}")
             return None
-        except rapidjson.JSONDecodeError:
-            os.remove(filepath)
-            raise
 
-        # Find correct last tick timestamp
-        n_downloaded_candles = (self.config.backtesting_to - self.config.backtesting_from) / self.config.timeframe_ms
-        timesteps_forward = int(n_downloaded_candles) * self.config.timeframe_ms
-        final_timestamp = self.config.backtesting_from + (
-                timesteps_forward - self.config.timeframe_ms)  # last tick is excluded
+        return self.fill_missing_ticks(df, pair, self.config.backtesting_from, data_to)
 
-        # Return correct backtesting period
-        df = await self.check_backtesting_period(pair, df, final_timestamp)
-
-        begin_index = df.index.get_loc(self.config.backtesting_from)
-        end_index = df.index.get_loc(final_timestamp)
-        self.save_dataframe(pair, df)
-
-        df = df[begin_index:end_index + 1]
-        return df
-
-    async def check_backtesting_period(self, pair: str, df: DataFrame, final_timestamp: int) -> DataFrame:
+    async def check_backtesting_period(self, pair: str, final_timestamp: int) -> None:
         """
-        Checks the backtesting period and tries to download extra data if necessary
+        Checks the backtesting period and downloads (and stores) the candles that are not stored yet
         :param pair: Certain coin pair in "AAA/BBB" format
         :type pair: string
-        :param df: Dataframe containing backtest information
-        :type df: DataFrame
-        :param final_timestamp: Timestamp to which the dataframe has gathered info
+        :param final_timestamp: Timestamp of the last tick of the backtesting period
         :type final_timestamp: int
-        :return: Dataframe with possibly additional info
-        :rtype: DataFrame
         """
-
-        # Get backtesting period
-        index_list = df.index.values
-        df_begin = index_list[0]
-        df_end = index_list[-1]
+        timeframe = self.config.timeframe
+        covered_ranges = self.datastore.covered_ranges(pair, timeframe)
+        missing_ranges = self.datastore.missing_ranges(pair, timeframe, self.config.backtesting_from,
+                                                       final_timestamp + self.config.timeframe_ms)
         extra_candles = 0
-        notify = True  # Used for printing message once (improved readability)
 
-        # Check if previous data needs to be downloaded
         try:
-            if self.config.backtesting_from < df_begin:
-                if self.online:
-                    print_info("Incomplete datafile. Downloading extra candle(s)...")
-                    notify = False
-                    prev_df = await self.download_data_for_pair(pair,
-                                                                self.config.backtesting_from,
-                                                                df_begin,
-                                                                save=False)
-                    df = pd.concat([prev_df, df])
-                    extra_candles += len(prev_df.index)
-
-                else:
+            if len(missing_ranges) > 0:
+                if not self.online:
                     raise OfflineMissingDataError()
 
-            # Check if new data needs to be downloaded
-            if final_timestamp > df_end:
-                if self.online:
-                    if notify:
-                        print_info("Incomplete datafile. Downloading extra candle(s)...")
-                    new_df = await self.download_data_for_pair(pair, df_end + self.config.timeframe_ms,
-                                                               self.config.backtesting_to,
-                                                               save=False)
-                    df = pd.concat([df, new_df])
-                    extra_candles += len(new_df.index)
-
-                else:
-                    raise OfflineMissingDataError()
+                print_info("Incomplete datafile. Downloading extra candle(s)...")
+                for data_from, data_to in missing_ranges:
+                    extra_df = await self.download_data_for_pair(pair, data_from, data_to)
+                    extra_candles += len(extra_df.index)
 
             # Check if new candles were downloaded
             if extra_candles > 0:
                 print_info("[%s] %s extra candle(s) downloaded." % (pair, extra_candles))
 
         except OfflineMissingDataError:
+            df_begin = covered_ranges[0][0]
+            df_end = covered_ranges[-1][1] - self.config.timeframe_ms
 
             local_timeframe_begin = datetime.fromtimestamp(self.config.backtesting_from / 1000).date()
             local_timeframe_end = datetime.fromtimestamp(self.config.backtesting_to / 1000).date()
@@ -297,24 +312,10 @@ class DataModule:
                                  f"run a backtest within the timeframe available locally.",
                         stop=True).print_error()
 
-        return df
-
-    def save_dataframe(self, pair: str, df: DataFrame) -> None:
-        filename = self.generate_datafile_name(pair)
-        filepath = os.path.join("data/backtesting-data/", self.config.exchange_name, filename)
-
-        # Convert pandas dataframe to json
-        df.reset_index().to_feather(filepath)
-
     def generate_datafile_name(self, pair: str) -> str:
         coin, base = pair.split('/')
         return "data-{}{}{}.feather".format(coin, base, self.config.timeframe)
 
-    def remove_backtesting_file(self, pair: str) -> None:
-        filename = self.generate_datafile_name(pair)
-        filepath = os.path.join("data/backtesting-data/", self.config.exchange, filename)
-        os.remove(filepath)
-
     def fill_missing_ticks(self, df, pair, data_from, data_to):
         """
         Replace missing ticks by NaN
@@ -356,6 +357,9 @@ def is_same_backtesting_period(history_data) -> bool:
     return all(length == df_lengths[0] for length in df_lengths)
 
 
-def chunks(lst, n):
-    for i in range(0, len(lst), n):
-        yield lst[i:i + n]
+def candles_to_frame(candles: list, pair: str) -> DataFrame:
+    index = [candle[0] for candle in candles]  # timestamps
+    df = DataFrame(candles, index=index, columns=get_ohlcv_indicators()[:-3])
+    df['pair'] = pair
+    df['buy'], df['sell'] = 0, 0  # default values
+    return df
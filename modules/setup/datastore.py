@@ -0,0 +1,244 @@
+# Libraries
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import rapidjson
+from pandas import DataFrame
+
+# Files
+from utils.utils import get_ohlcv_indicators
+
+
+# ======================================================================
+# OhlcvDatastore is responsible for storing candles on disk, partitioned
+# by pair / timeframe / month. Every write appends a new fragment file
+# holding only candles that were not stored yet, a small index keeps
+# track of the time ranges that are covered per pair and timeframe.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+INDEX_FILENAME = "index.json"
+STORED_COLUMNS = ['time', 'open', 'high', 'low', 'close', 'volume']
+# Months with more fragments than this are merged into a single file
+MAX_FRAGMENTS_PER_MONTH = 32
+
+Range = Tuple[int, int]
+
+
+class OhlcvDatastore:
+
+    def __init__(self, directory: str):
+        """
+        :param directory: Directory of the exchange, FI: data/backtesting-data/binance
+        """
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_FILENAME)
+        self.index: Dict[str, Dict[str, List[Range]]] = self.load_index()
+
+    def load_index(self) -> Dict[str, Dict[str, List[Range]]]:
+        if not os.path.exists(self.index_path):
+            return {}
+
+        try:
+            with open(self.index_path, 'r') as index_file:
+                index = rapidjson.load(index_file)
+        except rapidjson.JSONDecodeError:
+            # Candles without a covered range are downloaded again and deduplicated on read
+            return {}
+
+        return {pair: {timeframe: [tuple(covered) for covered in ranges] for timeframe, ranges in timeframes.items()}
+                for pair, timeframes in index.items()}
+
+    def save_index(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        temporary_path = self.index_path + ".tmp"
+        with open(temporary_path, 'w') as index_file:
+            rapidjson.dump(self.index, index_file)
+        os.replace(temporary_path, self.index_path)
+
+    def covered_ranges(self, pair: str, timeframe: str) -> List[Range]:
+        """
+        :return: Sorted, non-overlapping [from, to) ranges of which all available candles are stored
+        """
+        return list(self.index.get(pair, {}).get(timeframe, []))
+
+    def stored_timeframes(self, pair: str) -> List[str]:
+        return list(self.index.get(pair, {}).keys())
+
+    def has_data(self, pair: str, timeframe: str) -> bool:
+        return len(self.covered_ranges(pair, timeframe)) > 0
+
+    def missing_ranges(self, pair: str, timeframe: str, data_from: int, data_to: int) -> List[Range]:
+        """
+        :return: The parts of [data_from, data_to) that are not covered yet
+        """
+        missing = []
+        start = data_from
+        for covered_from, covered_to in self.covered_ranges(pair, timeframe):
+            if covered_to <= start:
+                continue
+            if covered_from >= data_to:
+                break
+            if covered_from > start:
+                missing.append((start, covered_from))
+            start = max(start, covered_to)
+
+        if start < data_to:
+            missing.append((start, data_to))
+        return missing
+
+    def write(self, pair: str, timeframe: str, df: DataFrame, data_from: int, data_to: int) -> None:
+        """
+        Stores the candles of [data_from, data_to) that are not stored yet and marks the range as covered. Empty
+        (missing) candles are not stored, the covered range tells they were not available.
+        """
+        times = df['time'].to_numpy(dtype=np.int64, na_value=0) if 'time' in df.columns \
+            else df.index.to_numpy(dtype=np.int64)
+        mask = df['close'].notnull().to_numpy() & (times >= data_from) & (times < data_to)
+        for covered_from, covered_to in self.covered_ranges(pair, timeframe):
+            mask &= ~((times >= covered_from) & (times < covered_to))
+
+        candles = df.loc[mask, STORED_COLUMNS[1:]].copy()
+        candles.insert(0, 'time', times[mask])
+        candles = candles.drop_duplicates('time').sort_values('time').reset_index(drop=True)
+
+        months = pd.to_datetime(candles['time'], unit='ms', utc=True).dt.strftime('%Y-%m')
+        for month, month_candles in candles.groupby(months.to_numpy()):
+            self.append_fragment(pair, timeframe, month, month_candles.reset_index(drop=True))
+
+        self.index.setdefault(pair, {})[timeframe] = merge_ranges(
+            self.covered_ranges(pair, timeframe) + [(int(data_from), int(data_to))])
+        self.save_index()
+
+    def remove(self, pair: str, timeframe: str) -> None:
+        """
+        Removes all stored candles of the pair and timeframe, FI: after a fragment turned out to be corrupt
+        """
+        timeframe_directory = os.path.join(self.directory, pair.replace('/', ''), timeframe)
+        if os.path.exists(timeframe_directory):
+            shutil.rmtree(timeframe_directory)
+
+        self.index.get(pair, {}).pop(timeframe, None)
+        self.save_index()
+
+    def read(self, pair: str, timeframe: str, data_from: int, data_to: int,
+             columns: Optional[List[str]] = None) -> DataFrame:
+        """
+        Memory-maps the fragments overlapping [data_from, data_to) and only converts the rows and columns in that
+        window to pandas
+        :param columns: Columns to read besides time, FI: ['close'], all OHLCV columns by default
+        :return: Stored candles of [data_from, data_to) indexed by timestamp, without the missing candles
+        """
+        stored_columns = ['time'] + [column for column in (columns or STORED_COLUMNS) if column != 'time']
+        tables = [table for month in months_between(data_from, data_to)
+                  for fragment_path in self.fragment_paths(pair, timeframe, month)
+                  for table in [read_fragment(fragment_path, stored_columns, data_from, data_to)]
+                  if table is not None]
+
+        if len(tables) == 0:
+            df = DataFrame({column: np.array([], dtype=np.int64 if column == 'time' else np.float64)
+                            for column in stored_columns})
+        else:
+            df = pa.concat_tables(tables).to_pandas()
+
+        if len(tables) > 1:
+            df = df.drop_duplicates('time').sort_values('time')
+        df.index = df['time'].to_numpy(dtype=np.int64)
+
+        if columns is not None:
+            return df
+        df['pair'] = pair
+        df['buy'], df['sell'] = 0, 0
+        return df[get_ohlcv_indicators()]
+
+    def append_fragment(self, pair: str, timeframe: str, month: str, candles: DataFrame) -> None:
+        month_directory = self.month_directory(pair, timeframe, month)
+        os.makedirs(month_directory, exist_ok=True)
+        filename = f"{candles['time'].iloc[0]}-{candles['time'].iloc[-1]}.feather"
+        # Uncompressed, so reads can memory-map the fragment without copying it
+        candles.to_feather(os.path.join(month_directory, filename), compression='uncompressed')
+
+        fragment_paths = self.fragment_paths(pair, timeframe, month)
+        if len(fragment_paths) > MAX_FRAGMENTS_PER_MONTH:
+            self.compact_month(fragment_paths)
+
+    @staticmethod
+    def compact_month(fragment_paths: List[str]) -> None:
+        candles = pd.concat([pd.read_feather(fragment_path) for fragment_path in fragment_paths], ignore_index=True)
+        candles = candles.drop_duplicates('time').sort_values('time').reset_index(drop=True)
+
+        month_directory = os.path.dirname(fragment_paths[0])
+        compacted_path = os.path.join(month_directory, f"{candles['time'].iloc[0]}-{candles['time'].iloc[-1]}.feather")
+        temporary_path = compacted_path + ".tmp"
+        candles.to_feather(temporary_path, compression='uncompressed')
+        for fragment_path in fragment_paths:
+            os.remove(fragment_path)
+        os.replace(temporary_path, compacted_path)
+
+    def fragment_paths(self, pair: str, timeframe: str, month: str) -> List[str]:
+        month_directory = self.month_directory(pair, timeframe, month)
+        if not os.path.exists(month_directory):
+            return []
+        return sorted(os.path.join(month_directory, filename) for filename in os.listdir(month_directory)
+                      if filename.endswith(".feather"))
+
+    def month_directory(self, pair: str, timeframe: str, month: str) -> str:
+        return os.path.join(self.directory, pair.replace('/', ''), timeframe, month)
+
+
+def read_fragment(fragment_path: str, columns: List[str], data_from: int, data_to: int) -> Optional[pa.Table]:
+    """
+    :return: The rows of the (time-sorted) fragment within [data_from, data_to), None if there are none. The table
+    shares memory with the memory-mapped file as long as the fragment is uncompressed.
+    """
+    first, last = fragment_range(fragment_path)
+    if last < data_from or first >= data_to:
+        return None
+
+    table = pa.ipc.open_file(pa.memory_map(fragment_path)).read_all().select(columns)
+    times = table.column('time').to_numpy()
+    begin, end = np.searchsorted(times, [data_from, data_to])
+    if begin == end:
+        return None
+    return table.slice(begin, end - begin)
+
+
+def fragment_range(fragment_path: str) -> Range:
+    """
+    :return: Times of the first and last candle of the fragment, encoded in its filename
+    """
+    first, last = os.path.basename(fragment_path)[:-len(".feather")].split('-')
+    return int(first), int(last)
+
+
+def merge_ranges(ranges: List[Range]) -> List[Range]:
+    merged = []
+    for range_from, range_to in sorted(ranges):
+        if merged and range_from <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], range_to))
+        else:
+            merged.append((range_from, range_to))
+    return merged
+
+
+def months_between(data_from: int, data_to: int) -> List[str]:
+    """
+    :return: 'YYYY-MM' keys of the (UTC) months overlapping [data_from, data_to)
+    """
+    if data_to <= data_from:
+        return []
+
+    first = datetime.fromtimestamp(data_from / 1000, tz=timezone.utc)
+    last = datetime.fromtimestamp((data_to - 1) / 1000, tz=timezone.utc)
+    months = []
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
@@ -0,0 +1,142 @@
+# Libraries
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import ccxt.async_support as ccxt
+
+# Files
+from cli.print_utils import print_warning
+
+
+# ======================================================================
+# OhlcvDownloader is responsible for fetching candles in slices, with a
+# bounded amount of concurrent requests, a token bucket per exchange and
+# retries with exponential backoff. Every completed slice is handed to
+# a callback, so it can be checkpointed before the download finishes.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+FETCH_OHLCV_LIMIT = 1000
+MAX_CONCURRENT_REQUESTS = 8
+MAX_RETRIES = 5
+BACKOFF_SECONDS = 1.0
+
+Slice = Tuple[int, int]
+SliceCallback = Callable[[int, int, List[list]], None]
+
+
+class TokenBucket:
+    """
+    Allows rate requests per second on average, with bursts of up to capacity requests. A rate of None means no limit.
+    """
+
+    def __init__(self, rate: Optional[float], capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Takes a token, which may bring the bucket below zero to queue the request
+        :return: Seconds to wait before the request may be done
+        """
+        if self.rate is None:
+            return 0
+
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_token_buckets: Dict[str, TokenBucket] = {}
+
+
+def get_token_bucket(exchange) -> TokenBucket:
+    """
+    :return: The token bucket shared by all downloads from the exchange, following its rateLimit (ms per request)
+    """
+    exchange_id = getattr(exchange, 'id', None) or type(exchange).__name__
+    if exchange_id not in _token_buckets:
+        rate_limit = getattr(exchange, 'rateLimit', 0)
+        rate = 1000 / rate_limit if rate_limit else None
+        _token_buckets[exchange_id] = TokenBucket(rate, capacity=MAX_CONCURRENT_REQUESTS)
+    return _token_buckets[exchange_id]
+
+
+def plan_slices(data_from: int, data_to: int, timeframe_ms: int, limit: int = FETCH_OHLCV_LIMIT) -> List[Slice]:
+    """
+    :return: (since, limit) per request needed to fetch [data_from, data_to)
+    """
+    slices = []
+    start_date = data_from
+    while start_date < data_to:
+        remaining_ticks = (data_to - start_date) / timeframe_ms
+        asked_ticks = min(remaining_ticks, limit)
+        slices.append((int(start_date), int(asked_ticks)))
+        start_date += round(asked_ticks * timeframe_ms)
+    return slices
+
+
+class OhlcvDownloader:
+
+    def __init__(self, exchange, max_concurrency: int = MAX_CONCURRENT_REQUESTS, max_retries: int = MAX_RETRIES,
+                 backoff: float = BACKOFF_SECONDS, token_bucket: Optional[TokenBucket] = None,
+                 fetch_limit: int = FETCH_OHLCV_LIMIT):
+        self.exchange = exchange
+        self.fetch_limit = fetch_limit
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.token_bucket = token_bucket if token_bucket is not None else get_token_bucket(exchange)
+
+    async def download(self, pair: str, timeframe: str, slices: List[Slice],
+                       on_slice: Optional[SliceCallback] = None) -> List[list]:
+        """
+        :param slices: (since, limit) per request, see plan_slices
+        :param on_slice: Called with since, limit and the candles of every slice as soon as it is downloaded
+        :return: Candles of all slices, in the order of the slices
+        :raises ccxt.BaseError: When a slice still fails after the retries, the other requests are cancelled
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def download_slice(since: int, limit: int) -> List[list]:
+            async with semaphore:
+                candles = await self.fetch_with_retries(pair, timeframe, since, limit)
+            if on_slice is not None:
+                on_slice(since, limit, candles)
+            return candles
+
+        tasks = [asyncio.ensure_future(download_slice(since, limit)) for since, limit in slices]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        return [candle for candles in results for candle in candles]
+
+    async def fetch_with_retries(self, pair: str, timeframe: str, since: int, limit: int) -> List[list]:
+        for attempt in range(self.max_retries + 1):
+            await self.token_bucket.acquire()
+            try:
+                return await self.exchange.fetch_ohlcv(symbol=pair, timeframe=timeframe, since=since, limit=limit)
+
+            # Timeouts, rate limits and unavailable exchanges are worth another try, other errors are not
+            except ccxt.NetworkError as error:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+                print_warning(f"Fetching {pair} candles failed ({type(error).__name__}), retrying in {delay:g}s")
+                await asyncio.sleep(delay)
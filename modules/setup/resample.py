@@ -0,0 +1,68 @@
+# Libraries
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+# Files
+from utils.utils import get_ohlcv_indicators
+
+
+# ======================================================================
+# Resampling derives candles of a higher timeframe (FI: 4h) from stored
+# candles of a lower timeframe (FI: 1m) that divides it, so they do not
+# have to be downloaded.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+
+def resample_ohlcv(df: DataFrame, pair: str, timeframe_ms: int) -> DataFrame:
+    """
+    Aggregates candles into buckets of timeframe_ms, aligned to the epoch the way exchanges align them. A bucket
+    takes the open of its first and the close of its last available candle, the highest high, lowest low and summed
+    volume. Missing lower candles are left out; buckets without any candle are left out, so they end up as missing
+    ticks of the higher timeframe.
+    :param df: Time-sorted candles without missing (NaN) candles
+    :return: Candles indexed by their bucket timestamp, in the format of DataModule.download_data_for_pair
+    """
+    times = df['time'].to_numpy(dtype=np.int64)
+    buckets = times - times % timeframe_ms
+    starts = np.flatnonzero(np.diff(buckets, prepend=np.int64(-1)) != 0) if len(buckets) > 0 \
+        else np.array([], dtype=np.int64)
+    ends = np.append(starts[1:], len(buckets)) - 1
+
+    def column(name: str) -> np.ndarray:
+        return df[name].to_numpy(dtype=np.float64)
+
+    if len(starts) == 0:
+        aggregated = {'open': [], 'high': [], 'low': [], 'close': [], 'volume': []}
+    else:
+        aggregated = {
+            'open': column('open')[starts],
+            'high': np.maximum.reduceat(column('high'), starts),
+            'low': np.minimum.reduceat(column('low'), starts),
+            'close': column('close')[ends],
+            'volume': np.add.reduceat(column('volume'), starts),
+        }
+
+    index = buckets[starts]
+    resampled = DataFrame({'time': index, **aggregated}, index=index)
+    resampled['pair'] = pair
+    resampled['buy'], resampled['sell'] = 0, 0
+    return resampled[get_ohlcv_indicators()]
+
+
+def find_source_timeframe(stored_timeframes: Dict[str, int], timeframe_ms: int,
+                          covers: Callable[[str], bool]) -> Optional[Tuple[str, int]]:
+    """
+    :param stored_timeframes: Stored timeframes of a pair with their length in ms
+    :param timeframe_ms: Length of the wanted timeframe
+    :param covers: Tells whether a stored timeframe covers the range that has to be resampled
+    :return: The largest stored timeframe that divides the wanted timeframe and covers the range, if any
+    """
+    candidates = [(timeframe, length) for timeframe, length in stored_timeframes.items()
+                  if length < timeframe_ms and timeframe_ms % length == 0 and covers(timeframe)]
+    if len(candidates) == 0:
+        return None
+    return max(candidates, key=lambda candidate: candidate[1])
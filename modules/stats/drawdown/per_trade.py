@@ -1,19 +1,17 @@
-import pandas as pd
-
+from modules.public.pairs_data import PairFrame
 from modules.stats.drawdown.drawdown import get_max_drawdown_ratio
 from modules.stats.metrics.profit_ratio import with_copied_initial_row
 from modules.stats.trade import Trade
 
 
-def get_max_seen_drawdown_per_trade(signal_dict, trade: Trade, fee_percentage: float):
+def get_max_seen_drawdown_per_trade(pair_frame: PairFrame, trade: Trade, fee_percentage: float):
 
-    values = signal_dict.values()
-    df = pd.DataFrame(values).set_index("time")
+    df = pair_frame.frame[["close"]]
 
     # Copy first row to zero index to save asset value before applying fees
     df = with_copied_initial_row(df)
 
-    opened_at_timestamp = int(trade.opened_at.timestamp() * 1000)
+    opened_at_timestamp = trade.opened_at_ms
 
     apply_profit_ratio(df, opened_at_timestamp)
     add_trade_fee(df, fee_percentage, opened_at_timestamp)
@@ -0,0 +1,132 @@
+import math
+from datetime import timedelta
+from typing import Dict, Union
+
+import numpy as np
+
+
+class DrawdownTracker:
+    """
+    Keeps the drawdown statistics of a series of values that is fed one timestamp at a time, in O(1) per update. A
+    value registered again for the last timestamp replaces the previous one, like a dict keyed by timestamp would. NaN
+    values are skipped.
+    """
+
+    def __init__(self, time: int, value: float):
+        """
+        :param time: Timestamp of the first value, in ms
+        """
+        self.time = time
+        self.value = value
+        self.last_committed = time
+
+        # Highest committed value, the first and the last time it was reached
+        self.peak = math.nan
+        self.peak_from = time
+        self.peak_last_seen = time
+
+        # Deepest value / peak ratio and when it occurred
+        self.max_drawdown_ratio = 1.0
+        self.drawdown_from = time
+        self.drawdown_at = time
+        self.drawdown_to = time
+        self.recovering = False
+
+        self.longest_drawdown_ms = 0
+
+    def update(self, time: int, value: float) -> None:
+        """
+        :param time: Timestamp in ms, at least the timestamp of the previous update
+        """
+        if time != self.time:
+            self.commit()
+            self.time = time
+        self.value = value
+
+    def update_many(self, times: np.ndarray, values: np.ndarray) -> None:
+        for time, value in zip(times.tolist(), values.tolist()):
+            self.update(time, value)
+
+    def commit(self) -> None:
+        """
+        Folds the value of the last timestamp into the statistics
+        """
+        time, value = self.time, self.value
+        if math.isnan(value):
+            return
+        underwater_since = self.peak_last_seen if self.last_committed != self.peak_last_seen else None
+        self.last_committed = time
+
+        if not value < self.peak:
+            if value > self.peak or math.isnan(self.peak):
+                self.peak = value
+                self.peak_from = time
+            if self.recovering:
+                self.drawdown_to = time
+                self.recovering = False
+            if underwater_since is not None:
+                self.longest_drawdown_ms = max(self.longest_drawdown_ms, time - underwater_since)
+            self.peak_last_seen = time
+            return
+
+        drawdown_ratio = value / self.peak
+        if drawdown_ratio < self.max_drawdown_ratio:
+            self.max_drawdown_ratio = drawdown_ratio
+            self.drawdown_from = self.peak_from
+            self.drawdown_at = time
+            self.drawdown_to = 0
+            self.recovering = True
+
+    def finish(self) -> 'DrawdownTracker':
+        """
+        Commits the last value, call once no more values follow
+        """
+        self.commit()
+        self.value = math.nan
+        return self
+
+    @property
+    def max_drawdown(self) -> float:
+        """
+        :return: Deepest drawdown as a negative ratio, 0 without drawdown
+        """
+        return self.max_drawdown_ratio - 1
+
+    @property
+    def running_drawdown(self) -> float:
+        """
+        :return: Deepest drawdown so far including the value of the last timestamp, which has not been committed yet
+        """
+        if self.value < self.peak:
+            return min(self.max_drawdown_ratio, self.value / self.peak) - 1
+        return self.max_drawdown
+
+    @property
+    def current_drawdown_ms(self) -> int:
+        """
+        :return: Time since the last peak when the last committed value is below it, 0 otherwise
+        """
+        return self.last_committed - self.peak_last_seen
+
+    def max_drawdown_info(self) -> Dict[str, Union[float, int]]:
+        """
+        :return: Deepest drawdown with the time of the peak before it (from), of its bottom (at) and of the recovery
+        to the peak (to, 0 when it has not recovered)
+        """
+        return {
+            "drawdown": self.max_drawdown,
+            "from": int(self.drawdown_from),
+            "at": int(self.drawdown_at),
+            "to": int(self.drawdown_to)
+        }
+
+    def longest_drawdown_info(self) -> Dict[str, Union[timedelta, bool]]:
+        """
+        :return: Longest time from a peak until the value was back at it, and whether that drawdown is still ongoing
+        """
+        current_drawdown_ms = self.current_drawdown_ms
+        is_ongoing = current_drawdown_ms > 0 and current_drawdown_ms >= self.longest_drawdown_ms
+        return {
+            'longest_drawdown': timedelta(milliseconds=int(max(self.longest_drawdown_ms, current_drawdown_ms))),
+            'is_ongoing': is_ongoing
+        }
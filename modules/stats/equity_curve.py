@@ -0,0 +1,100 @@
+# Libraries
+import numpy as np
+from pandas import Series
+
+# Files
+
+
+# ======================================================================
+# EquityCurve registers the budget and capital of the TradingModule per
+# tick in preallocated float64 arrays that share one int64 time axis, so
+# stats and plots can consume them without rebuilding them from dicts.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+EQUITY_COLUMNS = ('budget', 'capital', 'total_capital_open_trades', 'lowest_total_capital_open_trades',
+                  'highest_total_capital_open_trades')
+# Preallocation is capped, longer backtests grow the arrays instead
+MAX_PREALLOCATED_TICKS = 2 ** 20
+
+
+class EquityCurve:
+    """
+    Tick 0 holds the starting capital on the timestep before the backtest starts. Every other tick is registered the
+    first time its timestamp is seen, ticks have to arrive in chronological order.
+    """
+
+    def __init__(self, capacity: int, time_before_start: int, starting_capital: float):
+        """
+        :param capacity: Expected amount of ticks including tick 0, the arrays grow when it is exceeded
+        """
+        capacity = min(max(int(capacity), 2), MAX_PREALLOCATED_TICKS)
+        self.time = np.zeros(capacity, dtype=np.int64)
+        self.budget = np.zeros(capacity, dtype=np.float64)
+        self.capital = np.zeros(capacity, dtype=np.float64)
+        self.total_capital_open_trades = np.zeros(capacity, dtype=np.float64)
+        self.lowest_total_capital_open_trades = np.zeros(capacity, dtype=np.float64)
+        self.highest_total_capital_open_trades = np.zeros(capacity, dtype=np.float64)
+
+        self.time[0] = time_before_start
+        self.budget[0] = starting_capital
+        self.capital[0] = starting_capital
+        self.size = 1
+        self.last_time = time_before_start
+
+    def tick_index(self, time: int) -> int:
+        """
+        May grow the arrays, so look them up after calling this
+        :return: Index of the tick with the given timestamp, registering it as next tick when it is new
+        """
+        if time == self.last_time:
+            return self.size - 1
+
+        if self.size == len(self.time):
+            self.grow()
+        self.time[self.size] = time
+        self.last_time = time
+        self.size += 1
+        return self.size - 1
+
+    def extend(self, times: np.ndarray) -> slice:
+        """
+        Registers a block of new, consecutive ticks at once
+        :return: Slice of the registered ticks in the arrays
+        """
+        while self.size + len(times) > len(self.time):
+            self.grow()
+        start = self.size
+        self.time[start:start + len(times)] = times
+        self.size += len(times)
+        if len(times) > 0:
+            self.last_time = times[-1]
+        return slice(start, self.size)
+
+    def grow(self) -> None:
+        self.time = np.concatenate([self.time, np.zeros(len(self.time), dtype=np.int64)])
+        for column in EQUITY_COLUMNS:
+            values = getattr(self, column)
+            setattr(self, column, np.concatenate([values, np.zeros(len(values), dtype=np.float64)]))
+
+    @property
+    def times(self) -> np.ndarray:
+        """
+        :return: Timestamps of the registered ticks
+        """
+        return self.time[:self.size]
+
+    def values(self, column: str) -> np.ndarray:
+        """
+        :param column: One of EQUITY_COLUMNS
+        :return: View on the values of the registered ticks
+        """
+        return getattr(self, column)[:self.size]
+
+    def series(self, column: str) -> Series:
+        """
+        :param column: One of EQUITY_COLUMNS
+        :return: Series over the values of the registered ticks, indexed by timestamp
+        """
+        return Series(self.values(column), index=self.times, name=column, copy=False)
@@ -0,0 +1,107 @@
+# Libraries
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Files
+from modules.stats.roi_schedule import RoiSchedule
+from modules.stats.trade import Trade
+
+
+# ======================================================================
+# ExitSolver finds the first candle on which an open trade is closed by
+# stoploss, ROI or sell signal with vectorised scans over the signal
+# arrays, instead of checking the trade candle by candle.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+# Candles scanned in the first window after the entry, every next window is twice as large
+FIRST_WINDOW = 64
+
+
+def running_high(values: np.ndarray, initial: float) -> np.ndarray:
+    """
+    Running maximum with the semantics of `high = max(value, high)` in Trade.check_for_sl: a NaN value makes the
+    high NaN, the value after it starts a new maximum.
+    :param initial: High before the first value
+    :return: High after every value
+    """
+    highs = np.empty_like(values)
+    previous = initial
+    start = 0
+    for end in np.append(np.flatnonzero(np.isnan(values)), len(values)):
+        if end > start:
+            segment = np.maximum.accumulate(values[start:end])
+            highs[start:end] = segment if np.isnan(previous) else np.maximum(segment, previous)
+        if end < len(values):
+            highs[end] = np.nan
+        previous = np.nan
+        start = end + 1
+    return highs
+
+
+class ExitSolver:
+
+    def __init__(self, time: np.ndarray, columns: dict, roi_schedule: RoiSchedule):
+        """
+        :param time: Time axis of the signal arrays, in ms
+        :param columns: (ticks x pairs) signal arrays, see SignalArrays
+        """
+        self.time = time
+        self.columns = columns
+        self.roi_schedule = roi_schedule
+
+    def find_exit(self, trade: Trade, pair_index: int, entry_tick: int) -> Tuple[Optional[int], np.ndarray]:
+        """
+        :param entry_tick: Tick on which the trade was opened
+        :return: The tick on which the trade is closed (None when it stays open) and, for trailing stoplosses, the
+        trailing high capital after every tick from the entry until that tick
+        """
+        highs: List[np.ndarray] = [np.array([trade.sl_trailing_high_capital], dtype=np.float64)] \
+            if trade.sl_type == 'trailing' else []
+        tick = entry_tick + 1
+        window_size = FIRST_WINDOW
+        while tick < len(self.time):
+            end = min(tick + window_size, len(self.time))
+            exit_offset, window_highs = self.scan_window(trade, pair_index, tick, end, highs)
+            if window_highs is not None:
+                highs.append(window_highs)
+            if exit_offset is not None:
+                return tick + exit_offset, np.concatenate(highs) if highs else np.array([])
+            tick = end
+            window_size *= 2
+        return None, np.concatenate(highs) if highs else np.array([])
+
+    def scan_window(self, trade: Trade, pair_index: int, start: int, end: int,
+                    highs: List[np.ndarray]) -> Tuple[Optional[int], Optional[np.ndarray]]:
+        """
+        Evaluates the exit conditions of TradingModule.open_trade_tick for the candles [start, end), in the same
+        order of floating point operations.
+        :return: Offset of the first exit within the window if any, and the trailing high capital per candle
+        """
+        def column(name: str) -> np.ndarray:
+            return self.columns[name][start:end, pair_index]
+
+        lowest_capital = trade.currency_amount * column('low')
+        exits = np.zeros(end - start, dtype=bool)
+        window_highs = None
+
+        if trade.sl_type == 'static':
+            exits |= lowest_capital <= trade.sl_static_price
+        elif trade.sl_type == 'trailing':
+            previous_high = highs[-1][-1]
+            window_highs = running_high(trade.currency_amount * column('high'), previous_high)
+            previous_highs = np.concatenate([[previous_high], window_highs[:-1]])
+            exits |= lowest_capital <= previous_highs * trade.sl_trailing_ratio
+        elif trade.sl_type == 'dynamic':
+            exits |= lowest_capital <= column('stoploss') * trade.starting_amount
+
+        profit_percentage = ((column('high') / trade.open) - 1.) * 100
+        exits |= profit_percentage > self.roi_schedule.get_roi_many(self.time[start:end] - trade.opened_at_ms)
+        exits |= column('sell') == 1
+
+        hits = np.flatnonzero(exits)
+        if len(hits) == 0:
+            return None, window_highs
+        return int(hits[0]), window_highs[:hits[0] + 1] if window_highs is not None else None
@@ -0,0 +1,66 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List
+
+import numpy as np
+from pandas import DataFrame, Series
+
+from modules.public.pairs_data import PairFrame
+from modules.stats.drawdown.drawdown import get_max_drawdown_ratio, get_max_drawdown_ratio_without_buy_rows
+from modules.stats.metrics.profit_ratio import get_realised_profit_ratio, get_seen_cum_profit_ratio
+from modules.stats.metrics.trades import calculate_trade_durations
+from modules.stats.metrics.winning_weeks import get_timeframe_performance
+from modules.stats.trade import Trade
+
+TIMEFRAMES = {"W": "weeks", "M": "months"}
+
+
+def calculate_coin_statistics(frame: DataFrame, closed_trades: List[Trade], market_ratio: Series,
+                              fee_percentage: float) -> dict:
+    """
+    Computes the statistics of a single pair that need its candles. The seen equity curve is built once and shared by
+    the max seen drawdown and the weekly / monthly timeframes.
+    :param frame: Signals of the pair
+    :param closed_trades: Closed trades of the pair
+    :param market_ratio: Market ratio per candle of the pair, see get_market_ratios
+    :return: Max seen / realised drawdown, trade durations and win / draw / loss counts per timeframe
+    """
+    pair_frame = PairFrame(frame)
+    seen_cum_profit_ratio_df = get_seen_cum_profit_ratio(pair_frame, closed_trades, fee_percentage)
+    realised_cum_profit_ratio_df = get_realised_profit_ratio(pair_frame, closed_trades, fee_percentage)
+
+    statistics = {
+        "max_seen_ratio": get_max_drawdown_ratio(seen_cum_profit_ratio_df) - 1,
+        "max_realised_ratio": get_max_drawdown_ratio_without_buy_rows(realised_cum_profit_ratio_df)
+    }
+    statistics["avg_trade_duration"], statistics["longest_trade_duration"], statistics["shortest_trade_duration"] = \
+        calculate_trade_durations(closed_trades)
+
+    time = market_ratio.index.to_numpy()
+    capital = seen_cum_profit_ratio_df['value'].to_numpy(dtype=np.float64) * 1000
+    for timeframe, name in TIMEFRAMES.items():
+        profitable, outperforming = get_timeframe_performance(time, capital, market_ratio.to_numpy(dtype=np.float64),
+                                                              timeframe)
+        statistics[f"prof_{name}_win"], statistics[f"prof_{name}_draw"], statistics[f"prof_{name}_loss"] = profitable
+        statistics[f"perf_{name}_win"], statistics[f"perf_{name}_draw"], statistics[f"perf_{name}_loss"] = \
+            outperforming
+    return statistics
+
+
+def calculate_statistics_per_pair(frames: Dict[str, DataFrame], trades_per_pair: Dict[str, List[Trade]],
+                                  market_ratio_df: DataFrame, fee_percentage: float,
+                                  workers: int = 1) -> Dict[str, dict]:
+    """
+    :param trades_per_pair: Closed trades per pair, only these pairs are computed
+    :param workers: Maximum amount of worker processes, 1 computes the pairs serially
+    :return: Statistics per pair, see calculate_coin_statistics
+    """
+    pairs = list(trades_per_pair.keys())
+    arguments = ([frames[pair] for pair in pairs], [trades_per_pair[pair] for pair in pairs],
+                 [market_ratio_df[pair] for pair in pairs], repeat(fee_percentage))
+
+    if workers <= 1 or len(pairs) <= 1:
+        return dict(zip(pairs, map(calculate_coin_statistics, *arguments)))
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(pairs))) as executor:
+        return dict(zip(pairs, executor.map(calculate_coin_statistics, *arguments)))
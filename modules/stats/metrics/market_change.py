@@ -1,19 +1,19 @@
-import pandas as pd
 from pandas import DataFrame
 
+from modules.public.pairs_data import PairsData
 from modules.stats.drawdown.drawdown import get_max_drawdown_ratio, get_max_drawdown_ratio_series
-from utils.utils import get_ohlcv_indicators
 
 
-def get_market_change(df, pairs: list, data_dict: dict) -> dict:
+def get_market_change(df, pairs: list, data_dict: PairsData) -> dict:
     market_change = {}
     total_change = 0
     for pair in pairs:
         first_valid_tick = df[pair]['close'].first_valid_index()
         last_valid_tick = df[pair]['close'].last_valid_index()
 
-        begin_value = data_dict[pair][first_valid_tick]['close']
-        end_value = data_dict[pair][last_valid_tick]['close']
+        closes = data_dict[pair].frame['close']
+        begin_value = closes[first_valid_tick]
+        end_value = closes[last_valid_tick]
 
         coin_change = end_value / begin_value
         market_change[pair] = coin_change - 1
@@ -22,12 +22,11 @@ def get_market_change(df, pairs: list, data_dict: dict) -> dict:
     return market_change
 
 
-def get_market_drawdown(pairs: list, data_dict: dict) -> dict:
+def get_market_drawdown(pairs: list, data_dict: PairsData) -> dict:
     market_drawdown = {}
     pairs_profit_ratios_sum = [0] * len(data_dict[pairs[0]])
     for pair in pairs:
-        df = pd.DataFrame.from_dict(data_dict[pair], orient='index', columns=get_ohlcv_indicators())
-        closes = df["close"].dropna()
+        closes = data_dict[pair].frame["close"].dropna()
         market_drawdown[pair] = get_max_drawdown_ratio_series(closes) - 1
         profit_ratios = closes / closes.iloc[0]
         pairs_profit_ratios_sum = map(lambda x, y: x + y, pairs_profit_ratios_sum, profit_ratios)
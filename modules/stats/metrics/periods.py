@@ -0,0 +1,86 @@
+import time as local_time
+
+import numpy as np
+
+DAY_MS = 86400000
+# 1970-01-01 was a Thursday, weeks run from Monday up to and including Sunday
+DAYS_BEFORE_FIRST_MONDAY = 3
+
+
+def get_local_offsets_ms(time: np.ndarray) -> np.ndarray:
+    """
+    UTC offsets of the local timezone, as applied by datetime.fromtimestamp. The offset is looked up once per day in
+    the range, and the exact moment of every change is found by bisection.
+    :param time: Epoch ms timestamps
+    :return: Offset in ms for every timestamp
+    """
+    if len(time) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    grid = np.arange(int(time.min()), int(time.max()) + DAY_MS, DAY_MS, dtype=np.int64)
+    grid_offsets = [get_local_offset_ms(int(moment)) for moment in grid]
+
+    changes = [0]
+    offsets = [grid_offsets[0]]
+    for day in range(1, len(grid)):
+        if grid_offsets[day] != offsets[-1]:
+            changes.append(find_offset_change(int(grid[day - 1]), int(grid[day])))
+            offsets.append(grid_offsets[day])
+
+    return np.array(offsets, dtype=np.int64)[np.searchsorted(changes[1:], time, side='right')]
+
+
+def get_local_offset_ms(moment: int) -> int:
+    return local_time.localtime(moment // 1000).tm_gmtoff * 1000
+
+
+def find_offset_change(before: int, after: int) -> int:
+    """
+    :return: First ms of (before, after] that has the offset of after
+    """
+    offset_before = get_local_offset_ms(before)
+    while after - before > 1000:
+        middle = (before + after) // 2
+        if get_local_offset_ms(middle) == offset_before:
+            before = middle
+        else:
+            after = middle
+    return after - after % 1000
+
+
+def get_period_ids(time: np.ndarray, timeframe: str) -> np.ndarray:
+    """
+    Maps timestamps to consecutive week or month numbers of their local calendar date, the periods of
+    resample(timeframe) on local datetimes
+    :param time: Sorted epoch ms timestamps
+    :param timeframe: "W" for weeks ending on Sunday or "M" for calendar months
+    """
+    time = np.asarray(time, dtype=np.int64)
+    days = (time + get_local_offsets_ms(time)) // DAY_MS
+    if timeframe == "W":
+        return (days + DAYS_BEFORE_FIRST_MONDAY) // 7
+    if timeframe == "M":
+        return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+    raise ValueError(f"Unsupported timeframe {timeframe}")
+
+
+def get_period_change(values: np.ndarray, period_ids: np.ndarray) -> np.ndarray:
+    """
+    Ratio of the last over the first value within every period from the first to the last period id. NaN values are
+    skipped, periods without values have a NaN change.
+    :param period_ids: Period of every value, see get_period_ids
+    """
+    if len(period_ids) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    first = np.full(period_ids[-1] - period_ids[0] + 1, np.nan)
+    last = first.copy()
+
+    valid = ~np.isnan(values)
+    values, period_ids = values[valid], period_ids[valid] - period_ids[0]
+    if len(values) > 0:
+        starts = np.flatnonzero(np.diff(period_ids, prepend=period_ids[0] - 1))
+        ends = np.append(starts[1:], len(values)) - 1
+        first[period_ids[starts]] = values[starts]
+        last[period_ids[ends]] = values[ends]
+    return last / first
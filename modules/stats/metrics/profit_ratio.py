@@ -1,44 +1,45 @@
-from datetime import datetime
-
 import numpy as np
 import pandas as pd
 
+from modules.public.pairs_data import PairFrame
 from modules.stats.trade import Trade, SellReason
 
 
-def get_seen_cum_profit_ratio(signal_dict, closed_trades: [Trade], fee_percentage: float):
-    df = pd.DataFrame(signal_dict.values()).set_index("time")
+def get_seen_cum_profit_ratio(pair_frame: PairFrame, closed_trades: [Trade], fee_percentage: float):
+    df = pair_frame.frame[["close", "buy"]]
     return get_profit_ratio(df, fee_percentage, closed_trades)
 
 
-def get_realised_profit_ratio(signal_dict, closed_trades: [Trade], fee_percentage: float):
-    df = pd.DataFrame(signal_dict.values()).set_index("time")
+def get_realised_profit_ratio(pair_frame: PairFrame, closed_trades: [Trade], fee_percentage: float):
+    df = pair_frame.frame[["close", "buy"]]
     trade_timestamps = get_trade_timestamps(closed_trades)
     df = pd.concat([df, trade_timestamps], axis=1, join="inner")
     return get_profit_ratio(df, fee_percentage, closed_trades)
 
 
-def correct_for_stoploss_roi(df, closed_trades):
-    df["corrected_close"] = df["close"]
-    for trade in closed_trades:
-        if trade.sell_reason == SellReason.ROI or trade.sell_reason == SellReason.STOPLOSS:
-            df.loc[datetime.timestamp(trade.closed_at) * 1000, "corrected_close"] = trade.close
+def correct_for_stoploss_roi(df, closed_trades, closed_positions):
+    # ROI and stoploss close trades within the candle, at another price than its close
+    corrected = [index for index, trade in enumerate(closed_trades)
+                 if trade.sell_reason == SellReason.ROI or trade.sell_reason == SellReason.STOPLOSS]
+    corrected_close = df["close"].to_numpy(dtype=np.float64, copy=True)
+    corrected_close[closed_positions[corrected]] = [closed_trades[index].close for index in corrected]
+    df["corrected_close"] = corrected_close
     return df
 
 
 def get_profit_ratio(df, fee_percentage, closed_trades):
-    trades_opened_closed_timestamps = map_trades_to_opened_closed_timestamps(closed_trades)
     # Copy first row to zero index to save asset value before applying fees
     df = with_copied_initial_row(df)
-    df = correct_for_stoploss_roi(df, closed_trades)
-    df = apply_profit_ratio(df, trades_opened_closed_timestamps)
-    df = add_trade_fee(df, fee_percentage, trades_opened_closed_timestamps)
+    opened_positions, closed_positions = get_trade_positions(df.index, closed_trades)
+    df = correct_for_stoploss_roi(df, closed_trades, closed_positions)
+    df = apply_profit_ratio(df, opened_positions, closed_positions)
+    df = add_trade_fee(df, fee_percentage, opened_positions, closed_positions)
     df["value"] = df["profit_ratio"].cumprod()
     return df
 
 
-def get_profit_ratio_from_capital(capital: dict):
-    df = pd.DataFrame(capital.items(), columns=['time', 'capital']).set_index('time')
+def get_profit_ratio_from_capital(time: np.ndarray, capital: np.ndarray):
+    df = pd.DataFrame({'capital': capital}, index=pd.Index(time, name='time'))
     df["profit_ratio"] = df["capital"] / df["capital"].shift(1)
     df.loc[df.index[0], "profit_ratio"] = 1
     df["value"] = df["profit_ratio"].cumprod()
@@ -56,37 +57,52 @@ def with_copied_initial_row(df: pd.DataFrame) -> pd.DataFrame:
     return pd.concat([head, df])
 
 
-def map_trades_to_opened_closed_timestamps(closed_trades):
-    trades_closed_opened = [(int(trade.opened_at.timestamp() * 1000), int(trade.closed_at.timestamp() * 1000)) for trade
-                            in closed_trades]
-    return trades_closed_opened
+def get_trade_positions(index: pd.Index, closed_trades: [Trade]):
+    """
+    :return: Row positions of the open and close timestamps of every trade, which are rows of the frame
+    """
+    opened_at = np.array([trade.opened_at_ms for trade in closed_trades], dtype=np.int64)
+    closed_at = np.array([trade.closed_at_ms for trade in closed_trades], dtype=np.int64)
+    return index.get_indexer(opened_at), index.get_indexer(closed_at)
+
 
+def get_in_trade_mask(n_rows: int, opened_positions: np.ndarray, closed_positions: np.ndarray) -> np.ndarray:
+    """
+    :return: Whether a row is held by a trade, from the row after it opened up to and including the row it closed
+    """
+    starts = opened_positions + 1
+    ends = np.maximum(closed_positions + 1, starts)
+    events = np.zeros(n_rows + 1, dtype=np.int64)
+    np.add.at(events, starts, 1)
+    np.add.at(events, ends, -1)
+    return np.cumsum(events)[:n_rows] > 0
 
-def apply_profit_ratio(df, trades_open_closed):
+
+def apply_profit_ratio(df, opened_positions, closed_positions):
     df["corrected_close"] = df["corrected_close"].fillna(value=None, method='ffill')
-    df["profit_ratio"] = None
-    for open_timestamp, close in trades_open_closed:
-        # skip the first row of each trade
-        idx = np.searchsorted(df.index, open_timestamp)
-        open_timestamp = df.index[max(0, idx + 1)]
-
-        df.loc[open_timestamp: close, "profit_ratio"] = (df["corrected_close"] / df["corrected_close"].shift(1))
-    df["profit_ratio"] = df["profit_ratio"].fillna(value=1)
+    corrected_close = df["corrected_close"].to_numpy()
+    profit_ratio = np.ones(len(df.index), dtype=np.float64)
+    if len(df.index) > 1:
+        profit_ratio[1:] = corrected_close[1:] / corrected_close[:-1]
+
+    in_trade = get_in_trade_mask(len(df.index), opened_positions, closed_positions)
+    df["profit_ratio"] = np.where(in_trade & ~np.isnan(profit_ratio), profit_ratio, 1.)
     return df
 
 
-def add_trade_fee(df, fee_percentage, trades_closed_opened):
+def add_trade_fee(df, fee_percentage, opened_positions, closed_positions):
     fee_ratio = 1 - fee_percentage / 100
-    for opened, closed in trades_closed_opened:
-        df.loc[opened, "profit_ratio"] *= fee_ratio
-        df.loc[closed, "profit_ratio"] *= fee_ratio
+    profit_ratio = df["profit_ratio"].to_numpy(copy=True)
+    np.multiply.at(profit_ratio, opened_positions, fee_ratio)
+    np.multiply.at(profit_ratio, closed_positions, fee_ratio)
+    df["profit_ratio"] = profit_ratio
     return df
 
 
 def get_trade_timestamps(closed_trades):
     trade_timestamps_list = []
     for trade in closed_trades:
-        trade_timestamps_list.append(int(trade.opened_at.timestamp() * 1000))
-        trade_timestamps_list.append(int(trade.closed_at.timestamp() * 1000))
+        trade_timestamps_list.append(trade.opened_at_ms)
+        trade_timestamps_list.append(trade.closed_at_ms)
     trade_timestamps = pd.DataFrame(trade_timestamps_list, columns=["time"]).set_index("time")
     return trade_timestamps
@@ -1,10 +1,15 @@
-from datetime import datetime
+from typing import Tuple
+
+import numpy as np
 from pandas import DataFrame
+
+from modules.public.pairs_data import PairFrame, PairsData
+from modules.stats.metrics.periods import get_period_change, get_period_ids
 from modules.stats.metrics.profit_ratio import with_copied_initial_row
 
 
-def get_market_ratio_per_coin(signal_dict):
-    df = DataFrame(signal_dict.values()).set_index("time")
+def get_market_ratio_per_coin(pair_frame: PairFrame):
+    df = pair_frame.frame[["close"]]
     df = with_copied_initial_row(df)
     df["close"] = df["close"].fillna(value=None, method='ffill')
     df["market_ratio"] = (df["close"] / df["close"].shift(1))
@@ -12,7 +17,7 @@ def get_market_ratio_per_coin(signal_dict):
     return df["market_ratio"]
 
 
-def get_market_ratios(signal_dict: dict) -> DataFrame:
+def get_market_ratios(signal_dict: PairsData) -> DataFrame:
     coins = list(signal_dict.keys())
     market_ratio = {}
     for coin in coins:
@@ -28,48 +33,41 @@ def get_market_ratios(signal_dict: dict) -> DataFrame:
     return combined_market_ratio_df
 
 
-def get_outperforming_timeframe(cum_profit_ratio: DataFrame, market_ratio_df: DataFrame, timeframe="W"):
-    # copy dataframes so the originals don't get modified
-    cum_profit_ratio = cum_profit_ratio.copy()
-    market_ratio_df = market_ratio_df.copy()
-
-    # Refactor index of dataframes
-    datetime_index = [datetime.fromtimestamp(ms / 1000.0) for ms in market_ratio_df.index]
-    market_ratio_df.index = datetime_index
-    cum_profit_ratio.index = datetime_index
+def count_wins_draws_losses(change: np.ndarray, lower, upper) -> Tuple[int, int, int]:
+    """
+    Timeframes without candles have no change and count as draw
+    """
+    wins = int(np.count_nonzero(change > upper))
+    losses = int(np.count_nonzero(change < lower))
+    return wins, len(change) - wins - losses, losses
 
-    # Resample dataframes to timeframe
-    close_price = market_ratio_df.resample(timeframe, origin='start').ohlc()
-    market_change = close_price['close'] / close_price['open']
 
-    capital = cum_profit_ratio['value'] * 1000
-    cum_profit_ratio = capital.resample(timeframe, origin='start').ohlc()
-    capital = cum_profit_ratio['close'] / cum_profit_ratio['open']
+def get_outperforming_timeframe(cum_profit_ratio: DataFrame, market_ratio_df: DataFrame, timeframe="W"):
+    period_ids = get_period_ids(market_ratio_df.index.to_numpy(), timeframe)
+    market_change = get_period_change(market_ratio_df.to_numpy(dtype=np.float64), period_ids)
+    capital = get_period_change(cum_profit_ratio['value'].to_numpy(dtype=np.float64) * 1000, period_ids)
 
     # Define the winning weeks
-    wins = len(capital[capital > market_change + 0.001])
-    losses = len(capital[capital < market_change - 0.001])
-    draws = len(capital) - wins - losses
-
-    return wins, draws, losses
+    return count_wins_draws_losses(capital, market_change - 0.001, market_change + 0.001)
 
 
 def get_profitable_timeframe(cum_profit_ratio, timeframe="W"):
-    # copy dataframes so the originals don't get modified
-    cum_profit_ratio = cum_profit_ratio.copy()
-    # Refactor index of dataframes
-    datetime_index = [datetime.fromtimestamp(ms / 1000.0) for ms in cum_profit_ratio.index]
-    cum_profit_ratio.index = datetime_index
-
-    # Resample dataframes to one week
-    capital = cum_profit_ratio['value'] * 1000
-    capital = capital.resample(timeframe, origin='start').ohlc()
-    capital_timeframe = \
-        capital['close'] / capital['open']
+    period_ids = get_period_ids(cum_profit_ratio.index.to_numpy(), timeframe)
+    capital_timeframe = get_period_change(cum_profit_ratio['value'].to_numpy(dtype=np.float64) * 1000, period_ids)
 
     # Define the winning weeks
-    wins = len(capital_timeframe[capital_timeframe > 1.001])
-    losses = len(capital_timeframe[capital_timeframe < 0.999])
-    draws = len(capital_timeframe) - wins - losses
+    return count_wins_draws_losses(capital_timeframe, 0.999, 1.001)
+
+
+def get_timeframe_performance(time: np.ndarray, capital: np.ndarray, market_ratio: np.ndarray, timeframe="W") \
+        -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
+    """
+    Profitable and outperforming timeframes, bucketing the timestamps once
+    :return: (wins, draws, losses) of the profitable and of the outperforming timeframes
+    """
+    period_ids = get_period_ids(time, timeframe)
+    capital_change = get_period_change(capital, period_ids)
+    market_change = get_period_change(market_ratio, period_ids)
 
-    return wins, draws, losses
+    return count_wins_draws_losses(capital_change, 0.999, 1.001), \
+        count_wins_draws_losses(capital_change, market_change - 0.001, market_change + 0.001)
@@ -0,0 +1,151 @@
+# Libraries
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+# Files
+from backtesting.strategy import Strategy
+from modules.public.trading_stats import MonteCarloSummary
+from modules.setup import ConfigModule
+from modules.stats.ratios.for_portfolio import get_sharpe_sortino_ratios
+from modules.stats.sweep import without_exchange
+from modules.stats.tick_engine import ColumnarTickEngine, SignalArrays
+from modules.stats.trade import Trade
+from modules.stats.tradingmodule import TradingModule
+from utils.utils import calculate_worth_of_open_trades
+
+
+# ======================================================================
+# A Monte Carlo backtest repeats the trading simulation on one set of
+# signal arrays with a seeded, shuffled pair order per tick, optionally
+# bootstraps the resulting trades, and reports the distribution of the
+# outcomes over all simulations.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+_worker_config = None
+_worker_strategy = None
+_worker_signal_arrays = None
+
+
+@dataclass
+class Simulation:
+    seed: int
+    profit_ratio: float
+    max_seen_drawdown: float
+    sharpe_90d: Optional[float]
+    resampled_profit_ratio: Optional[float]
+    resampled_max_drawdown: Optional[float]
+
+
+def simulate(config: ConfigModule, strategy: Strategy, signal_arrays: SignalArrays, seed: int) -> Simulation:
+    """
+    Runs the trading simulation with the pair order shuffled on every tick, seeded so every run can be reproduced
+    """
+    trading_module = TradingModule(config, strategy)
+    ColumnarTickEngine(trading_module, signal_arrays).run(list(signal_arrays.pairs), shuffle=True,
+                                                          rng=random.Random(seed))
+
+    equity_curve = trading_module.equity_curve
+    end_capital = trading_module.budget + calculate_worth_of_open_trades(trading_module.open_trades)
+    max_seen_drawdown = trading_module.seen_drawdown.finish().max_drawdown
+    sharpe_90d, _, _, _ = get_sharpe_sortino_ratios(equity_curve.series('capital'))
+
+    resampled_profit_ratio, resampled_max_drawdown = None, None
+    if config.monte_carlo_resample_trades:
+        resampled_profit_ratio, resampled_max_drawdown = resample_trades(
+            trading_module.closed_trades, config.starting_capital, np.random.default_rng(seed))
+
+    return Simulation(
+        seed=seed,
+        profit_ratio=(end_capital - config.starting_capital) / config.starting_capital,
+        max_seen_drawdown=float(max_seen_drawdown),
+        sharpe_90d=sharpe_90d,
+        resampled_profit_ratio=resampled_profit_ratio,
+        resampled_max_drawdown=resampled_max_drawdown
+    )
+
+
+def get_trade_returns(closed_trades: List[Trade], starting_capital: float) -> np.ndarray:
+    """
+    :return: Profit of every closed trade, in order of closing, relative to the realised capital before it closed
+    """
+    closed_trades = sorted(closed_trades, key=lambda trade: trade.closed_at_ms)
+    profits = np.array([trade.profit_currency for trade in closed_trades], dtype=np.float64)
+    realised_capital = starting_capital + np.concatenate([[0.], np.cumsum(profits)[:-1]])
+    return profits / realised_capital
+
+
+def resample_trades(closed_trades: List[Trade], starting_capital: float, rng: np.random.Generator) -> tuple:
+    """
+    Draws as many trades as were closed, with replacement, and compounds their returns in the drawn order
+    :return: Profit ratio and max drawdown of the resampled sequence of trades
+    """
+    returns = get_trade_returns(closed_trades, starting_capital)
+    if len(returns) == 0:
+        return 0.0, 0.0
+
+    capital = np.concatenate([[1.], np.cumprod(1 + rng.choice(returns, size=len(returns), replace=True))])
+    drawdown = capital / np.maximum.accumulate(capital) - 1
+    return float(capital[-1] - 1), float(drawdown.min())
+
+
+def init_worker(config: ConfigModule, strategy: Strategy, signal_arrays: SignalArrays) -> None:
+    global _worker_config, _worker_strategy, _worker_signal_arrays
+
+    _worker_config = config
+    _worker_strategy = strategy
+    _worker_signal_arrays = signal_arrays
+
+
+def simulate_in_worker(seed: int) -> Simulation:
+    return simulate(_worker_config, _worker_strategy, _worker_signal_arrays, seed)
+
+
+def run_monte_carlo(config: ConfigModule, strategy: Strategy, signal_arrays: SignalArrays, runs: int, seed: int = 0,
+                    workers: int = 1) -> List[Simulation]:
+    """
+    :param signal_arrays: Signal arrays of the populated signals, shared by all simulations
+    :param runs: Amount of simulations, simulation i is seeded with seed + i
+    :param workers: Maximum amount of worker processes, 1 runs the simulations serially
+    :return: Simulations in order of seed
+    """
+    seeds = [seed + run for run in range(runs)]
+    if workers <= 1 or runs <= 1:
+        return [simulate(config, strategy, signal_arrays, run_seed) for run_seed in seeds]
+
+    with ProcessPoolExecutor(max_workers=min(workers, runs),
+                             initializer=init_worker,
+                             initargs=(without_exchange(config), strategy, signal_arrays)) as executor:
+        return list(executor.map(simulate_in_worker, seeds, chunksize=max(1, runs // (4 * workers))))
+
+
+def get_percentiles(values: list) -> List[float]:
+    """
+    :return: Value at each of PERCENTILES, ignoring missing values. NaN when all values are missing.
+    """
+    values = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    if np.isnan(values).all():
+        return [np.nan] * len(PERCENTILES)
+    return [float(value) for value in np.nanpercentile(values, PERCENTILES)]
+
+
+def summarize_simulations(simulations: List[Simulation]) -> MonteCarloSummary:
+    resampled = len(simulations) > 0 and simulations[0].resampled_profit_ratio is not None
+    return MonteCarloSummary(
+        n_runs=len(simulations),
+        percentiles=PERCENTILES,
+        profit_ratio=get_percentiles([simulation.profit_ratio for simulation in simulations]),
+        max_seen_drawdown=get_percentiles([simulation.max_seen_drawdown for simulation in simulations]),
+        sharpe_90d=get_percentiles([simulation.sharpe_90d for simulation in simulations]),
+        resampled_profit_ratio=get_percentiles([simulation.resampled_profit_ratio for simulation in simulations])
+        if resampled else None,
+        resampled_max_drawdown=get_percentiles([simulation.resampled_max_drawdown for simulation in simulations])
+        if resampled else None
+    )
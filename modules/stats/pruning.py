@@ -0,0 +1,87 @@
+# Libraries
+import math
+from typing import Optional
+
+import optuna
+from optuna import Trial
+from optuna.pruners import BasePruner, MedianPruner, NopPruner, SuccessiveHalvingPruner
+
+# Files
+from modules.setup import ConfigModule
+from modules.stats.drawdown.tracker import DrawdownTracker
+
+
+# ======================================================================
+# TrialPruning reports the intermediate result of a hyperopt trial to
+# Optuna at evenly spaced checkpoints of the backtest, while the trading
+# loop runs, and stops the trial as soon as the pruner or the drawdown
+# limit deems it hopeless.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+PRUNERS = {
+    "none": NopPruner,
+    "median": MedianPruner,
+    "successive-halving": SuccessiveHalvingPruner
+}
+
+
+def create_pruner(config: ConfigModule) -> BasePruner:
+    return PRUNERS[config.hyperopt_pruner]()
+
+
+class TrialPruning:
+    """
+    Intermediate results are reported as losses, lower is better, like the loss function of a study:
+    the negated profit ratio or the max seen drawdown as positive ratio.
+    """
+
+    def __init__(self, trial: Trial, config: ConfigModule):
+        self.trial = trial
+        self.starting_capital = float(config.starting_capital)
+        self.metric = config.hyperopt_pruning_metric
+        # hyperopt-max-drawdown is a percentage, like the stoploss
+        self.max_drawdown = -config.hyperopt_max_drawdown / 100 if config.hyperopt_max_drawdown else -math.inf
+
+        duration = config.backtesting_to - config.backtesting_from
+        checkpoints = max(int(config.hyperopt_checkpoints), 1)
+        self.checkpoints = [config.backtesting_from + duration * step // checkpoints
+                            for step in range(1, checkpoints)]
+        self.step = 0
+        self.next_checkpoint = self.checkpoints[0] if self.checkpoints else math.inf
+
+    @staticmethod
+    def create(trial: Trial, config: ConfigModule) -> Optional['TrialPruning']:
+        """
+        :return: None when pruning is disabled, so the trading loop does not have to check in at all
+        """
+        if config.hyperopt_pruner == "none" and not config.hyperopt_max_drawdown:
+            return None
+        return TrialPruning(trial, config)
+
+    def check(self, time: int, capital: float, seen_drawdown: DrawdownTracker) -> None:
+        """
+        Called once the capital of a tick is final, see TradingModule.check_pruning
+        :raises optuna.TrialPruned: When the trial should be stopped
+        """
+        drawdown = seen_drawdown.running_drawdown
+        if drawdown < self.max_drawdown:
+            self.trial.set_user_attr("pruned_at", int(time))
+            raise optuna.TrialPruned(f"Seen drawdown of {drawdown:.2%} exceeds the hyperopt-max-drawdown")
+
+        if time < self.next_checkpoint or math.isnan(capital):
+            return
+
+        while self.step < len(self.checkpoints) and self.checkpoints[self.step] <= time:
+            self.step += 1
+        self.next_checkpoint = self.checkpoints[self.step] if self.step < len(self.checkpoints) else math.inf
+
+        if self.metric == "drawdown":
+            self.trial.report(-drawdown, self.step)
+        else:
+            self.trial.report(1 - capital / self.starting_capital, self.step)
+
+        if self.trial.should_prune():
+            self.trial.set_user_attr("pruned_at", int(time))
+            raise optuna.TrialPruned(f"Trial pruned at checkpoint {self.step}")
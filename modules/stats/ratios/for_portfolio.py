@@ -1,14 +1,16 @@
 from datetime import timedelta
 from typing import Tuple, Optional
 
+from pandas import Series
+
 from modules.setup.config.validations import validate_ratios
 from modules.stats import utils
 from modules.stats.ratios import ratios
 
 
-def get_sharpe_sortino_ratios(capital_per_timestamp: dict, risk_free: float = 0.0) \
+def get_sharpe_sortino_ratios(capital_per_timestamp: Series, risk_free: float = 0.0) \
         -> Tuple[Optional[float], Optional[float], Optional[float], Optional[float]]:
-    df = utils.convert_timestamp_dict_to_dataframe(capital_per_timestamp, resample=True)
+    df = utils.convert_timestamp_series_to_dataframe(capital_per_timestamp, resample=True)
 
     df['returns'] = (df['capital'] - df['capital'].shift()) / 100
     df['risk_free'] = risk_free
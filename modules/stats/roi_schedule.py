@@ -0,0 +1,48 @@
+# Libraries
+from bisect import bisect_right
+from typing import Dict, Union
+
+import numpy as np
+
+# Files
+
+
+# ======================================================================
+# RoiSchedule compiles the ROI table of the config ({minutes: percentage})
+# once into sorted breakpoints, so the ROI of a trade can be looked up by
+# bisection for a single holding duration, or for a whole array at once.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+MINUTE_MS = 60000
+
+
+class RoiSchedule:
+
+    def __init__(self, roi: Dict[str, Union[int, float]]):
+        """
+        :param roi: Percentage per minutes a trade has been open, FI: {"0": 10, "60": 5}, must contain "0"
+        """
+        schedule = sorted((int(minutes), value) for minutes, value in roi.items())
+        self.default = roi['0']
+        self.breakpoints_ms = [minutes * MINUTE_MS for minutes, _ in schedule]
+        self.percentages = [value for _, value in schedule]
+        self.breakpoints_ms_array = np.array(self.breakpoints_ms, dtype=np.int64)
+        self.percentages_array = np.array(self.percentages, dtype=np.float64)
+
+    def get_roi(self, holding_ms: int) -> float:
+        """
+        :param holding_ms: Time the trade has been open, in ms
+        :return: ROI percentage of the last breakpoint that has passed
+        """
+        index = bisect_right(self.breakpoints_ms, holding_ms) - 1
+        return self.percentages[index] if index >= 0 else self.default
+
+    def get_roi_many(self, holding_ms: np.ndarray) -> np.ndarray:
+        """
+        :param holding_ms: Array of times trades have been open, in ms
+        :return: Array with the ROI percentage for every holding duration
+        """
+        indices = np.searchsorted(self.breakpoints_ms_array, holding_ms, side='right') - 1
+        return np.where(indices >= 0, self.percentages_array[np.maximum(indices, 0)], float(self.default))
@@ -1,24 +1,23 @@
 import random
 from collections import defaultdict
 from datetime import datetime, timedelta
+from typing import Optional
 
 from cli.print_utils import print_info
 from modules.output.results import CoinInsights, MainResults, LeftOpenTradeResult
 from modules.public.pairs_data import PairsData
 from modules.public.trading_stats import TradingStats
 from modules.setup import ConfigModule
-from modules.stats.drawdown.drawdown import get_max_drawdown_ratio, get_max_drawdown_ratio_without_buy_rows
-from modules.stats.drawdown.for_portfolio import get_max_seen_drawdown_for_portfolio, \
-    get_max_realised_drawdown_for_portfolio, get_longest_drawdown
 from modules.stats.drawdown.per_trade import get_max_seen_drawdown_per_trade
+from modules.stats.metrics.coin_statistics import calculate_statistics_per_pair
 from modules.stats.metrics.market_change import get_market_change, get_market_drawdown
-from modules.stats.metrics.profit_ratio import get_realised_profit_ratio, get_seen_cum_profit_ratio, \
-    get_profit_ratio_from_capital
+from modules.stats.metrics.profit_ratio import get_profit_ratio_from_capital
 from modules.stats.metrics.trades import compute_trade_rankings, get_number_of_losing_trades, \
     get_number_of_consecutive_losing_trades, calculate_trade_durations, compute_risk_reward_ratio, \
     compute_volume_turnover
 from modules.stats.metrics.winning_weeks import get_profitable_timeframe, get_outperforming_timeframe, get_market_ratios
 from modules.stats.ratios.for_portfolio import get_sharpe_sortino_ratios
+from modules.stats.tick_engine import ColumnarTickEngine, EventTickEngine, SignalArrays
 from modules.stats.trade import Trade, SellReason
 from modules.stats.tradingmodule import TradingModule
 from utils.dict import group_by
@@ -27,7 +26,11 @@ from utils.utils import calculate_worth_of_open_trades
 
 class StatsModule:
 
-    def __init__(self, config: ConfigModule, frame_with_signals: PairsData, trading_module: TradingModule, df):
+    def __init__(self, config: ConfigModule, frame_with_signals: PairsData, trading_module: TradingModule, df,
+                 signal_arrays: Optional[SignalArrays] = None):
+        """
+        :param signal_arrays: Signal arrays of frame_with_signals, when they are shared by several backtests
+        """
         self.buy_points = None
         self.sell_points = None
         self.df = df
@@ -35,15 +38,33 @@ class StatsModule:
         self.trading_module = trading_module
         self.frame_with_signals = frame_with_signals
         self.market_ratio_df = None
+        self.signal_arrays = signal_arrays
 
         if self.config.stoploss_type == 'standard':
             self.config.stoploss_type = 'static'
 
     def analyze(self) -> TradingStats:
         pairs = list(self.frame_with_signals.keys())
-        ticks = list(self.frame_with_signals[pairs[0]].keys()) if pairs else []
+        self.run_ticks(pairs)
+        return self.generate_results(pairs)
+
+    def run_ticks(self, pairs: list) -> None:
         print_info("Backtesting")
         shuffle = self.config.randomize_pair_order
+        if self.config.tick_engine in ('event', 'columnar'):
+            signal_arrays = self.signal_arrays or SignalArrays.from_pairs_data(self.frame_with_signals, pairs)
+            engine = EventTickEngine if self.config.tick_engine == 'event' else ColumnarTickEngine
+            engine(self.trading_module, signal_arrays).run(pairs, shuffle)
+        else:
+            self.run_dict_ticks(pairs, shuffle)
+
+    def generate_results(self, pairs: list) -> TradingStats:
+        market_change = get_market_change(self.df, pairs, self.frame_with_signals)
+        market_drawdown = get_market_drawdown(pairs, self.frame_with_signals)
+        return self.generate_backtesting_result(market_change, market_drawdown, pairs)
+
+    def run_dict_ticks(self, pairs: list, shuffle: bool) -> None:
+        ticks = list(self.frame_with_signals[pairs[0]].keys()) if pairs else []
         for tick in ticks:
             if shuffle:
                 random.shuffle(pairs)
@@ -51,10 +72,7 @@ class StatsModule:
                 pair_dict = self.frame_with_signals[pair]
                 tick_dict = pair_dict[tick]
                 self.trading_module.tick(tick_dict)
-
-        market_change = get_market_change(self.df, pairs, self.frame_with_signals)
-        market_drawdown = get_market_drawdown(pairs, self.frame_with_signals)
-        return self.generate_backtesting_result(market_change, market_drawdown, pairs)
+            self.trading_module.check_pruning()
 
     def generate_backtesting_result(self, market_change: dict, market_drawdown: dict, pairs: list) -> TradingStats:
         self.market_ratio_df = get_market_ratios(self.frame_with_signals)
@@ -85,7 +103,7 @@ class StatsModule:
             sellpoints=self.sell_points,
             df=self.df,
             trades=self.trading_module.open_trades + self.trading_module.closed_trades,
-            capital_per_timestamp=self.trading_module.capital_per_timestamp
+            equity_curve=self.trading_module.equity_curve
         )
 
     def generate_main_results(self, open_trades: [Trade], closed_trades: [Trade], budget: float,
@@ -93,19 +111,19 @@ class StatsModule:
         budget += calculate_worth_of_open_trades(open_trades)
         overall_profit_ratio = (budget - self.config.starting_capital) / self.config.starting_capital
 
-        max_realised_drawdown = \
-            get_max_realised_drawdown_for_portfolio(self.trading_module.realised_profits_per_timestamp)
-        max_seen_drawdown = get_max_seen_drawdown_for_portfolio(self.trading_module.capital_per_timestamp)
+        equity_curve = self.trading_module.equity_curve
+        capital = equity_curve.series('capital')
 
-        longest_realised_drawdown = get_longest_drawdown(self.trading_module.realised_profits_per_timestamp)
+        realised_drawdown = self.trading_module.realised_drawdown.finish()
+        seen_drawdown = self.trading_module.seen_drawdown.finish()
+        max_realised_drawdown = realised_drawdown.max_drawdown
+        max_seen_drawdown = seen_drawdown.max_drawdown_info()
+        longest_realised_drawdown = realised_drawdown.longest_drawdown_info()
+        longest_seen_drawdown = seen_drawdown.longest_drawdown_info()
 
-        longest_seen_drawdown = get_longest_drawdown(self.trading_module.capital_per_timestamp)
+        sharpe_90d, sortino_90d, sharpe_3y, sortino_3y = get_sharpe_sortino_ratios(capital)
 
-        sharpe_90d, sortino_90d, sharpe_3y, sortino_3y = \
-            get_sharpe_sortino_ratios(
-                self.trading_module.capital_per_timestamp)
-
-        profit_ratio_per_timestamp = get_profit_ratio_from_capital(self.trading_module.capital_per_timestamp)
+        profit_ratio_per_timestamp = get_profit_ratio_from_capital(equity_curve.times, equity_curve.values('capital'))
         prof_weeks_win, prof_weeks_draw, prof_weeks_loss = get_profitable_timeframe(
             profit_ratio_per_timestamp,
             "W"
@@ -292,63 +310,12 @@ class StatsModule:
         if len(trades_per_coin) == 0:
             trades_per_coin = {pair: [] for pair in self.frame_with_signals.keys()}
 
+        coin_statistics = calculate_statistics_per_pair(self.frame_with_signals.frames(), trades_per_coin,
+                                                        self.market_ratio_df, self.config.fee,
+                                                        self.config.statistics_workers)
+
         for pair, closed_pair_trades in trades_per_coin.items():
-            # Calculate max seen drawdown ratio
-            seen_cum_profit_ratio_df = get_seen_cum_profit_ratio(
-                self.frame_with_signals[pair],
-                closed_pair_trades,
-                self.config.fee
-            )
-            per_coin_stats[pair]["max_seen_ratio"] = get_max_drawdown_ratio(seen_cum_profit_ratio_df) - 1
-
-            # Calculate max realised drawdown ratio
-            realised_cum_profit_ratio_df = get_realised_profit_ratio(
-                self.frame_with_signals[pair],
-                closed_pair_trades,
-                self.config.fee,
-            )
-            per_coin_stats[pair]["max_realised_ratio"] = \
-                get_max_drawdown_ratio_without_buy_rows(realised_cum_profit_ratio_df)
-
-            # Find avg, longest and shortest trade durations
-            per_coin_stats[pair]["avg_trade_duration"], \
-            per_coin_stats[pair]["longest_trade_duration"], \
-            per_coin_stats[pair]["shortest_trade_duration"] = \
-                calculate_trade_durations(closed_pair_trades)
-
-            # Find winning, draw and losing weeks for current coin
-            per_coin_stats[pair]["perf_weeks_win"], \
-            per_coin_stats[pair]["perf_weeks_draw"], \
-            per_coin_stats[pair]["perf_weeks_loss"] = get_outperforming_timeframe(
-                seen_cum_profit_ratio_df,
-                self.market_ratio_df[pair],
-                "W"
-            )
-
-            # Find winning, draw and losing months for current coin
-            per_coin_stats[pair]["perf_months_win"], \
-            per_coin_stats[pair]["perf_months_draw"], \
-            per_coin_stats[pair]["perf_months_loss"] = get_outperforming_timeframe(
-                seen_cum_profit_ratio_df,
-                self.market_ratio_df[pair],
-                "M"
-            )
-
-            # Find profitable weeks for current coin
-            per_coin_stats[pair]["prof_weeks_win"], \
-            per_coin_stats[pair]["prof_weeks_draw"], \
-            per_coin_stats[pair]["prof_weeks_loss"] = get_profitable_timeframe(
-                seen_cum_profit_ratio_df,
-                "W"
-            )
-
-            # Find profitable months for current coin
-            per_coin_stats[pair]["prof_months_win"], \
-            per_coin_stats[pair]["prof_months_draw"], \
-            per_coin_stats[pair]["prof_months_loss"] = get_profitable_timeframe(
-                seen_cum_profit_ratio_df,
-                "M"
-            )
+            per_coin_stats[pair].update(coin_statistics[pair])
 
             for trade in closed_pair_trades:
                 # Update average profit
@@ -0,0 +1,82 @@
+# Libraries
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+# Files
+from backtesting.strategy import Strategy
+from modules.public.pairs_data import PairsData
+from modules.public.trading_stats import MainResults
+from modules.setup import ConfigModule
+from modules.stats.stats import StatsModule
+from modules.stats.tick_engine import SignalArrays
+from modules.stats.tradingmodule import TradingModule
+
+
+# ======================================================================
+# A sweep backtests several trading configurations (stoploss, ROI, max
+# open trades, exposure) on the signals of a single signal pass, one
+# TradingModule per configuration, optionally in a process pool.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+_worker_strategy = None
+_worker_frame_with_signals = None
+_worker_df = None
+_worker_signal_arrays = None
+
+
+def run_sweep_configuration(config: ConfigModule, strategy: Strategy, frame_with_signals: PairsData, df: dict,
+                            signal_arrays: Optional[SignalArrays]) -> MainResults:
+    trading_module = TradingModule(config, strategy)
+    stats_module = StatsModule(config, frame_with_signals, trading_module, df, signal_arrays)
+    return stats_module.analyze().main_results
+
+
+def init_worker(strategy: Strategy, frame_with_signals: PairsData, df: dict,
+                signal_arrays: Optional[SignalArrays]) -> None:
+    global _worker_strategy, _worker_frame_with_signals, _worker_df, _worker_signal_arrays
+
+    _worker_strategy = strategy
+    _worker_frame_with_signals = frame_with_signals
+    _worker_df = df
+    _worker_signal_arrays = signal_arrays
+
+
+def run_sweep_configuration_in_worker(config: ConfigModule) -> MainResults:
+    return run_sweep_configuration(config, _worker_strategy, _worker_frame_with_signals, _worker_df,
+                                   _worker_signal_arrays)
+
+
+def without_exchange(config: ConfigModule) -> ConfigModule:
+    # The exchange holds a network session, backtesting a configuration does not need it
+    picklable_config = copy.copy(config)
+    picklable_config.exchange = None
+    return picklable_config
+
+
+def run_sweep(configs: List[ConfigModule], strategy: Strategy, frame_with_signals: PairsData, df: dict,
+              workers: int = 1) -> List[MainResults]:
+    """
+    :param configs: Configurations to backtest, they may only differ in the settings of SWEEP_SETTINGS
+    :param frame_with_signals: Populated signals, shared by all configurations
+    :param df: Populated indicators per pair, shared by all configurations
+    :param workers: Maximum amount of worker processes, 1 backtests the configurations serially
+    :return: Main results per configuration, in the order of configs
+    """
+    if len(configs) == 0:
+        return []
+
+    pairs = list(frame_with_signals.keys())
+    signal_arrays = SignalArrays.from_pairs_data(frame_with_signals, pairs) \
+        if configs[0].tick_engine != 'dict' else None
+
+    if workers <= 1 or len(configs) == 1:
+        return [run_sweep_configuration(config, strategy, frame_with_signals, df, signal_arrays)
+                for config in configs]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(configs)),
+                             initializer=init_worker,
+                             initargs=(strategy, frame_with_signals, df, signal_arrays)) as executor:
+        return list(executor.map(run_sweep_configuration_in_worker, map(without_exchange, configs)))
@@ -0,0 +1,220 @@
+# Libraries
+import random
+from typing import Dict, List, Optional
+
+import numpy as np
+from pandas import DataFrame
+
+# Files
+from modules.public.pairs_data import PairsData
+from modules.stats.exit_solver import ExitSolver
+from modules.stats.trade import Trade
+from modules.stats.tradingmodule import TradingModule
+
+
+# ======================================================================
+# ColumnarTickEngine steps through time by index over (ticks x pairs)
+# NumPy arrays and only hands the TradingModule the candles of pairs
+# that can change its state on that tick. EventTickEngine only visits
+# ticks with a buy signal, exit or cooldown, and registers the capital
+# of the ticks in between at once.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+SIGNAL_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'buy', 'sell', 'stoploss']
+
+
+class SignalArrays:
+    """
+    Contiguous float64 arrays shaped (ticks x pairs) for every signal column, together with a shared time axis.
+    """
+
+    def __init__(self, pairs: List[str], time: list, columns: Dict[str, np.ndarray]):
+        self.pairs = list(pairs)
+        self.time = time
+        self.columns = columns
+
+    @staticmethod
+    def from_frames(frames: Dict[str, DataFrame], pairs: List[str]) -> 'SignalArrays':
+        if len(pairs) == 0:
+            return SignalArrays(pairs, [], {})
+
+        present_columns = [column for column in SIGNAL_COLUMNS
+                           if all(column in frames[pair].columns for pair in pairs)]
+        columns = {
+            column: np.ascontiguousarray(
+                np.column_stack([frames[pair][column].to_numpy(dtype=np.float64) for pair in pairs])
+            ) for column in present_columns
+        }
+        time = frames[pairs[0]]['time'].tolist()
+
+        return SignalArrays(pairs, time, columns)
+
+    @staticmethod
+    def from_pairs_data(frame_with_signals: PairsData, pairs: List[str]) -> 'SignalArrays':
+        frames = {pair: frame_with_signals[pair].frame for pair in pairs}
+        return SignalArrays.from_frames(frames, pairs)
+
+    def candle(self, tick: int, pair_index: int) -> dict:
+        ohlcv = {column: float(values[tick, pair_index]) for column, values in self.columns.items()}
+        ohlcv['time'] = self.time[tick]
+        ohlcv['pair'] = self.pairs[pair_index]
+        return ohlcv
+
+
+class ColumnarTickEngine:
+    """
+    Produces the same trades and per-timestamp capital as calling TradingModule.tick for every pair on every tick.
+    A pair is only visited when it has an open trade, a buy signal or a running buy cooldown; budget and capital are
+    registered once per tick instead of once per pair.
+    """
+
+    def __init__(self, trading_module: TradingModule, signal_arrays: SignalArrays):
+        self.trading_module = trading_module
+        self.signal_arrays = signal_arrays
+        self.pair_index = {pair: index for index, pair in enumerate(signal_arrays.pairs)}
+        self.cooling_down = set()
+
+        buy = signal_arrays.columns.get('buy')
+        self.buy_mask = buy == 1 if buy is not None else np.zeros((len(signal_arrays.time), 0), dtype=bool)
+        self.ticks_with_buy = self.buy_mask.any(axis=1)
+
+    def run(self, pairs: list, shuffle: bool = False, rng: Optional[random.Random] = None) -> None:
+        """
+        :param pairs: Pair order, shuffled in place per tick when shuffle is set
+        :param shuffle: Randomize the order in which pairs are processed on every tick
+        :param rng: Generator used to shuffle, the global one of the random module when not given
+        """
+        shuffler = rng or random
+        for tick, time in enumerate(self.signal_arrays.time):
+            if shuffle:
+                shuffler.shuffle(pairs)
+
+            for pair in self.active_pairs(tick, pairs, shuffle):
+                self.pair_tick(tick, pair)
+
+            timestamp = {'time': time}
+            self.trading_module.update_budget_per_timestamp(timestamp)
+            self.trading_module.update_capital_per_timestamp(timestamp)
+            self.trading_module.check_pruning()
+
+    def pair_tick(self, tick: int, pair: str) -> None:
+        self.trading_module.pair_tick(self.signal_arrays.candle(tick, self.pair_index[pair]))
+        if self.trading_module.buy_cooldown[pair]:
+            self.cooling_down.add(pair)
+        else:
+            self.cooling_down.discard(pair)
+
+    def active_pairs(self, tick: int, pairs: list, shuffle: bool) -> list:
+        active = set(self.trading_module.open_trades_by_pair)
+        active.update(self.cooling_down)
+        if self.ticks_with_buy[tick]:
+            active.update(self.signal_arrays.pairs[index] for index in np.flatnonzero(self.buy_mask[tick]))
+
+        if shuffle:
+            return [pair for pair in pairs if pair in active]
+        return sorted(active, key=self.pair_index.get)
+
+
+class EventTickEngine(ColumnarTickEngine):
+    """
+    Produces the same results as ColumnarTickEngine. When a trade opens, ExitSolver finds the tick on which it will
+    be closed, so the engine can jump from event to event: ticks with a buy signal, an exit or a running cooldown are
+    processed by the TradingModule, the capital of open trades on the ticks in between is added with array operations.
+    """
+
+    def __init__(self, trading_module: TradingModule, signal_arrays: SignalArrays):
+        super().__init__(trading_module, signal_arrays)
+        self.time = np.asarray(signal_arrays.time, dtype=np.int64)
+        self.exit_solver = ExitSolver(self.time, signal_arrays.columns, trading_module.roi_schedule)
+        self.buy_ticks = np.flatnonzero(self.ticks_with_buy)
+        self.exit_ticks: Dict[str, int] = {}
+        self.trailing_highs: Dict[str, tuple] = {}
+
+    def run(self, pairs: list, shuffle: bool = False, rng: Optional[random.Random] = None) -> None:
+        # Open trades are summed in pair order on skipped ticks, which a shuffled pair order can not reproduce
+        if shuffle:
+            super().run(pairs, shuffle, rng)
+            return
+
+        tick = 0
+        while tick < len(self.time):
+            self.event_tick(tick, pairs)
+            next_tick = self.next_event(tick)
+            if next_tick > tick + 1:
+                self.skip_ticks(tick + 1, next_tick)
+            tick = next_tick
+
+    def event_tick(self, tick: int, pairs: list) -> None:
+        open_trades_by_pair = self.trading_module.open_trades_by_pair
+        for pair in self.active_pairs(tick, pairs, shuffle=False):
+            trade = open_trades_by_pair.get(pair)
+            if trade is not None:
+                self.restore_trailing_high(pair, trade, tick)
+
+            self.pair_tick(tick, pair)
+
+            trade_after = open_trades_by_pair.get(pair)
+            if trade_after is None:
+                self.exit_ticks.pop(pair, None)
+                self.trailing_highs.pop(pair, None)
+            elif trade_after is not trade:
+                exit_tick, highs = self.exit_solver.find_exit(trade_after, self.pair_index[pair], tick)
+                self.exit_ticks[pair] = exit_tick if exit_tick is not None else len(self.time)
+                self.trailing_highs[pair] = (tick, highs)
+
+        timestamp = {'time': self.signal_arrays.time[tick]}
+        self.trading_module.update_budget_per_timestamp(timestamp)
+        self.trading_module.update_capital_per_timestamp(timestamp)
+        self.trading_module.check_pruning()
+
+    def next_event(self, tick: int) -> int:
+        """
+        :return: The next tick that has to be processed by the TradingModule, the last tick always is
+        """
+        last_tick = len(self.time) - 1
+        if tick >= last_tick or len(self.cooling_down) > 0:
+            return tick + 1
+
+        next_tick = last_tick
+        buy_index = np.searchsorted(self.buy_ticks, tick, side='right')
+        if buy_index < len(self.buy_ticks):
+            next_tick = min(next_tick, int(self.buy_ticks[buy_index]))
+        if len(self.exit_ticks) > 0:
+            next_tick = min(next_tick, min(self.exit_ticks.values()))
+        return next_tick
+
+    def restore_trailing_high(self, pair: str, trade: Trade, tick: int) -> None:
+        """
+        Sets the trailing high capital the trade would have had after the previous tick, skipped ticks included
+        """
+        if trade.sl_type == 'trailing':
+            entry_tick, highs = self.trailing_highs[pair]
+            trade.sl_trailing_high_capital = float(highs[tick - 1 - entry_tick])
+
+    def skip_ticks(self, start: int, end: int) -> None:
+        """
+        Registers budget and capital of the ticks [start, end), on which open trades are only revalued
+        """
+        equity_curve = self.trading_module.equity_curve
+        ticks = equity_curve.extend(self.time[start:end])
+        columns = self.signal_arrays.columns
+
+        # Same operations, in the same pair order, as TradingModule.update_open_trades_value_per_timestamp
+        open_trades_by_pair = self.trading_module.open_trades_by_pair
+        for pair in sorted(open_trades_by_pair, key=self.pair_index.get):
+            trade = open_trades_by_pair[pair]
+            pair_index = self.pair_index[pair]
+            capital = trade.currency_amount * columns['close'][start:end, pair_index]
+            lowest_seen_capital = columns['low'][start:end, pair_index] * trade.currency_amount
+            equity_curve.lowest_total_capital_open_trades[ticks] += \
+                np.where(lowest_seen_capital < capital, lowest_seen_capital, capital)
+            equity_curve.highest_total_capital_open_trades[ticks] += \
+                columns['open'][start:end, pair_index] * trade.currency_amount
+            equity_curve.total_capital_open_trades[ticks] += capital
+
+        equity_curve.budget[ticks] = self.trading_module.budget
+        equity_curve.capital[ticks] = equity_curve.budget[ticks] + equity_curve.total_capital_open_trades[ticks]
+        self.trading_module.seen_drawdown.update_many(self.time[start:end], equity_curve.capital[ticks])
+        self.trading_module.check_pruning()
@@ -1,7 +1,7 @@
 # Libraries
 from datetime import datetime
 from enum import Enum
-from typing import Any
+from typing import Optional
 
 # Files
 
@@ -22,20 +22,29 @@ class SellReason(Enum):
     NONE = "None"
 
 
+# Trades track time as epoch ms, these are exposed as datetime for reporting
+DATETIME_ATTRIBUTES = {'opened_at_ms': 'opened_at', 'closed_at_ms': 'closed_at'}
+
+
 class Trade:
+    __slots__ = ('status', 'pair', 'open', 'current', 'opened_at_ms', 'closed_at_ms', 'close', 'fee', 'fee_paid_open',
+                 'fee_paid_close', 'fee_paid_total', 'sell_reason', 'candle_low', 'candle_open', 'profit_ratio',
+                 'profit_currency', 'max_seen_drawdown', 'starting_amount', 'capital', 'equity', 'currency_amount',
+                 'sl_type', 'sl_perc', 'sl_static_price', 'sl_trailing_ratio', 'sl_trailing_high_capital')
+
     max_seen_drawdown: float
-    closed_at: Any
+    closed_at_ms: Optional[int]
     sell_reason: SellReason
 
-    def __init__(self, ohlcv: dict, spend_amount: float, fee: float, date: datetime, sl_type: str, sl_perc: float,
+    def __init__(self, ohlcv: dict, spend_amount: float, fee: float, opened_at_ms: int, sl_type: str, sl_perc: float,
                  current_capital: float):
         # Basic trade data
         self.status = 'open'
         self.pair = ohlcv['pair']
         self.open = ohlcv['close']
         self.current = ohlcv['close']
-        self.opened_at = date
-        self.closed_at = None
+        self.opened_at_ms = int(opened_at_ms)
+        self.closed_at_ms = None
         self.close = None
         self.fee = fee
         self.fee_paid_open = spend_amount * fee
@@ -63,11 +72,28 @@ class Trade:
 
         self.update_profits()
 
-    def close_trade(self, reason: SellReason, date: datetime) -> None:
+    @property
+    def opened_at(self) -> datetime:
+        return datetime.fromtimestamp(self.opened_at_ms / 1000)
+
+    @property
+    def closed_at(self) -> Optional[datetime]:
+        if self.closed_at_ms is None:
+            return None
+        return datetime.fromtimestamp(self.closed_at_ms / 1000)
+
+    def to_dict(self) -> dict:
+        """
+        :return: Trade attributes for reporting, with opened_at and closed_at as datetime instead of epoch ms
+        """
+        names = [DATETIME_ATTRIBUTES.get(name, name) for name in self.__slots__]
+        return {name: getattr(self, name) for name in names}
+
+    def close_trade(self, reason: SellReason, closed_at_ms: int) -> None:
         self.status = 'closed'
         self.sell_reason = reason
         self.close = self.current
-        self.closed_at = date
+        self.closed_at_ms = int(closed_at_ms)
         self.fee_paid_close = self.capital * self.fee   # final issued fee
         self.fee_paid_total += self.fee_paid_close
 
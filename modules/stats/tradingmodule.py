@@ -1,12 +1,15 @@
 # Libraries
 import sys
-from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, List, Optional
 
 # Files
 from backtesting.strategy import Strategy
 from cli.print_utils import print_info, print_warning
 from modules.setup import ConfigModule
+from modules.stats.drawdown.tracker import DrawdownTracker
+from modules.stats.pruning import TrialPruning
+from modules.stats.equity_curve import EquityCurve
+from modules.stats.roi_schedule import RoiSchedule
 from modules.stats.trade import SellReason, Trade
 from utils.error_handling import ErrorOutput
 
@@ -21,9 +24,13 @@ from utils.error_handling import ErrorOutput
 
 class TradingModule:
 
-    def __init__(self, config: ConfigModule, strategy: Strategy):
+    def __init__(self, config: ConfigModule, strategy: Strategy, pruning: Optional[TrialPruning] = None):
+        """
+        :param pruning: Checks in on the hyperopt trial after every tick, see check_pruning
+        """
         self.config = config
         self.strategy = strategy
+        self.pruning = pruning
         self.budget = float(self.config.starting_capital)
         self.realised_profit = self.budget
 
@@ -37,29 +44,40 @@ class TradingModule:
         self.fee = config.fee / 100
         self.sl_type = config.stoploss_type
         self.sl_perc = float(config.stoploss)
+        self.roi_schedule = RoiSchedule(config.roi)
 
         self.closed_trades = []
-        self.open_trades = []
+        # Open trades in the order they were opened, a pair has at most one open trade
+        self.open_trades_by_pair: Dict[str, Trade] = {}
         timestep_before_start = self.config.backtesting_from - self.config.timeframe_ms
-        self.budget_per_timestamp = {timestep_before_start: self.budget}
-        self.capital_per_timestamp = {timestep_before_start: self.budget}
+        ticks = (self.config.backtesting_to - self.config.backtesting_from) // self.config.timeframe_ms + 2
+        self.equity_curve = EquityCurve(ticks, timestep_before_start, self.budget)
         self.realised_profits_per_timestamp = {timestep_before_start: self.budget}
-        self.total_capital_open_trades = {}
-        self.lowest_total_capital_open_trades = {}
-        self.highest_total_capital_open_trades = {}
+        self.seen_drawdown = DrawdownTracker(timestep_before_start, self.budget)
+        self.realised_drawdown = DrawdownTracker(timestep_before_start, self.budget)
         self.total_fee_paid = 0
         self.rejected_buy_signal = 0
         self.buy_cooldown = {pair: 0 for pair in self.config.pairs}
 
+    @property
+    def open_trades(self) -> List[Trade]:
+        return list(self.open_trades_by_pair.values())
+
     def tick(self, ohlcv: dict) -> None:
+        self.pair_tick(ohlcv)
+        self.update_budget_per_timestamp(ohlcv)
+        self.update_capital_per_timestamp(ohlcv)
+
+    def pair_tick(self, ohlcv: dict) -> None:
+        """
+        Processes a single candle of a single pair, without registering the budget and capital for its timestamp.
+        """
         trade = self.find_open_trade(ohlcv['pair'])
         if trade:
             trade.update_stats(ohlcv)
             self.open_trade_tick(ohlcv, trade)
         else:
             self.no_trade_tick(ohlcv)
-        self.update_budget_per_timestamp(ohlcv)
-        self.update_capital_per_timestamp(ohlcv)
 
     def no_trade_tick(self, ohlcv: dict) -> None:
         try:
@@ -94,8 +112,7 @@ class TradingModule:
 
     def close_trade(self, trade: Trade, reason: SellReason, ohlcv: dict) -> None:
 
-        date = datetime.fromtimestamp(ohlcv['time'] / 1000)
-        trade.close_trade(reason, date)
+        trade.close_trade(reason, ohlcv['time'])
 
         if trade.sell_reason == SellReason.STOPLOSS_AND_ROI:
             # Because trade had no impact on results, remove first issued fee from
@@ -110,7 +127,7 @@ class TradingModule:
             self.total_fee_paid += trade.fee_paid_close
         self.budget += trade.capital
 
-        self.open_trades.remove(trade)
+        del self.open_trades_by_pair[trade.pair]
         self.closed_trades.append(trade)
         self.update_realised_profit(trade)
         self.buy_cooldown[ohlcv['pair']] = self.strategy.buy_cooldown(trade)
@@ -118,7 +135,7 @@ class TradingModule:
     def open_trade(self, ohlcv: dict) -> None:
 
         # Find available trade spaces
-        open_trades = len(self.open_trades)
+        open_trades = len(self.open_trades_by_pair)
         available_spaces = self.max_open_trades - open_trades
         if available_spaces == 0:
             self.rejected_buy_signal += 1
@@ -137,22 +154,21 @@ class TradingModule:
             spend_amount = self.budget
 
         # Create new trade class
-        date = datetime.fromtimestamp(ohlcv['time'] / 1000)
         new_trade = \
-            Trade(ohlcv, spend_amount, self.fee, date, self.sl_type, self.sl_perc, self.budget)
+            Trade(ohlcv, spend_amount, self.fee, ohlcv['time'], self.sl_type, self.sl_perc, self.budget)
         new_trade.configure_stoploss()
         new_trade.update_stats(ohlcv, first=True)
 
         # Update total budget with configured spend amount and fee
         self.total_fee_paid += spend_amount * self.fee
         self.budget -= spend_amount
-        self.open_trades.append(new_trade)
+        self.open_trades_by_pair[new_trade.pair] = new_trade
         self.update_open_trades_value_per_timestamp(new_trade, ohlcv)
 
     def check_roi_open_trade(self, trade: Trade, ohlcv: dict) -> bool:
-        time_passed = datetime.fromtimestamp(ohlcv['time'] / 1000) - trade.opened_at
+        holding_ms = ohlcv['time'] - trade.opened_at_ms
         profit_percentage = ((ohlcv['high'] / trade.open) - 1.) * 100
-        roi_percentage = self.get_roi_over_time(time_passed)
+        roi_percentage = self.roi_schedule.get_roi(holding_ms)
 
         if profit_percentage > roi_percentage:
             trade.current = trade.open * (1 + (roi_percentage / 100))
@@ -160,15 +176,6 @@ class TradingModule:
             return True
         return False
 
-    def get_roi_over_time(self, time_passed: timedelta) -> float:
-        passed_minutes = time_passed.seconds / 60
-        roi = self.config.roi['0']
-
-        for key, value in sorted(self.config.roi.items(), key=lambda item: int(item[0])):
-            if passed_minutes >= int(key):
-                roi = value
-        return roi
-
     @staticmethod
     def check_stoploss_open_trade(trade: Trade, ohlcv: dict) -> bool:
         sl_signal = trade.check_for_sl(ohlcv)
@@ -177,22 +184,18 @@ class TradingModule:
         return False
 
     def find_open_trade(self, pair: str) -> Optional[Trade]:
-        for trade in self.open_trades:
-            if trade.pair == pair:
-                return trade
-        return None
+        return self.open_trades_by_pair.get(pair)
 
     def update_open_trades_value_per_timestamp(self, trade: Trade, ohlcv: dict) -> None:
         """
         Method is used to be able to track the open trades capitals per timestamp.
         It tracks the max seen point and the lowest seen point over all open trades.
         """
-        trade_opened_at = trade.opened_at.timestamp() * 1000
-        if trade_opened_at == ohlcv['time']:
-            self.lowest_total_capital_open_trades[ohlcv['time']] = \
-                self.lowest_total_capital_open_trades.get(ohlcv['time'], 0) + trade.starting_amount
-            self.highest_total_capital_open_trades[ohlcv['time']] = \
-                self.highest_total_capital_open_trades.get(ohlcv['time'], 0) + trade.starting_amount
+        equity_curve = self.equity_curve
+        tick = equity_curve.tick_index(ohlcv['time'])
+        if trade.opened_at_ms == ohlcv['time']:
+            equity_curve.lowest_total_capital_open_trades[tick] += trade.starting_amount
+            equity_curve.highest_total_capital_open_trades[tick] += trade.starting_amount
 
         else:
             # When trade.candle_low is equal to trade.current in final candle, trade.capital could 
@@ -200,25 +203,34 @@ class TradingModule:
             lowest_seen_capital = trade.candle_low * trade.currency_amount
             lowest_seen_capital = lowest_seen_capital if lowest_seen_capital < trade.capital \
                 else trade.capital
-            self.lowest_total_capital_open_trades[ohlcv['time']] = \
-                self.lowest_total_capital_open_trades.get(ohlcv['time'], 0) + lowest_seen_capital
+            equity_curve.lowest_total_capital_open_trades[tick] += lowest_seen_capital
 
-            # Update highest seen capital dict
+            # Update highest seen capital
             high_seen_capital = trade.candle_open * trade.currency_amount
-            self.highest_total_capital_open_trades[ohlcv['time']] = \
-                self.highest_total_capital_open_trades.get(ohlcv['time'], 0) + high_seen_capital
+            equity_curve.highest_total_capital_open_trades[tick] += high_seen_capital
 
-        # Update seen capital dict, on candle close value
-        self.total_capital_open_trades[ohlcv['time']] = \
-            self.total_capital_open_trades.get(ohlcv['time'], 0) + trade.capital
+        # Update seen capital, on candle close value
+        equity_curve.total_capital_open_trades[tick] += trade.capital
 
     def update_budget_per_timestamp(self, ohlcv: dict) -> None:
-        self.budget_per_timestamp[ohlcv['time']] = self.budget
+        tick = self.equity_curve.tick_index(ohlcv['time'])
+        self.equity_curve.budget[tick] = self.budget
 
     def update_capital_per_timestamp(self, ohlcv: dict) -> None:
-        self.capital_per_timestamp[ohlcv['time']] = \
-            self.budget_per_timestamp[ohlcv['time']] + self.total_capital_open_trades.get(ohlcv['time'], 0)
+        tick = self.equity_curve.tick_index(ohlcv['time'])
+        self.equity_curve.capital[tick] = \
+            self.equity_curve.budget[tick] + self.equity_curve.total_capital_open_trades[tick]
+        self.seen_drawdown.update(ohlcv['time'], self.equity_curve.capital[tick])
+
+    def check_pruning(self) -> None:
+        """
+        Lets the hyperopt trial stop the backtest, called once the capital of a tick is final
+        """
+        if self.pruning is not None:
+            self.pruning.check(int(self.equity_curve.last_time), self.equity_curve.capital[self.equity_curve.size - 1],
+                               self.seen_drawdown)
 
     def update_realised_profit(self, trade: Trade) -> None:
         self.realised_profit += trade.profit_currency
-        self.realised_profits_per_timestamp[int(datetime.timestamp(trade.closed_at) * 1000)] = self.realised_profit
+        self.realised_profits_per_timestamp[trade.closed_at_ms] = self.realised_profit
+        self.realised_drawdown.update(trade.closed_at_ms, self.realised_profit)
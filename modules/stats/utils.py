@@ -1,15 +1,15 @@
 from datetime import datetime
 
-from pandas import DataFrame
+from pandas import DataFrame, Series
 
 
-def convert_timestamp_dict_to_dataframe(per_timestamp_dict: dict, resample: bool = False) -> DataFrame:
+def convert_timestamp_series_to_dataframe(per_timestamp: Series, resample: bool = False) -> DataFrame:
     """
-    Converts a dict of capital per timestamps to a dataframe with timestamps as index, and with a daily returns column.
+    Converts a series of capital per timestamps to a dataframe with timestamps as index, and with a daily returns column.
     Standardizes the dataframe used for ratio computation.
     """
 
-    df = DataFrame.from_dict(per_timestamp_dict, columns=['capital'], orient='index')
+    df = DataFrame({'capital': per_timestamp})
 
     if len(df['capital']) > 1:  # Don't run the conversion if the df has only one item
 
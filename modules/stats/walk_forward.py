@@ -0,0 +1,149 @@
+# Libraries
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+# Files
+from backtesting.strategy import Strategy
+from modules.public.pairs_data import PairsData
+from modules.public.trading_stats import MainResults, TradingStats, WalkForwardSummary
+from modules.setup import ConfigModule
+from modules.stats.stats import StatsModule
+from modules.stats.sweep import without_exchange
+from modules.stats.tradingmodule import TradingModule
+
+
+# ======================================================================
+# Walk-forward backtests run the trading simulation on consecutive test
+# windows of one loaded dataset. Every window trades on a view of the
+# signals populated once for the full range, the windows are backtested
+# in parallel and their results aggregated.
+#
+# © 2021 DemaTrading.ai
+# ======================================================================
+
+DAY_MS = 86400000
+
+_worker_strategy = None
+_worker_frames = None
+_worker_df = None
+
+
+@dataclass
+class Window:
+    train_from: int
+    test_from: int
+    test_to: int
+
+    def label(self) -> str:
+        return f"{format_window_date(self.test_from)} - {format_window_date(self.test_to)}"
+
+
+def format_window_date(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp / 1000).strftime('%Y-%m-%d')
+
+
+def plan_windows(backtesting_from: int, backtesting_to: int, train_days: float, test_days: float) -> List[Window]:
+    """
+    :return: Consecutive test windows of test_days, each preceded by train_days of training data. A last window
+    shorter than test_days is left out.
+    """
+    train_ms = int(train_days * DAY_MS)
+    test_ms = int(test_days * DAY_MS)
+    windows = []
+    test_from = backtesting_from + train_ms
+    while test_ms > 0 and test_from + test_ms <= backtesting_to:
+        windows.append(Window(test_from - train_ms, test_from, test_from + test_ms))
+        test_from += test_ms
+    return windows
+
+
+def slice_frame(frame: DataFrame, window_from: int, window_to: int) -> DataFrame:
+    """
+    :return: The rows of a time-indexed frame in [window_from, window_to), as a view where possible
+    """
+    index = frame.index.to_numpy()
+    return frame.iloc[np.searchsorted(index, window_from):np.searchsorted(index, window_to)]
+
+
+def slice_pairs_data(frame_with_signals: PairsData, window_from: int, window_to: int) -> PairsData:
+    return PairsData({pair: slice_frame(pair_frame.frame, window_from, window_to)
+                      for pair, pair_frame in frame_with_signals.items()})
+
+
+def create_window_config(config: ConfigModule, window_from: int, window_to: int) -> ConfigModule:
+    window_config = copy.copy(config)
+    window_config.backtesting_from = window_from
+    window_config.backtesting_to = window_to
+    window_config.backtesting_duration = \
+        datetime.fromtimestamp(window_to / 1000) - datetime.fromtimestamp(window_from / 1000)
+    # The BTC baseline was computed for the full range
+    window_config.btc_marketchange_ratio = None
+    window_config.btc_drawdown_ratio = None
+    return window_config
+
+
+def backtest_window(config: ConfigModule, strategy: Strategy, frames: Dict[str, DataFrame], df: dict,
+                    window_from: int, window_to: int) -> TradingStats:
+    """
+    Runs the trading simulation on [window_from, window_to) of signals populated for a longer range
+    """
+    frame_with_signals = slice_pairs_data(PairsData(frames), window_from, window_to)
+    window_df = {pair: slice_frame(frame, window_from, window_to) for pair, frame in df.items()}
+    window_config = create_window_config(config, window_from, window_to)
+    trading_module = TradingModule(window_config, strategy)
+    return StatsModule(window_config, frame_with_signals, trading_module, window_df).analyze()
+
+
+def run_window(config: ConfigModule, strategy: Strategy, frames: Dict[str, DataFrame], df: dict,
+               window_from: int, window_to: int) -> MainResults:
+    return backtest_window(config, strategy, frames, df, window_from, window_to).main_results
+
+
+def init_worker(strategy: Strategy, frames: Dict[str, DataFrame], df: dict) -> None:
+    global _worker_strategy, _worker_frames, _worker_df
+
+    _worker_strategy = strategy
+    _worker_frames = frames
+    _worker_df = df
+
+
+def run_window_in_worker(job: Tuple[ConfigModule, int, int]) -> MainResults:
+    config, window_from, window_to = job
+    return run_window(config, _worker_strategy, _worker_frames, _worker_df, window_from, window_to)
+
+
+def run_windows(config: ConfigModule, windows: List[Window], strategy: Strategy, frame_with_signals: PairsData,
+                df: dict, workers: int = 1) -> List[MainResults]:
+    """
+    :param frame_with_signals: Signals populated once for the full range
+    :param df: Indicators populated once for the full range
+    :param workers: Maximum amount of worker processes, 1 runs the windows serially
+    :return: Main results of the test part of every window, in the order of windows
+    """
+    frames = frame_with_signals.frames()
+    if workers <= 1 or len(windows) <= 1:
+        return [run_window(config, strategy, frames, df, window.test_from, window.test_to) for window in windows]
+
+    jobs = [(without_exchange(config), window.test_from, window.test_to) for window in windows]
+    with ProcessPoolExecutor(max_workers=min(workers, len(windows)),
+                             initializer=init_worker,
+                             initargs=(strategy, frames, df)) as executor:
+        return list(executor.map(run_window_in_worker, jobs))
+
+
+def summarize_windows(results: List[MainResults]) -> WalkForwardSummary:
+    profit_ratios = [main_results.overall_profit_ratio for main_results in results]
+    return WalkForwardSummary(
+        n_windows=len(results),
+        profitable_windows=sum(1 for ratio in profit_ratios if ratio > 0),
+        compounded_profit_ratio=float(np.prod([1 + ratio for ratio in profit_ratios]) - 1),
+        mean_profit_ratio=float(np.mean(profit_ratios)) if profit_ratios else 0.0,
+        worst_max_seen_drawdown=min((main_results.max_seen_drawdown for main_results in results), default=0.0),
+        n_trades=sum(main_results.n_trades for main_results in results)
+    )
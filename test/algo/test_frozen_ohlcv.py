@@ -0,0 +1,101 @@
+import pytest
+from pandas import DataFrame
+
+# modules.setup has to be imported before modules.algo, the stats fixture takes care of that
+from test.stats.stats_test_utils import StatsFixture
+from test.algo.test_signal_workers import CrossingStrategy
+from test.utils.synthetic_ohlcv import generate_ohlcv, generate_pairs_ohlcv
+from modules.algo.backtesting import BackTesting
+from modules.algo.signal_workers import populate_pair_signals
+from modules.algo.frozen_ohlcv import EDITED_OHLCV_MESSAGE, FrozenOhlcv, freeze_pair_frames, ohlcv_checksum
+
+
+class TamperingStrategy(CrossingStrategy):
+    def generate_indicators(self, dataframe: DataFrame, additional_pairs=None) -> DataFrame:
+        dataframe = super().generate_indicators(dataframe, additional_pairs)
+        dataframe['close'] = dataframe['close'] * 2
+        return dataframe
+
+
+class InPlaceTamperingStrategy(CrossingStrategy):
+    def generate_indicators(self, dataframe: DataFrame, additional_pairs=None) -> DataFrame:
+        dataframe['close'].iloc[0] = 0.
+        return super().generate_indicators(dataframe, additional_pairs)
+
+
+class LocSignalStrategy(CrossingStrategy):
+    def buy_signal(self, dataframe: DataFrame) -> DataFrame:
+        dataframe.loc[dataframe['close'] > dataframe['ema'], 'buy'] = 1
+        return dataframe
+
+    def sell_signal(self, dataframe: DataFrame) -> DataFrame:
+        dataframe.loc[dataframe['close'] < dataframe['ema'], 'sell'] = 1
+        return dataframe
+
+
+def test_frozen_ohlcv_is_read_only_and_split_once():
+    frame = generate_ohlcv('COIN/USDT', n_candles=50, missing_candles=slice(10, 13))
+    ohlcv = FrozenOhlcv(frame)
+
+    assert len(ohlcv.clean) == 47
+    assert len(ohlcv.empty_candles) == 3
+    assert not ohlcv.clean['close'].to_numpy().flags.writeable
+    with pytest.raises(ValueError):
+        ohlcv.frame['close'].to_numpy()[0] = 1.0
+
+    view = ohlcv.view()
+    view['ema'] = view['close'].ewm(span=5).mean()
+    assert 'ema' not in ohlcv.clean.columns
+    assert ohlcv.checksum == ohlcv_checksum(frame)
+
+
+def test_checksum_changes_with_ohlcv():
+    frame = generate_ohlcv('COIN/USDT', n_candles=50)
+    edited = frame.copy()
+    edited.loc[edited.index[5], 'volume'] += 1
+
+    assert ohlcv_checksum(frame) == ohlcv_checksum(frame.copy())
+    assert ohlcv_checksum(frame) != ohlcv_checksum(edited)
+    assert ohlcv_checksum(frame) != ohlcv_checksum(frame.astype({'volume': 'float32'}))
+
+
+def test_trials_share_the_frozen_ohlcv():
+    data = freeze_pair_frames(generate_pairs_ohlcv(n_pairs=2, n_candles=100))
+    config = StatsFixture(list(data.keys())).config
+
+    first = BackTesting(data, config, CrossingStrategy(), {}).start_backtesting()[1]
+    second = BackTesting(data, config, CrossingStrategy(), {}).start_backtesting()[1]
+
+    for pair in data:
+        assert first[pair].frame.equals(second[pair].frame)
+        assert 'ema' not in data[pair].clean.columns
+
+
+def test_editing_ohlcv_in_strategy_is_not_allowed():
+    data = freeze_pair_frames(generate_pairs_ohlcv(n_pairs=1, n_candles=100))
+    config = StatsFixture(list(data.keys())).config
+
+    with pytest.raises(SystemExit):
+        BackTesting(data, config, TamperingStrategy(), {}).start_backtesting()
+
+
+def test_editing_ohlcv_in_place_in_strategy_is_not_allowed(capsys):
+    data = freeze_pair_frames(generate_pairs_ohlcv(n_pairs=1, n_candles=100))
+    config = StatsFixture(list(data.keys())).config
+
+    with pytest.raises(SystemExit):
+        BackTesting(data, config, InPlaceTamperingStrategy(), {}).start_backtesting()
+    assert EDITED_OHLCV_MESSAGE in capsys.readouterr().out
+
+
+def test_strategies_set_signals_in_place():
+    ohlcv = freeze_pair_frames(generate_pairs_ohlcv(n_pairs=1, n_candles=100))['COIN0/USDT']
+    expected = populate_pair_signals(CrossingStrategy(), ohlcv, {})
+
+    for _ in range(2):
+        signals = populate_pair_signals(LocSignalStrategy(), ohlcv, {})
+
+        assert signals['buy'].fillna(0).equals(expected['buy'].fillna(0))
+        assert signals['sell'].fillna(0).equals(expected['sell'].fillna(0))
+    assert (ohlcv.view()[['buy', 'sell']] == 0).all(axis=None)
+    assert ohlcv.checksum == ohlcv_checksum(signals)
@@ -0,0 +1,93 @@
+from optuna.trial import FixedTrial
+from pandas import DataFrame
+
+# modules.setup has to be imported before modules.algo, the stats fixture takes care of that
+from test.stats.stats_test_utils import StatsFixture, TestStrategy
+from test.utils.synthetic_ohlcv import generate_pairs_ohlcv
+from modules.algo.backtesting import BackTesting
+from modules.algo.frozen_ohlcv import freeze_pair_frames
+from modules.algo.hyperopt.hyperopt_strategy import inject_hyperopt_parameters
+from modules.algo.hyperopt.indicator_cache import IndicatorCache
+from modules.public.hyperopt_parameter import integer_parameter, categorical_parameter
+
+
+class ParameterStrategy(TestStrategy):
+    ema_span = integer_parameter(10, low=5, high=20)
+    sell_offset = categorical_parameter(1.0, options=[1.0, 1.01])
+
+    def __init__(self):
+        self.generate_calls = 0
+
+    def generate_indicators(self, dataframe: DataFrame, additional_pairs=None) -> DataFrame:
+        self.generate_calls += 1
+        dataframe['ema'] = dataframe['close'].ewm(span=self.ema_span).mean()
+        return dataframe
+
+    def buy_signal(self, dataframe: DataFrame) -> DataFrame:
+        dataframe['buy'] = (dataframe['close'] > dataframe['ema']).astype(float)
+        return dataframe
+
+    def sell_signal(self, dataframe: DataFrame) -> DataFrame:
+        dataframe['sell'] = (dataframe['close'] * self.sell_offset < dataframe['ema']).astype(float)
+        return dataframe
+
+
+def populate(strategy: ParameterStrategy, params: dict, indicator_cache: IndicatorCache = None):
+    data = generate_pairs_ohlcv(n_pairs=2, n_candles=100)
+    fixture = StatsFixture(list(data.keys()))
+    strategy.trial = FixedTrial(params)
+
+    return BackTesting(freeze_pair_frames(data), fixture.config, strategy, {}, indicator_cache).start_backtesting()[1]
+
+
+def assert_same_signals(expected, actual):
+    for pair in expected:
+        assert expected[pair].frame.equals(actual[pair].frame)
+
+
+def test_indicators_are_reused_when_indicator_parameters_match():
+    strategy = ParameterStrategy()
+    inject_hyperopt_parameters(strategy)
+    cache = IndicatorCache(memory_budget_mb=64)
+
+    populate(strategy, {'ema_span': 8, 'sell_offset': 1.0}, cache)
+    assert strategy.generate_calls == 2
+
+    cached = populate(strategy, {'ema_span': 8, 'sell_offset': 1.01}, cache)
+    assert strategy.generate_calls == 2
+    assert cache.hits == 2
+    assert_same_signals(populate(ParameterStrategy(), {'ema_span': 8, 'sell_offset': 1.01}), cached)
+
+    populate(strategy, {'ema_span': 12, 'sell_offset': 1.01}, cache)
+    assert strategy.generate_calls == 4
+    assert cache.misses == 4
+
+    assert cache.read_parameters == {'COIN0/USDT': {('ema_span',)}, 'COIN1/USDT': {('ema_span',)}}
+    assert cache.signal_parameters == {'sell_offset'}
+
+
+def test_least_recently_used_indicators_are_evicted():
+    strategy = ParameterStrategy()
+    inject_hyperopt_parameters(strategy)
+    cache = IndicatorCache(memory_budget_mb=64)
+    populate(strategy, {'ema_span': 8, 'sell_offset': 1.0}, cache)
+
+    # Room for exactly the two frames of one trial
+    cache.memory_budget = cache.memory_usage
+    populate(strategy, {'ema_span': 12, 'sell_offset': 1.0}, cache)
+    assert len(cache.frames) == 2
+    assert cache.memory_usage <= cache.memory_budget
+
+    populate(strategy, {'ema_span': 8, 'sell_offset': 1.0}, cache)
+    assert strategy.generate_calls == 6
+
+
+def test_disabled_cache_generates_every_trial():
+    strategy = ParameterStrategy()
+    inject_hyperopt_parameters(strategy)
+    cache = IndicatorCache(memory_budget_mb=0)
+
+    populate(strategy, {'ema_span': 8, 'sell_offset': 1.0}, cache)
+    populate(strategy, {'ema_span': 8, 'sell_offset': 1.0}, cache)
+    assert strategy.generate_calls == 4
+    assert len(cache.frames) == 0
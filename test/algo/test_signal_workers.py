@@ -0,0 +1,45 @@
+from pandas import DataFrame
+
+# modules.setup has to be imported before modules.algo, the stats fixture takes care of that
+from test.stats.stats_test_utils import StatsFixture, TestStrategy
+from test.utils.synthetic_ohlcv import generate_pairs_ohlcv
+from modules.algo.backtesting import BackTesting
+from modules.algo.frozen_ohlcv import freeze_pair_frames
+
+
+class CrossingStrategy(TestStrategy):
+    def generate_indicators(self, dataframe: DataFrame, additional_pairs=None) -> DataFrame:
+        dataframe['ema'] = dataframe['close'].ewm(span=10).mean()
+        return dataframe
+
+    def buy_signal(self, dataframe: DataFrame) -> DataFrame:
+        dataframe['buy'] = (dataframe['close'] > dataframe['ema']).astype(float)
+        return dataframe
+
+    def sell_signal(self, dataframe: DataFrame) -> DataFrame:
+        dataframe['sell'] = (dataframe['close'] < dataframe['ema']).astype(float)
+        return dataframe
+
+    def stoploss(self, dataframe: DataFrame) -> DataFrame:
+        dataframe['stoploss'] = dataframe['ema'] * 0.95 / dataframe['close']
+        return dataframe
+
+
+def populate(signal_workers: int, stoploss_type: str = "static"):
+    data = generate_pairs_ohlcv(n_pairs=3, n_candles=200)
+    fixture = StatsFixture(list(data.keys()))
+    fixture.config.signal_workers = signal_workers
+    fixture.config.stoploss_type = stoploss_type
+
+    return BackTesting(freeze_pair_frames(data), fixture.config, CrossingStrategy(), {}).start_backtesting()
+
+
+def test_signal_workers_match_serial_population():
+    for stoploss_type in ["static", "dynamic"]:
+        serial_df, serial_signals = populate(1, stoploss_type)
+        parallel_df, parallel_signals = populate(2, stoploss_type)
+
+        assert list(serial_signals.keys()) == list(parallel_signals.keys())
+        for pair in serial_signals:
+            assert serial_signals[pair].frame.equals(parallel_signals[pair].frame)
+            assert serial_df[pair].equals(parallel_df[pair])
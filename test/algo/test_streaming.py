@@ -0,0 +1,66 @@
+import numpy as np
+from pandas import DataFrame
+
+# modules.setup has to be imported before modules.algo, the stats fixture takes care of that
+from test.stats.stats_test_utils import TestStrategy
+from test.utils.synthetic_ohlcv import generate_ohlcv
+from modules.algo.frozen_ohlcv import FrozenOhlcv
+from modules.algo.signal_workers import populate_pair_signals
+from modules.algo.streaming import StreamingSignals
+
+
+class RollingStrategy(TestStrategy):
+    warmup_candles = 19
+
+    def generate_indicators(self, dataframe: DataFrame, additional_pairs=None) -> DataFrame:
+        dataframe['sma'] = dataframe['close'].rolling(20).mean()
+        dataframe['high_10'] = dataframe['high'].rolling(10).max()
+        return dataframe
+
+    def buy_signal(self, dataframe: DataFrame) -> DataFrame:
+        dataframe['buy'] = (dataframe['close'] > dataframe['sma']).astype(float)
+        return dataframe
+
+    def sell_signal(self, dataframe: DataFrame) -> DataFrame:
+        dataframe['sell'] = (dataframe['close'] >= dataframe['high_10']).astype(float)
+        return dataframe
+
+
+class ShortWarmupStrategy(RollingStrategy):
+    warmup_candles = 5
+
+
+def stream(strategy: TestStrategy, n_history: int = 100):
+    ohlcv = generate_ohlcv('COIN/USDT', 160, missing_candles=slice(120, 123))
+    streaming = StreamingSignals(strategy, ohlcv.iloc[:n_history])
+    for candle in ohlcv.iloc[n_history:].to_dict('records'):
+        streaming.append(candle)
+    return ohlcv, streaming
+
+
+def test_streamed_signals_match_batch_signals():
+    ohlcv, streaming = stream(RollingStrategy())
+    batch = populate_pair_signals(RollingStrategy(), FrozenOhlcv(ohlcv), {})
+
+    signals = streaming.signals
+    assert list(signals.index) == list(batch.index)
+    for column in batch.columns:
+        expected, actual = batch[column].to_numpy(), signals[column].to_numpy()
+        if expected.dtype.kind == 'f':
+            assert np.allclose(expected, actual, equal_nan=True), column
+        else:
+            assert list(expected) == list(actual), column
+    assert np.isnan(signals.loc[ohlcv.index[121], 'sma'])
+    assert streaming.check_against_batch()
+
+
+def test_streaming_starts_before_warmup_is_complete():
+    ohlcv, streaming = stream(RollingStrategy(), n_history=3)
+
+    assert streaming.check_against_batch()
+
+
+def test_too_short_warmup_is_detected():
+    _, streaming = stream(ShortWarmupStrategy())
+
+    assert not streaming.check_against_batch()
@@ -0,0 +1,209 @@
+"""
+Times the stages of the backtest pipeline on synthetic OHLCV and stores the timings as JSON, so engine versions can be
+compared offline:
+
+    python -m test.benchmarks.pipeline --pairs 10 --candles 20000 --output new.json
+    python -m test.benchmarks.pipeline --compare old.json new.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from pandas import DataFrame
+
+# modules.setup has to be imported before modules.algo, the stats fixture takes care of that
+from test.stats.stats_test_utils import TestStrategy
+from modules.algo.backtesting import BackTesting
+from modules.algo.frozen_ohlcv import freeze_pair_frames
+from modules.output import OutputModule
+from modules.setup.config import ConfigModule, create_config_from_dict
+from modules.setup.datastore import OhlcvDatastore
+from modules.stats.stats import StatsModule
+from modules.stats.tradingmodule import TradingModule
+from test.utils.signal_frame import THIRTY_MIN
+from test.utils.synthetic_ohlcv import START_TIMESTAMP, generate_pairs_ohlcv
+from utils.utils import CURRENT_VERSION
+
+STAGES = ['data_load', 'populate_signals', 'tick_loop', 'backtesting_result', 'output']
+TIMEFRAME = '30m'
+
+
+class CrossingStrategy(TestStrategy):
+    def generate_indicators(self, dataframe: DataFrame, additional_pairs=None) -> DataFrame:
+        dataframe['ema_fast'] = dataframe['close'].ewm(span=12).mean()
+        dataframe['ema_slow'] = dataframe['close'].ewm(span=48).mean()
+        return dataframe
+
+    def buy_signal(self, dataframe: DataFrame) -> DataFrame:
+        crossed = (dataframe['ema_fast'] > dataframe['ema_slow']) & \
+                  (dataframe['ema_fast'].shift() <= dataframe['ema_slow'].shift())
+        dataframe['buy'] = crossed.astype(float)
+        return dataframe
+
+    def sell_signal(self, dataframe: DataFrame) -> DataFrame:
+        crossed = (dataframe['ema_fast'] < dataframe['ema_slow']) & \
+                  (dataframe['ema_fast'].shift() >= dataframe['ema_slow'].shift())
+        dataframe['sell'] = crossed.astype(float)
+        return dataframe
+
+
+def create_benchmark_config(pairs: List[str], n_candles: int, tick_engine: str) -> ConfigModule:
+    backtesting_to = datetime.utcfromtimestamp((START_TIMESTAMP + (n_candles + 48) * THIRTY_MIN) / 1000)
+    config = create_config_from_dict({
+        "exchange": "binance",
+        "timeframe": TIMEFRAME,
+        "max-open-trades": 5,
+        "exposure-per-trade": 100.,
+        "starting-capital": 1000.,
+        "backtesting-from": "2020-01-01",
+        "backtesting-to": backtesting_to.strftime('%Y-%m-%d'),
+        "backtesting-till-now": False,
+        "stoploss-type": "trailing",
+        "stoploss": -5,
+        "roi": {"0": 10, "240": 5, "1440": 2},
+        "pairs": [pair.replace("/USDT", "") for pair in pairs],
+        "randomize-pair-order": False,
+        "tick-engine": tick_engine,
+        "currency": "USDT",
+        "fee": 0.25,
+        "strategy-name": "CrossingStrategy",
+        "strategies-folder": "resources/setup/strategies",
+        "disable-plots": True,
+        "tearsheet": False,
+        "export-result": False,
+        "mainplot_indicators": ["ema5", "ema21"],
+        "subplot_indicators": [["volume"]]
+    }, False)
+    return config
+
+
+@contextlib.contextmanager
+def timed(timings: Dict[str, float], stage: str):
+    start = time.perf_counter()
+    yield
+    timings[stage] = time.perf_counter() - start
+
+
+def run_pipeline(datastore: OhlcvDatastore, config: ConfigModule, pairs: List[str], n_candles: int,
+                 output_directory: str) -> Dict[str, float]:
+    """
+    :return: Seconds spent in every stage of STAGES
+    """
+    timings = {}
+    data_to = START_TIMESTAMP + n_candles * THIRTY_MIN
+
+    with timed(timings, 'data_load'):
+        data = {pair: datastore.read(pair, TIMEFRAME, START_TIMESTAMP, data_to) for pair in pairs}
+
+    with timed(timings, 'populate_signals'):
+        strategy = CrossingStrategy()
+        df, frame_with_signals = BackTesting(freeze_pair_frames(data), config, strategy, {}).start_backtesting()
+
+    stats_module = StatsModule(config, frame_with_signals, TradingModule(config, strategy), df)
+    with timed(timings, 'tick_loop'):
+        stats_module.run_ticks(list(pairs))
+
+    with timed(timings, 'backtesting_result'):
+        stats = stats_module.generate_results(list(frame_with_signals.keys()))
+
+    # The output writes the trade log relative to the working directory and prints its tables
+    working_directory = os.getcwd()
+    os.chdir(output_directory)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), timed(timings, 'output'):
+            OutputModule(config).output(stats, config.strategy_definition)
+    finally:
+        os.chdir(working_directory)
+
+    return timings
+
+
+def run_benchmark(n_pairs: int, n_candles: int, repeat: int = 3, tick_engine: str = 'event') -> dict:
+    """
+    Runs the pipeline repeat times on the same synthetic OHLCV
+    :return: Benchmark report, see summarize_timings
+    """
+    ohlcv = generate_pairs_ohlcv(n_pairs, n_candles)
+    pairs = list(ohlcv.keys())
+    config = create_benchmark_config(pairs, n_candles, tick_engine)
+
+    with tempfile.TemporaryDirectory() as directory:
+        datastore = OhlcvDatastore(os.path.join(directory, 'datastore'))
+        for pair, frame in ohlcv.items():
+            datastore.write(pair, TIMEFRAME, frame, START_TIMESTAMP, START_TIMESTAMP + n_candles * THIRTY_MIN)
+        output_directory = os.path.join(directory, 'output')
+        os.makedirs(os.path.join(output_directory, 'data', 'backtesting-data'))
+
+        runs = [run_pipeline(datastore, config, pairs, n_candles, output_directory) for _ in range(repeat)]
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'engine_version': CURRENT_VERSION,
+        'python': platform.python_version(),
+        'tick_engine': tick_engine,
+        'pairs': n_pairs,
+        'candles': n_candles,
+        'repeat': repeat,
+        'stages': summarize_timings(runs)
+    }
+
+
+def summarize_timings(runs: List[Dict[str, float]]) -> Dict[str, dict]:
+    return {stage: {'min': min(run[stage] for run in runs),
+                    'median': statistics.median(run[stage] for run in runs),
+                    'runs': [run[stage] for run in runs]}
+            for stage in STAGES}
+
+
+def compare_reports(baseline: dict, current: dict) -> Dict[str, float]:
+    """
+    :return: Ratio of the current over the baseline minimum time per stage, below 1 is faster
+    """
+    return {stage: current['stages'][stage]['min'] / baseline['stages'][stage]['min']
+            for stage in STAGES if stage in baseline['stages'] and stage in current['stages']}
+
+
+def print_report(report: dict) -> None:
+    print(f"{report['pairs']} pairs x {report['candles']} candles, tick engine '{report['tick_engine']}', "
+          f"best of {report['repeat']}")
+    for stage in STAGES:
+        print(f"  {stage:<20}{report['stages'][stage]['min'] * 1000:>12.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the backtest pipeline on synthetic OHLCV")
+    parser.add_argument('--pairs', type=int, default=10)
+    parser.add_argument('--candles', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--tick-engine', default='event', choices=['event', 'columnar', 'dict'])
+    parser.add_argument('--output', help="JSON file the report is written to")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help="Compare two stored reports instead of running the benchmark")
+    args = parser.parse_args()
+
+    if args.compare:
+        reports = []
+        for path in args.compare:
+            with open(path, encoding='utf-8') as f:
+                reports.append(json.load(f))
+        for stage, ratio in compare_reports(*reports).items():
+            print(f"  {stage:<20}{ratio:>8.2f}x")
+        return
+
+    report = run_benchmark(args.pairs, args.candles, args.repeat, args.tick_engine)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
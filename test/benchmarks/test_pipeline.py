@@ -0,0 +1,17 @@
+import json
+
+from test.benchmarks.pipeline import STAGES, compare_reports, run_benchmark
+
+
+def test_benchmark_times_every_stage(tmp_path):
+    report = run_benchmark(n_pairs=2, n_candles=500, repeat=2)
+
+    assert list(report['stages'].keys()) == STAGES
+    for timing in report['stages'].values():
+        assert len(timing['runs']) == 2
+        assert 0 < timing['min'] <= timing['median']
+
+    path = tmp_path / 'report.json'
+    path.write_text(json.dumps(report))
+    stored = json.loads(path.read_text())
+    assert compare_reports(stored, stored) == {stage: 1.0 for stage in STAGES}
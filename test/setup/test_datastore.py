@@ -0,0 +1,85 @@
+import os
+
+from modules.setup.datastore import OhlcvDatastore, merge_ranges, months_between, read_fragment
+from test.utils.synthetic_ohlcv import generate_ohlcv
+
+HOUR = 3600000
+# 2021-01-31 00:00 UTC
+START = 1612051200000
+
+
+def stored_files(directory: str) -> list:
+    return sorted(os.path.relpath(os.path.join(root, filename), directory)
+                  for root, _, filenames in os.walk(directory) for filename in filenames)
+
+
+def test_write_and_read_partitions_by_month(tmp_path):
+    datastore = OhlcvDatastore(str(tmp_path))
+    df = generate_ohlcv('COIN/USDT', n_candles=48, timestep=HOUR, start=START, missing_candles=slice(2, 4))
+    datastore.write('COIN/USDT', '1h', df, START, START + 48 * HOUR)
+
+    assert stored_files(str(tmp_path)) == ['COINUSDT/1h/2021-01/1612051200000-1612134000000.feather',
+                                           'COINUSDT/1h/2021-02/1612137600000-1612220400000.feather',
+                                           'index.json']
+
+    read = datastore.read('COIN/USDT', '1h', START + HOUR, START + 30 * HOUR)
+    expected = df.loc[START + HOUR:START + 29 * HOUR].dropna()
+    assert read.index.tolist() == expected.index.tolist()
+    assert read['close'].tolist() == expected['close'].tolist()
+    assert read['pair'].unique().tolist() == ['COIN/USDT']
+
+    reopened = OhlcvDatastore(str(tmp_path))
+    assert reopened.covered_ranges('COIN/USDT', '1h') == [(START, START + 48 * HOUR)]
+
+
+def test_extending_appends_only_new_candles(tmp_path):
+    datastore = OhlcvDatastore(str(tmp_path))
+    df = generate_ohlcv('COIN/USDT', n_candles=72, timestep=HOUR, start=START)
+    datastore.write('COIN/USDT', '1h', df.iloc[:48], START, START + 48 * HOUR)
+    files_before = stored_files(str(tmp_path))
+
+    assert datastore.missing_ranges('COIN/USDT', '1h', START, START + 72 * HOUR) == \
+           [(START + 48 * HOUR, START + 72 * HOUR)]
+
+    # Overlaps the stored candles, only the last day is written
+    datastore.write('COIN/USDT', '1h', df, START, START + 72 * HOUR)
+    new_files = sorted(set(stored_files(str(tmp_path))) - set(files_before))
+    assert new_files == ['COINUSDT/1h/2021-02/1612224000000-1612306800000.feather']
+
+    read = datastore.read('COIN/USDT', '1h', START, START + 72 * HOUR)
+    assert read['close'].tolist() == df['close'].tolist()
+    assert datastore.missing_ranges('COIN/USDT', '1h', START, START + 72 * HOUR) == []
+
+
+def test_months_are_compacted(tmp_path, monkeypatch):
+    monkeypatch.setattr('modules.setup.datastore.MAX_FRAGMENTS_PER_MONTH', 2)
+    datastore = OhlcvDatastore(str(tmp_path))
+    df = generate_ohlcv('COIN/USDT', n_candles=4, timestep=HOUR, start=START)
+    for tick in range(4):
+        datastore.write('COIN/USDT', '1h', df.iloc[tick:tick + 1], START + tick * HOUR, START + (tick + 1) * HOUR)
+
+    assert len(datastore.fragment_paths('COIN/USDT', '1h', '2021-01')) <= 2
+    assert datastore.read('COIN/USDT', '1h', START, START + 4 * HOUR)['close'].tolist() == df['close'].tolist()
+
+
+def test_read_pushes_down_range_and_columns(tmp_path):
+    datastore = OhlcvDatastore(str(tmp_path))
+    df = generate_ohlcv('COIN/USDT', n_candles=48, timestep=HOUR, start=START)
+    datastore.write('COIN/USDT', '1h', df, START, START + 48 * HOUR)
+
+    read = datastore.read('COIN/USDT', '1h', START + 10 * HOUR, START + 12 * HOUR, columns=['close'])
+    assert read.columns.tolist() == ['time', 'close']
+    assert read.index.tolist() == [START + 10 * HOUR, START + 11 * HOUR]
+    assert read['close'].tolist() == df['close'].iloc[10:12].tolist()
+
+    # The February fragment is skipped by its filename, without opening it
+    fragment = datastore.fragment_paths('COIN/USDT', '1h', '2021-02')[0]
+    assert read_fragment(fragment, ['time', 'close'], START, START + HOUR) is None
+    assert datastore.read('COIN/USDT', '1h', START - 2 * HOUR, START, columns=['close']).empty
+
+
+def test_ranges_and_months():
+    assert merge_ranges([(5, 8), (0, 2), (2, 4), (7, 10)]) == [(0, 4), (5, 10)]
+    assert months_between(START, START + 2 * HOUR) == ['2021-01']
+    assert months_between(START, START + 24 * HOUR) == ['2021-01']
+    assert months_between(START, START + 24 * HOUR + 1) == ['2021-01', '2021-02']
@@ -0,0 +1,75 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from modules.setup.datamodule import DataModule
+from modules.setup.datastore import OhlcvDatastore
+from modules.setup.downloader import OhlcvDownloader, TokenBucket, plan_slices
+from test.utils.fake_exchange import FakeExchange
+from test.utils.synthetic_ohlcv import generate_ohlcv
+
+os.environ["VERBOSITY"] = "quiet"
+
+HOUR = 3600000
+# 2021-01-31 00:00 UTC
+START = 1612051200000
+N_CANDLES = 50
+
+
+def create_data_module(tmp_path, exchange: FakeExchange) -> DataModule:
+    data_module = DataModule(online=True)
+    data_module.exchange = exchange
+    data_module.datastore = OhlcvDatastore(str(tmp_path))
+    data_module.downloader = OhlcvDownloader(exchange, max_concurrency=1, max_retries=2, backoff=0,
+                                             token_bucket=TokenBucket(None, 1), fetch_limit=10)
+    data_module.config = SimpleNamespace(exchange_name=str(tmp_path), backtesting_from=START,
+                                         backtesting_to=START + N_CANDLES * HOUR)
+    return data_module
+
+
+def test_plan_slices():
+    assert plan_slices(START, START + 25 * HOUR, HOUR, limit=10) == \
+           [(START, 10), (START + 10 * HOUR, 10), (START + 20 * HOUR, 5)]
+
+
+def test_token_bucket_queues_requests_beyond_capacity():
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+    assert TokenBucket(None, 1).reserve() == 0
+
+
+def test_failed_requests_are_retried():
+    frames = {'COIN/USDT': generate_ohlcv('COIN/USDT', N_CANDLES, timestep=HOUR, start=START)}
+    exchange = FakeExchange(frames, HOUR, failures_per_request=2)
+    downloader = OhlcvDownloader(exchange, max_retries=2, backoff=0, token_bucket=TokenBucket(None, 1))
+
+    slices = plan_slices(START, START + N_CANDLES * HOUR, HOUR, limit=10)
+    candles = asyncio.run(downloader.download('COIN/USDT', '1h', slices))
+
+    assert [candle[0] for candle in candles] == frames['COIN/USDT']['time'].tolist()
+    assert all(attempts == 3 for attempts in exchange.attempts.values())
+
+
+def test_interrupted_download_resumes_from_checkpoints(tmp_path):
+    frames = {'COIN/USDT': generate_ohlcv('COIN/USDT', N_CANDLES, timestep=HOUR, start=START,
+                                          missing_candles=slice(3, 5))}
+
+    exchange = FakeExchange(frames, HOUR, fail_from=START + 30 * HOUR)
+    with pytest.raises(SystemExit):
+        asyncio.run(create_data_module(tmp_path, exchange).get_pair_data('COIN/USDT', '1h'))
+
+    datastore = OhlcvDatastore(str(tmp_path))
+    assert datastore.covered_ranges('COIN/USDT', '1h') == [(START, START + 30 * HOUR)]
+
+    exchange = FakeExchange(frames, HOUR)
+    pair, df = asyncio.run(create_data_module(tmp_path, exchange).get_pair_data('COIN/USDT', '1h'))
+
+    assert exchange.requests == [START + 30 * HOUR, START + 40 * HOUR]
+    assert df.index.tolist() == frames['COIN/USDT'].index.tolist()
+    assert df['close'].equals(frames['COIN/USDT']['close'])
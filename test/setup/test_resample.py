@@ -0,0 +1,65 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+from modules.setup.datamodule import DataModule
+from modules.setup.datastore import OhlcvDatastore
+from modules.setup.resample import resample_ohlcv, find_source_timeframe
+from test.utils.synthetic_ohlcv import generate_ohlcv
+
+os.environ["VERBOSITY"] = "quiet"
+
+MINUTE = 60000
+HOUR = 60 * MINUTE
+# 2021-01-31 00:00 UTC
+START = 1612051200000
+
+
+def test_resample_aggregates_ohlcv():
+    df = generate_ohlcv('COIN/USDT', n_candles=12, timestep=MINUTE, start=START).iloc[1:].dropna()
+    df = df.drop(df.index[[4, 5, 6]])  # Candles 5 to 7 are missing
+
+    resampled = resample_ohlcv(df, 'COIN/USDT', 5 * MINUTE)
+
+    assert resampled.index.tolist() == [START, START + 5 * MINUTE, START + 10 * MINUTE]
+    first = df.iloc[0:4]
+    assert resampled['open'].iloc[0] == first['open'].iloc[0]
+    assert resampled['high'].iloc[0] == first['high'].max()
+    assert resampled['low'].iloc[0] == first['low'].min()
+    assert resampled['close'].iloc[0] == first['close'].iloc[-1]
+    assert np.isclose(resampled['volume'].iloc[0], first['volume'].sum())
+
+    second = df.loc[START + 5 * MINUTE:START + 9 * MINUTE]
+    assert len(second) == 2
+    assert resampled['open'].iloc[1] == second['open'].iloc[0]
+    assert resampled['close'].iloc[1] == second['close'].iloc[-1]
+    assert resampled['pair'].unique().tolist() == ['COIN/USDT']
+
+
+def test_source_timeframe_is_largest_covering_divisor():
+    stored = {'1m': MINUTE, '15m': 15 * MINUTE, '40m': 40 * MINUTE, '1h': HOUR}
+
+    assert find_source_timeframe(stored, HOUR, lambda timeframe: True) == ('15m', 15 * MINUTE)
+    assert find_source_timeframe(stored, HOUR, lambda timeframe: timeframe == '1m') == ('1m', MINUTE)
+    assert find_source_timeframe(stored, HOUR, lambda timeframe: False) is None
+
+
+def test_data_module_resamples_stored_lower_timeframe(tmp_path):
+    datastore = OhlcvDatastore(str(tmp_path))
+    hourly = generate_ohlcv('COIN/USDT', n_candles=48, timestep=HOUR, start=START, missing_candles=slice(8, 12))
+    datastore.write('COIN/USDT', '1h', hourly, START, START + 48 * HOUR)
+
+    data_module = DataModule(online=False)
+    data_module.datastore = datastore
+    data_module.config = SimpleNamespace(exchange_name=str(tmp_path), backtesting_from=START,
+                                         backtesting_to=START + 48 * HOUR)
+
+    pair, df = asyncio.run(data_module.get_pair_data('COIN/USDT', '4h'))
+
+    assert df.index.tolist() == list(range(START, START + 48 * HOUR, 4 * HOUR))
+    # Candles 8 to 11 make up the third 4h candle
+    assert df['close'].isnull().tolist() == [False, False, True] + [False] * 9
+    assert df['close'].iloc[0] == hourly['close'].iloc[3]
+    assert datastore.covered_ranges('COIN/USDT', '4h') == [(START, START + 48 * HOUR)]
@@ -4,6 +4,7 @@ import pytz
 from pandas import DataFrame
 
 from backtesting.strategy import Strategy
+from modules.public.pairs_data import PairsData
 from modules.setup.config import create_config_from_dict
 from modules.stats.stats import StatsModule
 from modules.stats.trade import Trade, SellReason
@@ -66,14 +67,14 @@ class StatsFixture:
                    self.frame_with_signals.items()}
 
         trading_module = TradingModule(self.config, TestStrategy())
-        return StatsModule(self.config, self.frame_with_signals, trading_module, pair_df)
+        return StatsModule(self.config, PairsData.from_dicts(self.frame_with_signals), trading_module, pair_df)
 
     def create_with_strategy(self, strategy: Strategy):
         pair_df = {k: DataFrame.from_dict(v, orient='index', columns=OHLCV_INDICATORS) for k, v in
                    self.frame_with_signals.items()}
 
         trading_module = TradingModule(self.config, strategy)
-        return StatsModule(self.config, self.frame_with_signals, trading_module, pair_df)
+        return StatsModule(self.config, PairsData.from_dicts(self.frame_with_signals), trading_module, pair_df)
 
 
 class TestStrategy(Strategy):
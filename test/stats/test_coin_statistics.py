@@ -0,0 +1,54 @@
+from test.stats.stats_test_utils import StatsFixture
+from modules.public.pairs_data import PairsData
+from modules.stats.drawdown.drawdown import get_max_drawdown_ratio, get_max_drawdown_ratio_without_buy_rows
+from modules.stats.metrics.coin_statistics import calculate_statistics_per_pair
+from modules.stats.metrics.profit_ratio import get_realised_profit_ratio, get_seen_cum_profit_ratio
+from modules.stats.metrics.winning_weeks import get_market_ratios, get_outperforming_timeframe, \
+    get_profitable_timeframe
+from test.utils.signal_frame import SIX_HOURS
+from utils.dict import group_by
+
+PAIRS = ['COIN/USDT', 'COIN2/USDT']
+
+
+def backtest():
+    fixture = StatsFixture(PAIRS)
+    for _ in range(20):
+        fixture.frame_with_signals['COIN/USDT'].test_scenario_down_10_up_100_down_75_three_trades(timestep=SIX_HOURS)
+        fixture.frame_with_signals['COIN2/USDT'].test_scenario_up_100_down_20_down_75_three_trades(timestep=SIX_HOURS)
+    stats_module = fixture.create()
+    stats_module.run_ticks(list(PAIRS))
+    return stats_module
+
+
+def test_coin_statistics_match_separate_metrics():
+    stats_module = backtest()
+    frame_with_signals = stats_module.frame_with_signals
+    market_ratio_df = get_market_ratios(frame_with_signals)
+    trades_per_pair = group_by(stats_module.trading_module.closed_trades, "pair")
+
+    statistics = calculate_statistics_per_pair(frame_with_signals.frames(), trades_per_pair, market_ratio_df, 1.)
+
+    for pair in PAIRS:
+        seen = get_seen_cum_profit_ratio(frame_with_signals[pair], trades_per_pair[pair], 1.)
+        realised = get_realised_profit_ratio(frame_with_signals[pair], trades_per_pair[pair], 1.)
+        assert statistics[pair]["max_seen_ratio"] == get_max_drawdown_ratio(seen) - 1
+        assert statistics[pair]["max_realised_ratio"] == get_max_drawdown_ratio_without_buy_rows(realised)
+        for timeframe, name in [("W", "weeks"), ("M", "months")]:
+            assert (statistics[pair][f"prof_{name}_win"], statistics[pair][f"prof_{name}_draw"],
+                    statistics[pair][f"prof_{name}_loss"]) == get_profitable_timeframe(seen, timeframe)
+            assert (statistics[pair][f"perf_{name}_win"], statistics[pair][f"perf_{name}_draw"],
+                    statistics[pair][f"perf_{name}_loss"]) == \
+                get_outperforming_timeframe(seen, market_ratio_df[pair], timeframe)
+
+
+def test_coin_statistics_in_process_pool():
+    stats_module = backtest()
+    frames = stats_module.frame_with_signals.frames()
+    market_ratio_df = get_market_ratios(PairsData(frames))
+    trades_per_pair = group_by(stats_module.trading_module.closed_trades, "pair")
+
+    serial = calculate_statistics_per_pair(frames, trades_per_pair, market_ratio_df, 1.)
+    parallel = calculate_statistics_per_pair(frames, trades_per_pair, market_ratio_df, 1., workers=2)
+
+    assert parallel == serial
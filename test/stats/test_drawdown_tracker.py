@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+import numpy as np
+
+from test.stats.test_tick_engine import create_fixture
+from modules.stats.drawdown.tracker import DrawdownTracker
+
+HOUR_MS = 3600000
+
+
+def track(values: list) -> DrawdownTracker:
+    times = np.arange(len(values), dtype=np.int64) * HOUR_MS
+    tracker = DrawdownTracker(0, values[0])
+    tracker.update_many(times[1:], np.array(values[1:], dtype=np.float64))
+    return tracker.finish()
+
+
+def test_max_drawdown_from_peak_to_bottom_and_recovery():
+    tracker = track([100, 110, 110, 99, 88, 100, 110, 120, 90])
+
+    assert np.isclose(tracker.max_drawdown, -0.25)
+    assert tracker.max_drawdown_info()['from'] == 7 * HOUR_MS
+    assert tracker.max_drawdown_info()['at'] == 8 * HOUR_MS
+    assert tracker.max_drawdown_info()['to'] == 0
+
+
+def test_recovery_of_max_drawdown():
+    tracker = track([100, 110, 88, 99, 110, 105])
+
+    assert tracker.max_drawdown_info() == {"drawdown": 0.8 - 1, "from": HOUR_MS, "at": 2 * HOUR_MS,
+                                           "to": 4 * HOUR_MS}
+
+
+def test_value_for_the_same_timestamp_replaces_previous():
+    tracker = DrawdownTracker(0, 100)
+    tracker.update(HOUR_MS, 50)
+    tracker.update(HOUR_MS, 100)
+    tracker.update(2 * HOUR_MS, 90)
+    tracker.finish()
+
+    assert np.isclose(tracker.max_drawdown, -0.1)
+
+
+def test_missing_values_are_skipped():
+    tracker = track([100, np.nan, 90, np.nan, 100])
+
+    assert np.isclose(tracker.max_drawdown, -0.1)
+    assert tracker.longest_drawdown_info() == {'longest_drawdown': timedelta(hours=4), 'is_ongoing': False}
+
+
+def test_longest_drawdown_only_counts_time_below_the_peak():
+    tracker = track([100, 100, 100, 101, 102, 90, 101, 102, 110, 110])
+
+    assert tracker.longest_drawdown_info() == {'longest_drawdown': timedelta(hours=3), 'is_ongoing': False}
+
+
+def test_ongoing_longest_drawdown():
+    tracker = track([100, 90, 100, 99, 98, 97])
+
+    assert tracker.current_drawdown_ms == 3 * HOUR_MS
+    assert tracker.longest_drawdown_info() == {'longest_drawdown': timedelta(hours=3), 'is_ongoing': True}
+
+
+def test_no_drawdown():
+    tracker = track([100, 100, 110])
+
+    assert tracker.max_drawdown == 0
+    assert tracker.longest_drawdown_info() == {'longest_drawdown': timedelta(0), 'is_ongoing': False}
+
+
+def test_trading_module_feeds_capital_of_every_tick():
+    for engine in ["dict", "columnar", "event"]:
+        stats_module = create_fixture(engine).create()
+        stats = stats_module.analyze()
+
+        capital = stats.equity_curve.values('capital')
+        drawdown = capital / np.fmax.accumulate(capital)
+        assert np.isclose(stats_module.trading_module.seen_drawdown.max_drawdown, np.nanmin(drawdown) - 1)
+        assert stats.main_results.max_seen_drawdown == stats_module.trading_module.seen_drawdown.max_drawdown
@@ -467,3 +467,22 @@ def test_longest_drawdown_trend_up():
 
     # Assert
     assert stats.main_results.longest_seen_drawdown['is_ongoing'] is False
+
+
+def test_seen_drawdown_skips_missing_candles():
+    """Given a missing candle during a trade, 'seen drawdown' should be computed from the other candles"""
+    # Arrange
+    fixture = StatsFixture(['COIN/USDT'])
+    nan = float('nan')
+
+    pair = fixture.frame_with_signals['COIN/USDT']
+    pair.add_entry(open=2, high=2, low=2, close=2, buy=1, sell=0, timestep=DAILY)
+    pair.add_entry(open=nan, high=nan, low=nan, close=nan, volume=nan, buy=0, sell=0, timestep=DAILY)
+    pair.add_entry(open=2, high=2, low=1, close=1, buy=0, sell=1, timestep=DAILY)
+
+    # Act
+    stats = fixture.create().analyze()
+
+    # Assert
+    assert math.isclose(stats.main_results.max_seen_drawdown, -0.51, abs_tol=0.01)
+    assert date(stats.main_results.drawdown_at) == create_test_date(year=2020, month=1, day=3)
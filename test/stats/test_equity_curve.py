@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from test.stats.stats_test_utils import StatsFixture
+from modules.stats.equity_curve import EquityCurve
+
+
+def test_ticks_share_one_time_axis_and_grow():
+    equity_curve = EquityCurve(2, time_before_start=0, starting_capital=100)
+
+    for time in [10, 10, 20, 30]:
+        tick = equity_curve.tick_index(time)
+        equity_curve.total_capital_open_trades[tick] += 5
+        equity_curve.budget[tick] = 50
+
+    assert equity_curve.times.tolist() == [0, 10, 20, 30]
+    assert equity_curve.values('total_capital_open_trades').tolist() == [0, 10, 5, 5]
+    assert equity_curve.values('budget').tolist() == [100, 50, 50, 50]
+
+    series = equity_curve.series('budget')
+    assert series.index.tolist() == [0, 10, 20, 30]
+    assert np.shares_memory(series.to_numpy(), equity_curve.budget)
+
+
+def test_deprecated_capital_per_timestamp():
+    fixture = StatsFixture(['COIN/USDT'])
+    fixture.frame_with_signals['COIN/USDT'].test_scenario_up_50_one_trade()
+    stats = fixture.create().analyze()
+
+    with pytest.warns(DeprecationWarning):
+        capital_per_timestamp = stats.capital_per_timestamp
+
+    assert list(capital_per_timestamp.keys()) == stats.equity_curve.times.tolist()
+    assert list(capital_per_timestamp.values()) == stats.equity_curve.values('capital').tolist()
@@ -0,0 +1,91 @@
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from test.stats.stats_test_utils import StatsFixture
+from modules.output.results import show_monte_carlo_results
+from modules.setup.config import create_sweep_config
+from modules.stats.monte_carlo import PERCENTILES, get_percentiles, get_trade_returns, resample_trades, \
+    run_monte_carlo, summarize_simulations
+from modules.stats.tick_engine import SignalArrays
+from test.utils.signal_frame import DAILY
+
+PAIRS = ['COIN/USDT', 'COIN2/USDT']
+
+
+def create_monte_carlo(resample_trades: bool = False):
+    fixture = StatsFixture(PAIRS)
+    for _ in range(10):
+        fixture.frame_with_signals['COIN/USDT'].test_scenario_up_100_one_trade(timestep=DAILY)
+        fixture.frame_with_signals['COIN2/USDT'].test_scenario_down_50_one_trade(timestep=DAILY)
+
+    # One trade at a time, so the pair order decides which pair is traded
+    fixture.config = create_sweep_config(fixture.config, {"max-open-trades": 1})
+    fixture.config.monte_carlo_resample_trades = resample_trades
+    stats_module = fixture.create()
+    signal_arrays = SignalArrays.from_pairs_data(stats_module.frame_with_signals, PAIRS)
+    return fixture.config, stats_module.trading_module.strategy, signal_arrays
+
+
+def test_simulations_are_reproducible_per_seed():
+    config, strategy, signal_arrays = create_monte_carlo()
+
+    simulations = run_monte_carlo(config, strategy, signal_arrays, runs=20, seed=7)
+
+    assert [simulation.seed for simulation in simulations] == list(range(7, 27))
+    assert run_monte_carlo(config, strategy, signal_arrays, runs=20, seed=7) == simulations
+    assert len({simulation.profit_ratio for simulation in simulations}) > 1
+    assert all(simulation.resampled_profit_ratio is None for simulation in simulations)
+
+
+def test_simulations_leave_the_global_random_state_alone():
+    config, strategy, signal_arrays = create_monte_carlo()
+    random.seed(3)
+    state = random.getstate()
+
+    run_monte_carlo(config, strategy, signal_arrays, runs=3)
+
+    assert random.getstate() == state
+
+
+def test_monte_carlo_in_process_pool():
+    config, strategy, signal_arrays = create_monte_carlo(resample_trades=True)
+
+    serial = run_monte_carlo(config, strategy, signal_arrays, runs=8)
+    parallel = run_monte_carlo(config, strategy, signal_arrays, runs=8, workers=2)
+
+    assert parallel == serial
+
+
+def test_summarize_simulations():
+    config, strategy, signal_arrays = create_monte_carlo(resample_trades=True)
+    simulations = run_monte_carlo(config, strategy, signal_arrays, runs=20)
+
+    summary = summarize_simulations(simulations)
+
+    profits = [simulation.profit_ratio for simulation in simulations]
+    assert summary.n_runs == 20
+    assert summary.percentiles == PERCENTILES
+    assert summary.profit_ratio == list(np.percentile(profits, PERCENTILES))
+    assert summary.profit_ratio == sorted(summary.profit_ratio)
+    assert summary.resampled_profit_ratio is not None
+    assert all(drawdown <= 0 for drawdown in summary.resampled_max_drawdown)
+    show_monte_carlo_results(summary, "MyStrategy")
+
+
+def test_resample_trades():
+    # Every trade earns 10% of the realised capital before it closes
+    trades = [SimpleNamespace(closed_at_ms=2, profit_currency=11.), SimpleNamespace(closed_at_ms=1, profit_currency=10.)]
+
+    assert list(get_trade_returns(trades, 100.)) == [0.1, 0.1]
+    profit_ratio, max_drawdown = resample_trades(trades, 100., np.random.default_rng(0))
+    assert profit_ratio == pytest.approx(0.21)
+    assert max_drawdown == 0.0
+    assert resample_trades([], 100., np.random.default_rng(0)) == (0.0, 0.0)
+
+
+def test_get_percentiles_ignores_missing_values():
+    assert get_percentiles([None, 1., 3.]) == list(np.percentile([1., 3.], PERCENTILES))
+    assert all(np.isnan(get_percentiles([None, None])))
@@ -133,3 +133,45 @@ def test_open_trades_opened_at_timestep_three():
 
     # Assert
     assert stats.open_trade_results[0].opened_at == create_test_date(year=2020, month=1, day=3)
+
+
+def test_open_trades_are_indexed_by_pair():
+    """Given left open trades on several pairs, they should be found by pair in the order they were opened"""
+    # Arrange
+    fixture = StatsFixture(['COIN/USDT', 'COIN2/USDT', 'COIN3/USDT'])
+    fixture.config.max_open_trades = 3
+
+    fixture.frame_with_signals['COIN/USDT'].test_scenario_up_100_one_trade_no_sell()
+    fixture.frame_with_signals['COIN2/USDT'].test_scenario_down_50_one_trade_no_sell()
+    fixture.frame_with_signals['COIN3/USDT'].test_scenario_up_100_one_trade()
+
+    # Act
+    stats_module = fixture.create()
+    stats_module.analyze()
+    trading_module = stats_module.trading_module
+
+    # Assert
+    assert [trade.pair for trade in trading_module.open_trades] == ['COIN/USDT', 'COIN2/USDT']
+    assert trading_module.find_open_trade('COIN2/USDT').pair == 'COIN2/USDT'
+    assert trading_module.find_open_trade('COIN3/USDT') is None
+    assert not hasattr(trading_module.open_trades[0], '__dict__')
+    assert trading_module.open_trades[0].to_dict()['pair'] == 'COIN/USDT'
+
+
+def test_open_trades_track_epoch_ms():
+    """Given a left open trade, it should track epoch ms and report opened_at as datetime"""
+    # Arrange
+    fixture = StatsFixture(['COIN/USDT'])
+
+    fixture.frame_with_signals['COIN/USDT'].test_scenario_up_100_one_trade_no_sell()
+
+    # Act
+    stats_module = fixture.create()
+    stats_module.analyze()
+    trade = stats_module.trading_module.open_trades[0]
+
+    # Assert
+    assert trade.opened_at_ms == int(create_test_date(year=2020, month=1, day=1).timestamp() * 1000)
+    assert trade.closed_at_ms is None
+    assert trade.to_dict()['opened_at'] == create_test_date(year=2020, month=1, day=1)
+    assert 'opened_at_ms' not in trade.to_dict()
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas import Series
+
+from modules.stats.metrics.periods import get_period_change, get_period_ids
+
+HOUR_MS = 3600000
+
+
+def resample_change(time: np.ndarray, values: np.ndarray, timeframe: str) -> np.ndarray:
+    index = pd.to_datetime(time, unit='ms', utc=True).tz_convert(None) \
+        + pd.to_timedelta([get_offset_ms(moment) for moment in time], unit='ms')
+    ohlc = Series(values, index=index).resample(timeframe, origin='start').ohlc()
+    return (ohlc['close'] / ohlc['open']).to_numpy()
+
+
+def get_offset_ms(moment: int) -> int:
+    local = pd.Timestamp.fromtimestamp(moment / 1000)
+    return int((local - pd.Timestamp(moment, unit='ms')).total_seconds() * 1000)
+
+
+@pytest.mark.parametrize("timeframe", ["W", "M"])
+def test_period_change_matches_resample_over_dst(timeframe):
+    # Hourly candles from January up to and including the DST changes of March and October
+    time = np.arange(1609459200000, 1609459200000 + 300 * 24 * HOUR_MS, 5 * HOUR_MS, dtype=np.int64)
+    values = np.cumprod(np.full(len(time), 1.001))
+
+    change = get_period_change(values, get_period_ids(time, timeframe))
+
+    np.testing.assert_array_equal(change, resample_change(time, values, timeframe))
+
+
+def test_period_change_skips_missing_values_and_empty_periods():
+    # Friday up to Sunday of the first week, Saturday and Sunday four weeks later
+    time = np.array([0, 1, 2, 29, 30], dtype=np.int64) * 24 * HOUR_MS + 1609459200000
+    values = np.array([1., np.nan, 2., 4., 6.])
+
+    change = get_period_change(values, get_period_ids(time, "W"))
+
+    np.testing.assert_array_equal(change, resample_change(time, values, "W"))
+    assert change[0] == 2.
+    assert np.isnan(change[1:-1]).all()
+    assert change[-1] == 1.5
+
+
+def test_unsupported_timeframe():
+    with pytest.raises(ValueError):
+        get_period_ids(np.array([0], dtype=np.int64), "D")
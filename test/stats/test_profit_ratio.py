@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+import numpy as np
+from pandas import DataFrame
+
+from modules.public.pairs_data import PairsData
+from modules.stats.metrics.profit_ratio import get_in_trade_mask, get_seen_cum_profit_ratio
+from modules.stats.trade import SellReason
+
+HOUR = 3600000
+
+
+def test_in_trade_mask_covers_rows_after_open_until_close():
+    mask = get_in_trade_mask(10, np.array([1, 5, 8]), np.array([3, 6, 9]))
+
+    assert mask.tolist() == [False, False, True, True, False, False, True, False, False, True]
+
+
+def test_seen_profit_ratio_per_row():
+    close = [10., 11., 12., np.nan, 9., 10., 8.]
+    index = [HOUR * i for i in range(1, len(close) + 1)]
+    frame = DataFrame({'close': close, 'buy': 0.}, index=index)
+    trades = [SimpleNamespace(opened_at_ms=index[0], closed_at_ms=index[2], sell_reason=SellReason.SELL_SIGNAL,
+                              close=12.),
+              SimpleNamespace(opened_at_ms=index[3], closed_at_ms=index[5], sell_reason=SellReason.ROI, close=9.5)]
+
+    df = get_seen_cum_profit_ratio(PairsData({'COIN/USDT': frame})['COIN/USDT'], trades, fee_percentage=1)
+
+    fee = 0.99
+    # The first row is a copy of the initial candle, the missing candle is forward filled
+    expected = [1., fee, 11 / 10, 12 / 11 * fee, fee, 9 / 12, 9.5 / 9 * fee, 1.]
+    assert df.index.tolist() == [0] + index
+    assert np.allclose(df['profit_ratio'].to_numpy(), expected)
+    assert np.allclose(df['value'].to_numpy(), np.cumprod(expected))
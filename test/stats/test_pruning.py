@@ -0,0 +1,86 @@
+import optuna
+import pytest
+from optuna.pruners import MedianPruner, NopPruner, SuccessiveHalvingPruner
+from optuna.trial import TrialState
+
+from test.stats.stats_test_utils import StatsFixture
+from modules.stats.pruning import TrialPruning, create_pruner
+from modules.stats.tradingmodule import TradingModule
+from test.utils.signal_frame import THIRTY_MIN
+
+CYCLES = 8
+
+
+def create_fixture(engine: str, winning: bool, checkpoints: int = 4, pruner: str = "median",
+                   max_drawdown: float = 0) -> StatsFixture:
+    fixture = StatsFixture(['COIN/USDT'])
+    for _ in range(CYCLES):
+        if winning:
+            fixture.frame_with_signals['COIN/USDT'].test_scenario_up_50_one_trade()
+        else:
+            fixture.frame_with_signals['COIN/USDT'].test_scenario_down_50_one_trade()
+
+    fixture.config.tick_engine = engine
+    fixture.config.backtesting_to = fixture.config.backtesting_from + 2 * CYCLES * THIRTY_MIN
+    fixture.config.hyperopt_pruner = pruner
+    fixture.config.hyperopt_checkpoints = checkpoints
+    fixture.config.hyperopt_pruning_metric = "profit"
+    fixture.config.hyperopt_max_drawdown = max_drawdown
+    return fixture
+
+
+def run_trial(study: optuna.Study, fixture: StatsFixture) -> optuna.trial.FrozenTrial:
+    trial = study.ask()
+    stats_module = fixture.create()
+    stats_module.trading_module = TradingModule(fixture.config, stats_module.trading_module.strategy,
+                                                TrialPruning.create(trial, fixture.config))
+    try:
+        stats = stats_module.analyze()
+        study.tell(trial, -stats.main_results.overall_profit_ratio)
+    except optuna.TrialPruned:
+        study.tell(trial, state=TrialState.PRUNED)
+    return study.trials[-1]
+
+
+@pytest.mark.parametrize("engine", ["dict", "columnar", "event"])
+def test_trial_reports_every_checkpoint(engine):
+    study = optuna.create_study(pruner=NopPruner())
+
+    trial = run_trial(study, create_fixture(engine, winning=True))
+
+    assert trial.state == TrialState.COMPLETE
+    assert list(trial.intermediate_values) == [1, 2, 3]
+    assert trial.intermediate_values[3] < trial.intermediate_values[1] < 0
+
+
+@pytest.mark.parametrize("engine", ["dict", "columnar", "event"])
+def test_median_pruner_stops_losing_trial(engine):
+    study = optuna.create_study(pruner=MedianPruner(n_startup_trials=1))
+    run_trial(study, create_fixture(engine, winning=True))
+
+    trial = run_trial(study, create_fixture(engine, winning=False))
+
+    assert trial.state == TrialState.PRUNED
+    assert list(trial.intermediate_values) == [1]
+
+
+def test_max_drawdown_stops_trial_without_pruner():
+    study = optuna.create_study()
+    fixture = create_fixture("event", winning=False, pruner="none", max_drawdown=60)
+
+    trial = run_trial(study, fixture)
+
+    assert trial.state == TrialState.PRUNED
+    assert trial.user_attrs["pruned_at"] < fixture.config.backtesting_from + 2 * CYCLES * THIRTY_MIN // 4
+
+
+def test_pruning_disabled():
+    fixture = create_fixture("event", winning=False, pruner="none")
+
+    assert TrialPruning.create(optuna.create_study().ask(), fixture.config) is None
+
+
+def test_create_pruner():
+    fixture = create_fixture("event", winning=True, pruner="successive-halving")
+
+    assert isinstance(create_pruner(fixture.config), SuccessiveHalvingPruner)
@@ -1,6 +1,10 @@
 from datetime import timedelta
 
+import numpy as np
+
 from test.stats.stats_test_utils import StatsFixture
+from modules.stats.roi_schedule import RoiSchedule
+from modules.stats.trade import SellReason
 
 
 def test_roi():
@@ -144,3 +148,37 @@ def test_both_roi_stoploss():
 
     # assert
     assert stats.main_results.end_capital == 100
+
+
+def test_roi_after_more_than_a_day():
+    """Given 'an ROI step after two days', a trade open for two days should sell at that ROI"""
+    # Arrange
+    fixture = StatsFixture(['COIN/USDT'])
+
+    fixture.frame_with_signals['COIN/USDT'] \
+        .add_entry(open=1, high=1, low=1, close=1, buy=1, sell=0) \
+        .add_entry(open=1, high=1.05, low=1, close=1, buy=0, sell=0) \
+        .add_entry(open=1, high=1.5, low=1, close=1, buy=0, sell=0) \
+        .add_entry(open=1, high=1, low=1, close=1, buy=0, sell=0)
+
+    fixture.config.roi = {
+        "0": 200,
+        "2880": 10
+    }
+
+    # Act
+    stats = fixture.create().analyze()
+
+    # Assert
+    assert stats.trades[0].sell_reason == SellReason.ROI
+    assert stats.trades[0].close == 1.1
+
+
+def test_roi_schedule_lookup():
+    """Given 'an unsorted ROI table', lookups should use the last passed breakpoint, also in batch"""
+    roi_schedule = RoiSchedule({"60": 5, "0": 10, "1440": 1})
+    minute = 60000
+    holding_ms = [0, 59 * minute, 60 * minute, 1439 * minute, 1440 * minute, 3 * 1440 * minute]
+
+    assert [roi_schedule.get_roi(holding) for holding in holding_ms] == [10, 10, 5, 5, 1, 1]
+    assert roi_schedule.get_roi_many(np.array(holding_ms)).tolist() == [10, 10, 5, 5, 1, 1]
@@ -0,0 +1,49 @@
+from test.stats.stats_test_utils import StatsFixture
+from modules.output.results import show_sweep_results
+from modules.setup.config import create_sweep_config
+from modules.stats.sweep import run_sweep
+from test.utils.signal_frame import DAILY
+
+SWEEP = [{}, {"stoploss": -10}, {"max-open-trades": 1, "exposure-per-trade": 50}, {"roi": {"0": 20}}]
+
+
+def create_fixture() -> StatsFixture:
+    fixture = StatsFixture(['COIN/USDT', 'COIN2/USDT'])
+    fixture.frame_with_signals['COIN/USDT'].test_scenario_down_10_up_100_down_75_three_trades(timestep=DAILY)
+    fixture.frame_with_signals['COIN2/USDT'].test_scenario_down_10_up_100_down_75_three_trades(timestep=DAILY)
+    return fixture
+
+
+def backtest(settings: dict):
+    fixture = create_fixture()
+    config = create_sweep_config(fixture.config, settings)
+    fixture.config = config
+    return fixture.create().analyze().main_results
+
+
+def test_sweep_matches_separate_backtests():
+    fixture = create_fixture()
+    stats_module = fixture.create()
+    configs = [create_sweep_config(fixture.config, settings) for settings in SWEEP]
+
+    results = run_sweep(configs, stats_module.trading_module.strategy, stats_module.frame_with_signals,
+                        stats_module.df)
+
+    assert results == [backtest(settings) for settings in SWEEP]
+    assert results[2].max_open_trades == 1
+    assert results[2].exposure_per_trade == 0.5
+    assert results[0] != results[1]
+    show_sweep_results(SWEEP, results, "$")
+
+
+def test_sweep_in_process_pool():
+    fixture = create_fixture()
+    stats_module = fixture.create()
+    configs = [create_sweep_config(fixture.config, settings) for settings in SWEEP]
+
+    serial = run_sweep(configs, stats_module.trading_module.strategy, stats_module.frame_with_signals,
+                       stats_module.df)
+    parallel = run_sweep(configs, stats_module.trading_module.strategy, stats_module.frame_with_signals,
+                         stats_module.df, workers=2)
+
+    assert parallel == serial
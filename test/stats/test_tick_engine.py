@@ -0,0 +1,125 @@
+import random
+
+import numpy as np
+
+from test.stats.stats_test_utils import StatsFixture, CooldownStrategy, TestStrategy
+from modules.stats.tick_engine import ColumnarTickEngine, EventTickEngine, SignalArrays
+from modules.stats.tradingmodule import TradingModule
+from test.utils.signal_frame import TradeAction
+from test.utils.synthetic_ohlcv import generate_pairs_ohlcv
+
+PAIRS = ['COIN/USDT', 'COIN2/USDT', 'COIN3/USDT', 'COIN4/USDT']
+
+
+def create_fixture(engine: str, stoploss_type: str = "static") -> StatsFixture:
+    fixture = StatsFixture(PAIRS)
+    fixture.config.tick_engine = engine
+    fixture.config.stoploss_type = stoploss_type
+    fixture.config.stoploss = -20
+    fixture.config.max_open_trades = 2
+    fixture.config.roi = {"0": 60, "2880": 10}
+
+    fixture.frame_with_signals['COIN/USDT'].generate_trades(days=3)
+    fixture.frame_with_signals['COIN2/USDT'] \
+        .multiply_price(1, TradeAction.BUY) \
+        .multiply_price(2) \
+        .multiply_price(0.9) \
+        .multiply_price(0.7) \
+        .multiply_price(1, TradeAction.BUY) \
+        .multiply_price(1.1, TradeAction.SELL) \
+        .multiply_price(1) \
+        .multiply_price(1, TradeAction.BUY) \
+        .multiply_price(0.5)
+    for pair in PAIRS[2:]:
+        fixture.frame_with_signals[pair].test_scenario_down_10_up_100_down_75_three_trades(timestep=86400000)
+        fixture.frame_with_signals[pair].test_scenario_up_100_one_trade(timestep=86400000)
+        fixture.frame_with_signals[pair].multiply_price(1, TradeAction.BUY)
+
+    for pair in PAIRS:
+        for entry in fixture.frame_with_signals[pair].values():
+            entry['stoploss'] = 0.85
+    return fixture
+
+
+def assert_same_backtest(dict_stats, columnar_stats):
+    assert len(dict_stats.trades) == len(columnar_stats.trades)
+    for dict_trade, columnar_trade in zip(dict_stats.trades, columnar_stats.trades):
+        assert dict_trade.to_dict() == columnar_trade.to_dict()
+    assert np.array_equal(dict_stats.equity_curve.times, columnar_stats.equity_curve.times)
+    assert np.array_equal(dict_stats.equity_curve.values('capital'), columnar_stats.equity_curve.values('capital'))
+    assert dict_stats.main_results == columnar_stats.main_results
+
+
+def test_columnar_engine_matches_dict_engine():
+    for stoploss_type in ["static", "trailing", "dynamic"]:
+        dict_stats = create_fixture("dict", stoploss_type).create().analyze()
+        columnar_stats = create_fixture("columnar", stoploss_type).create().analyze()
+
+        assert_same_backtest(dict_stats, columnar_stats)
+
+
+def test_columnar_engine_matches_dict_engine_with_cooldown():
+    dict_stats = create_fixture("dict").create_with_strategy(CooldownStrategy()).analyze()
+    columnar_stats = create_fixture("columnar").create_with_strategy(CooldownStrategy()).analyze()
+
+    assert_same_backtest(dict_stats, columnar_stats)
+
+
+def test_columnar_engine_matches_dict_engine_with_random_pair_order():
+    dict_fixture = create_fixture("dict")
+    dict_fixture.config.randomize_pair_order = True
+    columnar_fixture = create_fixture("columnar")
+    columnar_fixture.config.randomize_pair_order = True
+
+    random.seed(7)
+    dict_stats = dict_fixture.create().analyze()
+    random.seed(7)
+    columnar_stats = columnar_fixture.create().analyze()
+
+    assert_same_backtest(dict_stats, columnar_stats)
+
+
+def test_event_engine_matches_dict_engine():
+    for stoploss_type in ["static", "trailing", "dynamic"]:
+        dict_stats = create_fixture("dict", stoploss_type).create().analyze()
+        event_stats = create_fixture("event", stoploss_type).create().analyze()
+
+        assert_same_backtest(dict_stats, event_stats)
+
+    dict_stats = create_fixture("dict").create_with_strategy(CooldownStrategy()).analyze()
+    event_stats = create_fixture("event").create_with_strategy(CooldownStrategy()).analyze()
+    assert_same_backtest(dict_stats, event_stats)
+
+
+def run_synthetic_backtest(engine, stoploss_type: str, strategy) -> TradingModule:
+    frames = generate_pairs_ohlcv(n_pairs=5, n_candles=2000, seed=3)
+    rng = np.random.default_rng(11)
+    for frame in frames.values():
+        frame['buy'] = ((rng.random(len(frame)) < 0.01) & frame['close'].notna()).astype(float)
+        frame['sell'] = (rng.random(len(frame)) < 0.002).astype(float)
+        frame['stoploss'] = 0.97
+
+    fixture = StatsFixture([pair for pair in frames])
+    fixture.config.stoploss_type = stoploss_type
+    fixture.config.stoploss = -3
+    fixture.config.roi = {"0": 8, "600": 4, "3000": 1}
+    trading_module = TradingModule(fixture.config, strategy)
+    engine(trading_module, SignalArrays.from_frames(frames, list(frames))).run(list(frames))
+    return trading_module
+
+
+def test_event_engine_matches_columnar_engine_on_synthetic_data():
+    for stoploss_type in ["static", "trailing", "dynamic"]:
+        for strategy in [TestStrategy(), CooldownStrategy()]:
+            columnar = run_synthetic_backtest(ColumnarTickEngine, stoploss_type, strategy)
+            event = run_synthetic_backtest(EventTickEngine, stoploss_type, strategy)
+
+            assert len(columnar.closed_trades) > 50
+            assert [trade.to_dict() for trade in columnar.closed_trades + columnar.open_trades] == \
+                   [trade.to_dict() for trade in event.closed_trades + event.open_trades]
+            for column in ['time', 'budget', 'capital', 'lowest_total_capital_open_trades',
+                           'highest_total_capital_open_trades']:
+                columnar_values = columnar.equity_curve.times if column == 'time' \
+                    else columnar.equity_curve.values(column)
+                event_values = event.equity_curve.times if column == 'time' else event.equity_curve.values(column)
+                assert np.array_equal(columnar_values, event_values, equal_nan=True)
@@ -0,0 +1,84 @@
+import pytest
+
+from test.stats.stats_test_utils import StatsFixture, create_test_timestamp
+from modules.output.results import show_walk_forward_results
+from modules.stats.walk_forward import Window, create_window_config, plan_windows, run_windows, summarize_windows
+from test.utils.signal_frame import DAILY
+
+PAIRS = ['COIN/USDT', 'COIN2/USDT']
+START = create_test_timestamp(year=2020, month=1, day=1)
+
+
+def create_fixture() -> StatsFixture:
+    fixture = StatsFixture(PAIRS)
+    for pair in PAIRS:
+        for _ in range(4):
+            fixture.frame_with_signals[pair].test_scenario_down_10_up_100_down_75_three_trades(timestep=DAILY)
+    return fixture
+
+
+def backtest(window: Window):
+    fixture = create_fixture()
+    for pair in PAIRS:
+        candles = fixture.frame_with_signals[pair]
+        for time in list(candles.keys()):
+            if not window.test_from <= time < window.test_to:
+                del candles[time]
+    fixture.config = create_window_config(fixture.config, window.test_from, window.test_to)
+    return fixture.create().analyze().main_results
+
+
+def test_plan_windows():
+    windows = plan_windows(START, START + 24 * DAILY, 6, 6)
+
+    assert windows == [Window(START, START + 6 * DAILY, START + 12 * DAILY),
+                       Window(START + 6 * DAILY, START + 12 * DAILY, START + 18 * DAILY),
+                       Window(START + 12 * DAILY, START + 18 * DAILY, START + 24 * DAILY)]
+    assert windows[0].label() == "2020-01-07 - 2020-01-13"
+    assert len(plan_windows(START, START + 23 * DAILY, 6, 6)) == 2
+    assert plan_windows(START, START + 5 * DAILY, 0, 6) == []
+    assert plan_windows(START, START + 24 * DAILY, 6, 0) == []
+
+
+def test_walk_forward_matches_separate_backtests():
+    fixture = create_fixture()
+    stats_module = fixture.create()
+    windows = plan_windows(START, START + 24 * DAILY, 6, 6)
+
+    results = run_windows(fixture.config, windows, stats_module.trading_module.strategy,
+                          stats_module.frame_with_signals, stats_module.df)
+
+    assert results == [backtest(window) for window in windows]
+    assert all(main_results.n_trades > 0 for main_results in results)
+    show_walk_forward_results([window.label() for window in windows], results, summarize_windows(results), "$")
+
+
+def test_walk_forward_in_process_pool():
+    fixture = create_fixture()
+    stats_module = fixture.create()
+    windows = plan_windows(START, START + 24 * DAILY, 6, 6)
+
+    serial = run_windows(fixture.config, windows, stats_module.trading_module.strategy,
+                         stats_module.frame_with_signals, stats_module.df)
+    parallel = run_windows(fixture.config, windows, stats_module.trading_module.strategy,
+                           stats_module.frame_with_signals, stats_module.df, workers=2)
+
+    assert parallel == serial
+
+
+def test_summarize_windows():
+    fixture = create_fixture()
+    stats_module = fixture.create()
+    windows = plan_windows(START, START + 24 * DAILY, 6, 6)
+    results = run_windows(fixture.config, windows, stats_module.trading_module.strategy,
+                          stats_module.frame_with_signals, stats_module.df)
+
+    summary = summarize_windows(results)
+
+    assert summary.n_windows == 3
+    assert summary.n_trades == sum(main_results.n_trades for main_results in results)
+    assert summary.worst_max_seen_drawdown == min(main_results.max_seen_drawdown for main_results in results)
+    expected_compounded = 1.
+    for main_results in results:
+        expected_compounded *= 1 + main_results.overall_profit_ratio
+    assert summary.compounded_profit_ratio == pytest.approx(expected_compounded - 1)
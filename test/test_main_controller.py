@@ -0,0 +1,87 @@
+import asyncio
+import copy
+import os
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from multiprocessing import Process
+
+import optuna
+from optuna import Trial
+from optuna.pruners import NopPruner
+
+from test.stats.stats_test_utils import StatsFixture, TestStrategy
+import main_controller
+from main_controller import MainController, count_finished_trials, get_study_name, load_or_create_study, optimize_shared_study, \
+    optimize_study
+
+optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+
+def objective(trial: Trial) -> float:
+    trial.set_user_attr("pid", os.getpid())
+    time.sleep(0.1)
+    return (trial.suggest_float("x", -10, 10) - 2) ** 2
+
+
+def run_worker(study_name: str, storage_url: str, n_trials: int) -> None:
+    optimize_shared_study(study_name, storage_url, objective, n_trials, NopPruner())
+
+
+def run_study(storage_url: str, n_trials: int, n_jobs: int) -> optuna.Study:
+    study = load_or_create_study("study", storage_url, NopPruner())
+    workers = [Process(target=run_worker, args=("study", storage_url, n_trials)) for _ in range(n_jobs - 1)]
+    optimize_study(study, objective, n_trials, workers)
+    return study
+
+
+def test_parallel_study_stops_at_n_trials_and_resumes(tmp_path):
+    storage_url = f"sqlite:///{tmp_path}/study.db"
+
+    study = run_study(storage_url, n_trials=8, n_jobs=2)
+    trials = study.get_trials(deepcopy=False)
+    assert 8 <= count_finished_trials(study) <= 9
+    assert all(trial.state == optuna.trial.TrialState.COMPLETE for trial in trials)
+    assert len({trial.user_attrs["pid"] for trial in trials}) == 2
+    finished_trials = count_finished_trials(study)
+
+    # Resuming with the same amount of trials runs nothing, raising it only runs the remaining trials
+    assert count_finished_trials(run_study(storage_url, n_trials=8, n_jobs=2)) == finished_trials
+    resumed = run_study(storage_url, n_trials=finished_trials + 4, n_jobs=2)
+    assert finished_trials + 4 <= count_finished_trials(resumed) <= finished_trials + 5
+
+
+def test_study_name_depends_on_setup():
+    config = StatsFixture(['COIN/USDT']).config
+    strategy = TestStrategy()
+    name = get_study_name(config, strategy)
+
+    same_config = copy.copy(config)
+    same_config.raw_config = {**config.raw_config, "n-jobs": 4}
+    other_timerange = copy.copy(config)
+    other_timerange.backtesting_to += 86400000
+    other_pairs = copy.copy(config)
+    other_pairs.raw_config = {**config.raw_config, "pairs": ["COIN2"]}
+
+    assert name.startswith(config.strategy_name)
+    assert get_study_name(same_config, strategy) == name
+    assert get_study_name(other_timerange, strategy) != name
+    assert get_study_name(other_pairs, strategy) != name
+
+
+def test_worker_loads_data_offline(tmp_path, monkeypatch):
+    storage_url = f"sqlite:///{tmp_path}/study.db"
+    load_or_create_study("study", storage_url, NopPruner())
+    opened = []
+
+    @asynccontextmanager
+    async def create_backtest_runner(args, online):
+        opened.append(online)
+        config = SimpleNamespace(hyperopt_pruner="none")
+        yield SimpleNamespace(config=config, run_hyperopt_iteration=objective)
+
+    monkeypatch.setattr(main_controller, "create_backtest_runner", create_backtest_runner)
+    asyncio.run(MainController.optimize_in_worker(None, "study", storage_url, n_trials=2))
+
+    assert opened == [False]
+    assert count_finished_trials(load_or_create_study("study", storage_url, NopPruner())) == 2
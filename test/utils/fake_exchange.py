@@ -0,0 +1,35 @@
+from typing import Dict, List, Optional
+
+import ccxt.async_support as ccxt
+from pandas import DataFrame
+
+
+class FakeExchange:
+    """
+    Serves fetch_ohlcv from local candle frames, FI: from test.utils.synthetic_ohlcv. Requests can be made to fail a
+    number of times (retryable network errors) or always, to simulate an interrupted download.
+    """
+    id = 'fake'
+    rateLimit = 0
+
+    def __init__(self, frames: Dict[str, DataFrame], timeframe_ms: int, failures_per_request: int = 0,
+                 fail_from: Optional[int] = None):
+        self.frames = frames
+        self.timeframe_ms = timeframe_ms
+        self.failures_per_request = failures_per_request
+        self.fail_from = fail_from
+        self.attempts: Dict[int, int] = {}
+        self.requests: List[int] = []
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str, since: int, limit: int) -> List[list]:
+        self.attempts[since] = self.attempts.get(since, 0) + 1
+        if self.fail_from is not None and since >= self.fail_from:
+            raise ccxt.ExchangeNotAvailable("fake exchange is down")
+        if self.attempts[since] <= self.failures_per_request:
+            raise ccxt.RequestTimeout("fake timeout")
+
+        self.requests.append(since)
+        frame = self.frames[symbol].dropna()
+        frame = frame.loc[(frame['time'] >= since) & (frame['time'] < since + limit * self.timeframe_ms)]
+        return [[int(time), *ohlcv] for time, *ohlcv in
+                frame[['time', 'open', 'high', 'low', 'close', 'volume']].values.tolist()]
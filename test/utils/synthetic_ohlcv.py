@@ -0,0 +1,35 @@
+import numpy as np
+from pandas import DataFrame
+
+from test.utils.signal_frame import THIRTY_MIN
+
+START_TIMESTAMP = 1577836800000  # 2020-01-01 UTC
+
+
+def generate_ohlcv(pair: str, n_candles: int, timestep: int = THIRTY_MIN, start: int = START_TIMESTAMP,
+                   seed: int = 0, missing_candles: slice = None) -> DataFrame:
+    """
+    Generates a random walk of OHLCV candles in the format the DataModule hands to BackTesting
+    """
+    rng = np.random.default_rng(seed)
+    index = np.arange(start, start + n_candles * timestep, timestep)
+
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_candles)))
+    open_ = np.concatenate([close[:1], close[:-1]])
+    high = np.maximum(open_, close) * (1 + rng.random(n_candles) * 0.005)
+    low = np.minimum(open_, close) * (1 - rng.random(n_candles) * 0.005)
+    volume = rng.random(n_candles) * 1000
+
+    df = DataFrame({'time': index, 'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume,
+                    'pair': pair, 'buy': 0., 'sell': 0.}, index=index)
+    df.index.name = 'index'
+
+    if missing_candles is not None:
+        df.iloc[missing_candles, 1:6] = np.nan
+    return df
+
+
+def generate_pairs_ohlcv(n_pairs: int, n_candles: int, timestep: int = THIRTY_MIN, seed: int = 0) -> dict:
+    pairs = [f"COIN{i}/USDT" for i in range(n_pairs)]
+    return {pair: generate_ohlcv(pair, n_candles, timestep, seed=seed + i, missing_candles=slice(5, 8))
+            for i, pair in enumerate(pairs)}